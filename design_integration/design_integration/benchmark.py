@@ -0,0 +1,442 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Synthetic data and endpoint benchmarks for the design workflow.
+
+Seed a throwaway site, then time the whitelisted endpoints against it:
+
+	bench --site bench.local execute design_integration.design_integration.benchmark.seed --kwargs "{'items': '100k'}"
+	bench --site bench.local execute design_integration.design_integration.benchmark.run --kwargs "{'output': 'bench.json'}"
+
+``run`` returns (and optionally writes) one JSON document with p50/p95
+latency and query counts per endpoint, so the outputs of two commits can be
+diffed. Writes made while timing are rolled back after every iteration.
+``compare_formats`` sizes the full item list as rows and as columnar.
+"""
+
+import gzip
+import json
+import math
+import random
+import time
+
+import frappe
+from frappe.utils import add_days, now_datetime, nowdate
+
+from design_integration.design_integration.bulk import bulk_insert_docs
+from design_integration.design_integration.columnar import COLUMNAR, ROWS, to_columnar
+from design_integration.design_integration.completion import reconcile_open_items
+from design_integration.design_integration.dashboard import DESIGN_STATS_CACHE_KEY, clear_design_stats_cache
+from design_integration.design_integration.naming import (
+	get_design_request_series_key,
+	get_version_tag_key,
+	make_design_request_item_names,
+)
+from design_integration.design_integration.query_capture import count_queries
+from design_integration.design_integration.stage_log import make_stage_log
+from design_integration.design_integration.status_counts import reconcile_status_counts
+
+VOLUMES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SEED_PREFIX = "_BENCH"
+SEED_CHUNK = 500  # design requests written per transaction
+LARGE_ORDER_LINES = 500
+BENCH_ITEM_GROUP = "Fabricated Equipment"
+
+DESIGN_STATUSES = (
+	"Pending",
+	"Approval Drawing",
+	"Send for Approval",
+	"Design",
+	"Modelling",
+	"Production Drawing",
+	"SKU Generation",
+	"BOM",
+	"Nesting",
+	"Completed",
+)
+APPROVAL_STATUSES = ("Pending", "Approved", "Rejected", "On Hold")
+
+
+def seed(
+	items=1000,
+	items_per_request=20,
+	transitions_per_item=2,
+	versions_per_item=1,
+	prefix=SEED_PREFIX,
+	random_seed=0,
+):
+	"""Seed ``items`` design items (or a VOLUMES key) with their orders, requests, transitions and versions"""
+	if isinstance(items, str):
+		items = VOLUMES[items.lower()]
+	items, items_per_request = int(items), int(items_per_request)
+	context = _get_seed_context(prefix, random_seed)
+
+	requests = math.ceil(items / items_per_request)
+	offset = frappe.db.count("Sales Order", {"name": ["like", f"{prefix}-SO-0%"]})
+	for start in range(0, requests, SEED_CHUNK):
+		for number in range(offset + start, offset + min(start + SEED_CHUNK, requests)):
+			lines = min(items_per_request, items - (number - offset) * items_per_request)
+			_seed_request(context, number, lines, transitions_per_item, versions_per_item)
+		frappe.db.commit()
+
+	large_order = f"{prefix}-SO-LARGE"
+	if not frappe.db.exists("Sales Order", large_order):
+		make_sales_order(context, large_order, LARGE_ORDER_LINES)
+
+	reconcile_status_counts()
+	reconcile_open_items()
+	clear_design_stats_cache()
+	frappe.db.commit()
+
+	return {
+		"design_requests": requests,
+		"design_request_items": items,
+		"stage_transitions": items * transitions_per_item,
+		"design_versions": items * versions_per_item,
+	}
+
+
+def _get_seed_context(prefix, random_seed):
+	return frappe._dict(
+		prefix=prefix,
+		rng=random.Random(random_seed),
+		item=_make_bench_item(prefix),
+		customer=_make_bench_customer(prefix),
+		company=frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name"),
+		users=frappe.get_all("User", {"enabled": 1, "user_type": "System User"}, pluck="name", limit=20),
+	)
+
+
+def make_sales_order(context, name, lines):
+	"""Write a submitted Sales Order with ``lines`` design rows, skipping its controller"""
+	transaction_date = add_days(nowdate(), -context.rng.randint(0, 90))
+	sales_order = frappe.new_doc("Sales Order")
+	sales_order.update(
+		{
+			"name": name,
+			"company": context.company,
+			"customer": context.customer,
+			"customer_name": context.customer,
+			"transaction_date": transaction_date,
+			"delivery_date": add_days(transaction_date, 30),
+			"status": "To Deliver and Bill",
+			"docstatus": 1,
+		}
+	)
+	sales_order.set_user_and_timestamp()
+	rows = [
+		_make_child(
+			sales_order,
+			"items",
+			"Sales Order Item",
+			idx,
+			item_code=context.item,
+			item_name=context.item,
+			description=context.item,
+			qty=context.rng.randint(1, 5),
+			uom="Nos",
+			stock_uom="Nos",
+			conversion_factor=1,
+			delivery_date=sales_order.delivery_date,
+			docstatus=1,
+		)
+		for idx in range(1, lines + 1)
+	]
+	bulk_insert_docs([sales_order])
+	bulk_insert_docs(rows)
+	return sales_order, rows
+
+
+def _seed_request(context, number, lines, transitions_per_item, versions_per_item):
+	rng = context.rng
+	sales_order, so_items = make_sales_order(context, f"{context.prefix}-SO-{number:07d}", lines)
+
+	request = frappe.new_doc("Design Request")
+	request.update(
+		{
+			"name": f"{sales_order.name}-1",
+			"sales_order": sales_order.name,
+			"customer": context.customer,
+			"customer_name": context.customer,
+			"company": context.company,
+			"assigned_to": rng.choice(context.users) if context.users else None,
+			"priority": rng.choice(("Low", "Medium", "High")),
+			"request_date": add_days(now_datetime(), -rng.randint(0, 60)),
+			"status": "Open",
+		}
+	)
+	request.set_user_and_timestamp()
+
+	rows, items, transitions, versions = [], [], [], []
+	for so_item, name in zip(so_items, make_design_request_item_names(len(so_items)), strict=True):
+		status = rng.choice(DESIGN_STATUSES)
+		rows.append(
+			_make_child(
+				request,
+				"items",
+				"Design Request Item Child",
+				so_item.idx,
+				item_code=so_item.item_code,
+				item_name=so_item.item_name,
+				qty=so_item.qty,
+				uom=so_item.uom,
+				design_status=status,
+				so_detail=so_item.name,
+			)
+		)
+
+		item = frappe.new_doc("Design Request Item")
+		item.update(
+			{
+				"name": name,
+				"item_code": so_item.item_code,
+				"item_name": so_item.item_name,
+				"qty": so_item.qty,
+				"uom": so_item.uom,
+				"design_status": status,
+				"current_stage": status,
+				"approval_status": rng.choice(APPROVAL_STATUSES),
+				"design_request": request.name,
+				"company": context.company,
+			}
+		)
+		item.set_user_and_timestamp()
+		items.append(item)
+
+		previous = "Pending"
+		for idx in range(1, transitions_per_item + 1):
+			to_status = rng.choice(DESIGN_STATUSES)
+			transitions.append(
+				make_stage_log(
+					name,
+					request.name,
+					previous,
+					to_status,
+					transition_date=add_days(request.request_date, idx),
+					transitioned_by="Administrator",
+				)
+			)
+			previous = to_status
+
+		for sub in range(versions_per_item):
+			version = frappe.new_doc("Design Version")
+			version.update(
+				{
+					"name": frappe.generate_hash(length=10),
+					"design_request_item": name,
+					"version_tag": f"V0-{sub}" if sub else "V0",
+					"posting_date": add_days(request.request_date, sub),
+				}
+			)
+			version.set_user_and_timestamp()
+			versions.append(version)
+
+	bulk_insert_docs([request])
+	for docs in (rows, items, transitions, versions):
+		bulk_insert_docs(docs)
+	frappe.db.bulk_insert(
+		"Series",
+		fields=["name", "current"],
+		values=[(get_design_request_series_key(sales_order.name), 1)]
+		+ [(get_version_tag_key(item.name, 0), versions_per_item) for item in items if versions_per_item],
+		ignore_duplicates=True,
+	)
+
+
+def _make_child(parent, parentfield, doctype, idx, **values):
+	row = frappe.new_doc(doctype)
+	row.update(values)
+	row.update(
+		{
+			"name": frappe.generate_hash(length=10),
+			"parent": parent.name,
+			"parenttype": parent.doctype,
+			"parentfield": parentfield,
+			"idx": idx,
+		}
+	)
+	row.set_user_and_timestamp()
+	return row
+
+
+def _make_bench_item(prefix):
+	item_code = f"{prefix} Fabricated Item"
+	if not frappe.db.exists("Item Group", BENCH_ITEM_GROUP):
+		frappe.get_doc(
+			{
+				"doctype": "Item Group",
+				"item_group_name": BENCH_ITEM_GROUP,
+				"parent_item_group": "All Item Groups",
+			}
+		).insert(ignore_permissions=True)
+	if not frappe.db.exists("Item", item_code):
+		frappe.get_doc(
+			{
+				"doctype": "Item",
+				"item_code": item_code,
+				"item_group": BENCH_ITEM_GROUP,
+				"stock_uom": "Nos",
+				"is_stock_item": 0,
+			}
+		).insert(ignore_permissions=True)
+	return item_code
+
+
+def _make_bench_customer(prefix):
+	customer = f"{prefix} Customer"
+	if not frappe.db.exists("Customer", customer):
+		frappe.get_doc({"doctype": "Customer", "customer_name": customer}).insert(ignore_permissions=True)
+	return customer
+
+
+def run(iterations=20, output=None, prefix=SEED_PREFIX):
+	"""Time every endpoint ``iterations`` times and return the results as a dict"""
+	from frappe.utils.change_log import get_app_last_commit_ref
+
+	iterations = int(iterations)
+	results = {
+		"generated_at": str(now_datetime()),
+		"commit": get_app_last_commit_ref("design_integration"),
+		"site": frappe.local.site,
+		"iterations": iterations,
+		"volume": {
+			doctype: frappe.db.estimate_count(doctype)
+			for doctype in (
+				"Design Request",
+				"Design Request Item",
+				"Design Stage Log",
+				"Design Version",
+			)
+		},
+		"endpoints": {},
+	}
+
+	for name, (setup, call, writes) in get_cases(prefix, iterations).items():
+		timings, query_counts = [], []
+		for iteration in range(iterations):
+			args = setup(iteration)
+			with count_queries() as queries:
+				started = time.perf_counter()
+				call(*args)
+				timings.append((time.perf_counter() - started) * 1000)
+			query_counts.append(len(queries))
+			if writes:
+				frappe.db.rollback()
+
+		results["endpoints"][name] = {
+			"p50_ms": round(percentile(timings, 50), 3),
+			"p95_ms": round(percentile(timings, 95), 3),
+			"mean_ms": round(sum(timings) / len(timings), 3),
+			"max_ms": round(max(timings), 3),
+			"queries_p50": percentile(query_counts, 50),
+			"queries_max": max(query_counts),
+		}
+
+	results["payload_formats"] = compare_formats(iterations=iterations)
+
+	if output:
+		with open(output, "w") as f:
+			json.dump(results, f, indent=1)
+	return results
+
+
+def compare_formats(iterations=5, filters=None, output=None):
+	"""Payload bytes and encode time of the full design item list, as rows and as columnar"""
+	from design_integration.design_integration.doctype.design_request.design_request import query_design_items
+
+	iterations = int(iterations)
+	items, _next_cursor = query_design_items(filters)
+	encoders = {
+		ROWS: lambda: frappe.as_json(items, indent=None, separators=(",", ":")),
+		COLUMNAR: lambda: frappe.as_json(to_columnar(items), indent=None, separators=(",", ":")),
+	}
+
+	results = {"rows": len(items), "formats": {}}
+	for name, encode in encoders.items():
+		timings = []
+		for _iteration in range(iterations):
+			started = time.perf_counter()
+			payload = encode().encode()
+			timings.append((time.perf_counter() - started) * 1000)
+
+		results["formats"][name] = {
+			"bytes": len(payload),
+			"gzip_bytes": len(gzip.compress(payload)),
+			"encode_p50_ms": round(percentile(timings, 50), 3),
+			"encode_max_ms": round(max(timings), 3),
+		}
+
+	results["bytes_ratio"] = round(
+		results["formats"][COLUMNAR]["bytes"] / max(results["formats"][ROWS]["bytes"], 1), 3
+	)
+
+	if output:
+		with open(output, "w") as f:
+			json.dump(results, f, indent=1)
+	return results
+
+
+def get_cases(prefix, iterations):
+	"""name -> (setup(iteration) returning call args, endpoint, whether it writes)"""
+	from design_integration.design_integration.doctype.design_request.design_request import (
+		create_design_request_from_sales_order,
+		get_all_design_items,
+		get_dashboard_stats,
+		get_design_items_page,
+		get_design_request_items,
+		update_item_status,
+	)
+	from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+		get_next_version_tag,
+	)
+
+	sales_orders = frappe.get_all(
+		"Sales Order", {"name": ["like", f"{prefix}-SO-0%"]}, pluck="name", limit=iterations
+	)
+	items = frappe.get_all(
+		"Design Request Item",
+		{"design_request": ["in", [f"{name}-1" for name in sales_orders]]},
+		pluck="name",
+		limit=iterations,
+	)
+	if not sales_orders or not items:
+		frappe.throw(frappe._("Seed the site first: no {0} data found").format(prefix))
+
+	context = _get_seed_context(prefix, iterations)
+
+	def pick(names):
+		return lambda iteration: (names[iteration % len(names)],)
+
+	def new_order(iteration):
+		sales_order, rows = make_sales_order(context, f"{prefix}-SO-NEW-{frappe.generate_hash(length=8)}", 20)
+		return sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in rows])
+
+	def cold_cache(iteration):
+		frappe.cache().delete_value(DESIGN_STATS_CACHE_KEY)
+		return ()
+
+	return {
+		"get_all_design_items": (lambda iteration: (), get_all_design_items, False),
+		"get_design_items_page": (lambda iteration: (), get_design_items_page, False),
+		"get_dashboard_stats": (lambda iteration: (), get_dashboard_stats, False),
+		"get_dashboard_stats (cold)": (cold_cache, get_dashboard_stats, False),
+		"get_design_request_items": (pick(sales_orders), get_design_request_items, False),
+		f"get_design_request_items ({LARGE_ORDER_LINES} lines)": (
+			lambda iteration: (f"{prefix}-SO-LARGE",),
+			get_design_request_items,
+			False,
+		),
+		"create_design_request_from_sales_order": (new_order, create_design_request_from_sales_order, True),
+		"update_item_status": (
+			lambda iteration: (items[iteration % len(items)], "Modelling"),
+			update_item_status,
+			True,
+		),
+		"get_next_version_tag": (pick(items), get_next_version_tag, False),
+	}
+
+
+def percentile(values, percent):
+	"""Nearest-rank percentile"""
+	ordered = sorted(values)
+	return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
@@ -0,0 +1,100 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Realtime patches for open design boards.
+
+Instead of every board re-fetching the item list after a change, saves
+publish small patches on the ``Design Request Item`` doctype room, which
+boards join with ``frappe.realtime.doctype_subscribe``. Each event carries a
+list of patches:
+
+	{"op": "update", "key": "item_id", "name": "DES-IT-000042", "fields": ["design_status"]}
+
+``key`` names the board column matched against ``name``; request level
+changes use ``request_id`` and apply to every row of that request. The room
+only checks read access to the doctype, not User Permissions, so patches name
+the changed columns but never carry their values: boards re-read the rows they
+show through ``get_design_item_rows``, which applies them. Events go out after
+commit, so a rolled back save publishes nothing.
+"""
+
+import frappe
+
+BOARD_EVENT = "design_board_patch"
+BOARD_DOCTYPE = "Design Request Item"
+
+# Design Request Item fields shown on the boards under the same name
+ITEM_FIELDS = (
+	"item_code",
+	"item_name",
+	"description",
+	"qty",
+	"uom",
+	"design_status",
+	"current_stage",
+	"approval_status",
+	"sku_generated",
+	"item_created",
+	"bom_created",
+	"nesting_completed",
+	"new_item_code",
+	"bom_name",
+)
+
+# Design Request field -> board column
+REQUEST_FIELDS = {
+	"status": "request_status",
+	"assigned_to": "assigned_to",
+	"priority": "priority",
+	"expected_completion": "expected_completion",
+	"customer_name": "customer_name",
+	"project_name": "project_name",
+}
+
+
+def publish_item_change(doc, method=None):
+	"""on_update hook on Design Request Item"""
+	previous = doc.get_doc_before_save()
+	if not previous:
+		publish_patches([{"op": "insert", "key": "item_id", "name": doc.name}])
+		return
+
+	changed = get_changed(previous, doc, {field: field for field in ITEM_FIELDS})
+	if changed:
+		publish_patches([make_item_patch(doc.name, changed)])
+
+
+def publish_item_delete(doc, method=None):
+	"""on_trash hook on Design Request Item"""
+	publish_patches([{"op": "delete", "key": "item_id", "name": doc.name}])
+
+
+def publish_request_change(doc, method=None):
+	"""on_update hook on Design Request"""
+	previous = doc.get_doc_before_save()
+	changed = get_changed(previous, doc, REQUEST_FIELDS) if previous else None
+	if changed:
+		publish_patches([{"op": "update", "key": "request_id", "name": doc.name, "fields": changed}])
+
+
+def make_item_patch(name, fields):
+	if "design_status" in fields:
+		# is_overdue is derived from the status
+		fields = [*fields, "is_overdue"]
+	return {"op": "update", "key": "item_id", "name": name, "fields": fields}
+
+
+def get_changed(previous, doc, fields):
+	"""Board columns whose field differs between ``previous`` and ``doc``"""
+	return [column for field, column in fields.items() if previous.get(field) != doc.get(field)]
+
+
+def publish_patches(patches):
+	"""Send ``patches`` to every board once the current transaction commits"""
+	if patches:
+		frappe.publish_realtime(
+			BOARD_EVENT,
+			{"patches": patches},
+			doctype=BOARD_DOCTYPE,
+			after_commit=True,
+		)
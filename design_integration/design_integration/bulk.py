@@ -0,0 +1,27 @@
+# Copyright (c) 2025, AxelGear and contributors
+# For license information, please see license.txt
+
+import frappe
+
+
+def bulk_insert_docs(docs, chunk_size=1000):
+	"""Write new documents of one doctype with multi-row INSERTs.
+
+	The documents must already be named and validated; nothing beyond the
+	column values is run for them.
+	"""
+	if not docs:
+		return
+
+	rows = [doc.get_valid_dict(convert_dates_to_str=True, ignore_virtual=True) for doc in docs]
+	fields = list(rows[0])
+
+	frappe.db.bulk_insert(
+		docs[0].doctype,
+		fields=fields,
+		values=[tuple(row.get(field) for field in fields) for row in rows],
+		chunk_size=chunk_size,
+	)
+
+	for doc in docs:
+		doc.set("__islocal", False)
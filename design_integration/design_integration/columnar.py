@@ -0,0 +1,78 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Columnar encoding for large design item lists.
+
+A list of row dicts repeats every key on every row. The columnar form sends
+the column names once and one array of values per column:
+
+	{
+		"format": "columnar",
+		"length": 2,
+		"columns": ["item_id", "design_status"],
+		"values": [["DES-IT-000001", "DES-IT-000002"], [0, 0]],
+		"dictionaries": {"design_status": ["Modelling"]},
+	}
+
+Columns listed in ``dictionaries`` hold indexes into that list instead of the
+values themselves. ``design_integration.decode_columnar`` turns the payload
+back into row objects on the client.
+"""
+
+import frappe
+from frappe import _
+
+ROWS = "rows"
+COLUMNAR = "columnar"
+FORMATS = (ROWS, COLUMNAR)
+
+# low-cardinality columns sent as small integers
+DICTIONARY_FIELDS = (
+	"request_status",
+	"priority",
+	"uom",
+	"design_status",
+	"current_stage",
+	"approval_status",
+)
+
+
+def validate_format(format=None):
+	format = format or ROWS
+	if format not in FORMATS:
+		frappe.throw(_("Invalid format {0}, expected one of {1}").format(format, ", ".join(FORMATS)))
+	return format
+
+
+def to_columnar(rows, columns=None):
+	"""Encode a list of dicts sharing the same keys"""
+	columns = list(columns or (rows[0].keys() if rows else ()))
+	values, dictionaries = [], {}
+
+	for column in columns:
+		column_values = [row.get(column) for row in rows]
+		if column in DICTIONARY_FIELDS:
+			codes = {}
+			column_values = [codes.setdefault(value, len(codes)) for value in column_values]
+			dictionaries[column] = list(codes)
+		values.append(column_values)
+
+	return {
+		"format": COLUMNAR,
+		"length": len(rows),
+		"columns": columns,
+		"values": values,
+		"dictionaries": dictionaries,
+	}
+
+
+def from_columnar(payload):
+	"""Decode a ``to_columnar`` payload back into a list of dicts"""
+	columns = []
+	for column, column_values in zip(payload["columns"], payload["values"], strict=True):
+		dictionary = payload["dictionaries"].get(column)
+		if dictionary is not None:
+			column_values = [dictionary[code] for code in column_values]
+		columns.append(column_values)
+
+	return [frappe._dict(zip(payload["columns"], row, strict=True)) for row in zip(*columns, strict=True)]
@@ -0,0 +1,132 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Completion roll-up from Design Request Items to their Design Request.
+
+``Design Request.open_items`` counts the request's items that are not yet
+Completed. Item hooks adjust it by deltas inside the item's own transaction,
+and when it reaches zero the request is closed with a single column update
+instead of loading and re-saving the parent. Saving a Design Request writes
+back the stored count rather than the loaded one, so a save never undoes a
+delta, and ``reconcile_open_items`` corrects any drift hourly.
+"""
+
+from collections import Counter
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+from design_integration.design_integration.board_events import publish_patches
+from design_integration.design_integration.dashboard import clear_design_stats_cache
+from design_integration.design_integration.status_counts import get_status_key, update_status_counts
+
+COMPLETED = "Completed"
+# requests recounted per statement (and transaction) by reconcile_open_items
+RECONCILE_BATCH = 500
+
+
+def is_open(doc):
+	return bool(doc.get("design_request")) and doc.get("design_status") != COMPLETED
+
+
+def track_open_items(doc, method=None):
+	"""before_save hook on Design Request Item"""
+	previous = doc.get_doc_before_save()
+	deltas = Counter()
+	if previous and is_open(previous):
+		deltas[previous.design_request] -= 1
+	if is_open(doc):
+		deltas[doc.design_request] += 1
+
+	update_open_items(deltas)
+	for design_request, delta in deltas.items():
+		if delta < 0:
+			close_if_complete(design_request)
+
+
+def track_open_item_delete(doc, method=None):
+	"""on_trash hook on Design Request Item"""
+	if is_open(doc):
+		update_open_items({doc.design_request: -1})
+		close_if_complete(doc.design_request)
+
+
+def update_open_items(deltas):
+	"""Apply ``{design request: delta}`` to the open item counters"""
+	for design_request, delta in deltas.items():
+		if delta:
+			frappe.db.sql(
+				"""UPDATE `tabDesign Request` SET open_items = GREATEST(open_items + %s, 0)
+				WHERE name = %s""",
+				(delta, design_request),
+			)
+
+
+def get_open_items(design_request):
+	"""Stored open item count of ``design_request``, locking its row"""
+	return frappe.db.get_value("Design Request", design_request, "open_items", for_update=True) or 0
+
+
+def close_if_complete(design_request):
+	"""Close ``design_request`` if none of its items is still open"""
+	request = frappe.db.get_value(
+		"Design Request",
+		design_request,
+		["name", "status", "company", "open_items"],
+		as_dict=True,
+		for_update=True,
+	)
+	if not request or request.open_items or request.status == "Closed":
+		return
+
+	frappe.db.set_value(
+		"Design Request", design_request, {"status": "Closed", "actual_completion": now_datetime()}
+	)
+	# set_value skips the document hooks that keep these in step
+	old_key = get_status_key(request, "Design Request")
+	request.status = "Closed"
+	update_status_counts({old_key: -1, get_status_key(request, "Design Request"): 1})
+	clear_design_stats_cache()
+	publish_patches(
+		[
+			{
+				"op": "update",
+				"key": "request_id",
+				"name": design_request,
+				"fields": ["request_status"],
+			}
+		]
+	)
+	frappe.msgprint(_("All items completed. Design Request {0} marked as closed.").format(design_request))
+
+
+def reconcile_open_items():
+	"""Hourly: correct the requests whose stored open item count drifted from the item table.
+
+	Requests are walked in name order, RECONCILE_BATCH at a time, and only the
+	drifted ones are written. The correction is applied as a delta, so an item
+	save that commits meanwhile is not overwritten. A request that turns out
+	to have no open item left is closed.
+	"""
+	last_name = ""
+	while rows := frappe.db.sql(
+		"""SELECT dr.name, dr.open_items, COUNT(di.name) AS actual
+		FROM `tabDesign Request` dr
+		LEFT JOIN `tabDesign Request Item` di
+			ON di.design_request = dr.name AND IFNULL(di.design_status, '') != %(completed)s
+		WHERE dr.name > %(last_name)s
+		GROUP BY dr.name, dr.open_items
+		ORDER BY dr.name
+		LIMIT %(batch)s""",
+		{"completed": COMPLETED, "last_name": last_name, "batch": RECONCILE_BATCH},
+		as_dict=True,
+	):
+		last_name = rows[-1].name
+		drifted = [row for row in rows if row.open_items != row.actual]
+		update_open_items({row.name: row.actual - row.open_items for row in drifted})
+		for row in drifted:
+			if not row.actual:
+				close_if_complete(row.name)
+		# release the row locks before the next batch
+		frappe.db.commit()
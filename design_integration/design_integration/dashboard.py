@@ -0,0 +1,69 @@
+# Copyright (c) 2025, AxelGear and contributors
+# For license information, please see license.txt
+
+"""Shared dashboard statistics.
+
+The counts every user sees are computed with one aggregate query per table
+and kept in Redis for a short time. Design Request and Design Request Item
+hooks drop the cached copy whenever either table changes.
+"""
+
+import frappe
+from frappe.utils import cint
+
+DESIGN_STATS_CACHE_KEY = "design_integration:design_stats"
+DESIGN_STATS_TTL = 60
+
+# Items older than this many days (and not completed) are reported as overdue
+OVERDUE_DAYS = 7
+
+
+def get_design_stats():
+	"""Counts shared by every user, served from cache when fresh"""
+	stats = frappe.cache().get_value(DESIGN_STATS_CACHE_KEY)
+	if stats is None:
+		stats = compute_design_stats()
+		frappe.cache().set_value(DESIGN_STATS_CACHE_KEY, stats, expires_in_sec=DESIGN_STATS_TTL)
+	return stats
+
+
+def compute_design_stats():
+	requests = frappe.db.sql(
+		"""
+		SELECT
+			COUNT(*) AS total_requests,
+			IFNULL(SUM(status = 'Open'), 0) AS open_requests,
+			IFNULL(SUM(status = 'Closed'), 0) AS closed_requests
+		FROM `tabDesign Request`
+	""",
+		as_dict=True,
+	)[0]
+
+	items = frappe.db.sql(
+		f"""
+		SELECT
+			COUNT(*) AS total_items,
+			IFNULL(SUM(di.design_status = 'Pending'), 0) AS pending_items,
+			IFNULL(SUM(di.design_status = 'Completed'), 0) AS completed_items,
+			IFNULL(SUM(
+				dr.docstatus = 0
+				AND di.design_status != 'Completed'
+				AND DATEDIFF(CURDATE(), dr.request_date) > {OVERDUE_DAYS}
+			), 0) AS overdue_items
+		FROM `tabDesign Request Item` di
+		LEFT JOIN `tabDesign Request` dr ON di.design_request = dr.name
+	""",
+		as_dict=True,
+	)[0]
+
+	return {key: cint(value) for key, value in {**requests, **items}.items()}
+
+
+def get_my_request_count(user=None):
+	"""Per-user count, kept out of the shared cache"""
+	return frappe.db.count("Design Request", {"assigned_to": user or frappe.session.user})
+
+
+def clear_design_stats_cache(doc=None, method=None):
+	"""doc_events hook for Design Request and Design Request Item"""
+	frappe.cache().delete_value(DESIGN_STATS_CACHE_KEY)
@@ -0,0 +1,15 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+# import frappe
+from frappe.model.document import Document
+
+from design_integration.design_integration.indexes import add_doctype_indexes
+
+
+class DesignNotification(Document):
+	pass
+
+
+def on_doctype_update():
+	add_doctype_indexes("Design Notification")
@@ -0,0 +1,129 @@
+# Copyright (c) 2026, Axelgear and Contributors
+# See license.txt
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from design_integration.design_integration.outbox import (
+	MAX_ATTEMPTS,
+	deliver_notifications,
+	get_backoff,
+	queue_notification,
+)
+
+
+class WebhookSink:
+	"""Local HTTP endpoint that records requests and fails the first ``failures``"""
+
+	def __init__(self, failures=0):
+		self.failures = failures
+		self.requests = []
+		sink = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_POST(self):
+				body = self.rfile.read(int(self.headers["Content-Length"]))
+				sink.requests.append((self.headers["Idempotency-Key"], json.loads(body)))
+				self.send_response(500 if len(sink.requests) <= sink.failures else 200)
+				self.end_headers()
+
+			def log_message(self, *args):
+				pass
+
+		self.server = HTTPServer(("127.0.0.1", 0), Handler)
+		self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+		threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+	def close(self):
+		self.server.shutdown()
+		self.server.server_close()
+
+
+class TestDesignNotification(FrappeTestCase):
+	def setUp(self):
+		self.enqueue = patch("frappe.enqueue").start()
+		self.addCleanup(patch.stopall)
+		self.sink = WebhookSink()
+		self.addCleanup(self.sink.close)
+
+	def tearDown(self):
+		frappe.db.delete("Design Notification", {"idempotency_key": ["like", "_test-%"]})
+		frappe.db.commit()
+
+	def queue(self, key="_test-hook"):
+		return queue_notification("Webhook", {"url": self.sink.url, "body": {"event": key}}, key)
+
+	def make_due(self, name):
+		frappe.db.set_value("Design Notification", name, "next_attempt_at", now_datetime())
+		frappe.db.commit()
+
+	def test_delivered_after_commit(self):
+		name = self.queue()
+		self.assertEqual(self.enqueue.call_args.kwargs["enqueue_after_commit"], True)
+		self.assertFalse(self.sink.requests)
+		frappe.db.commit()
+
+		self.assertEqual(deliver_notifications(), 1)
+		self.assertEqual(self.sink.requests, [("_test-hook", {"event": "_test-hook"})])
+
+		row = frappe.db.get_value("Design Notification", name, ["status", "attempts", "sent_at", "duration"], as_dict=True)
+		self.assertEqual((row.status, row.attempts), ("Sent", 1))
+		self.assertTrue(row.sent_at)
+		self.assertGreater(row.duration, 0)
+
+	def test_same_key_is_queued_once(self):
+		self.assertTrue(self.queue())
+		self.assertIsNone(self.queue())
+		self.assertEqual(frappe.db.count("Design Notification", {"idempotency_key": "_test-hook"}), 1)
+
+	def test_concurrent_duplicate_is_a_no_op(self):
+		self.assertTrue(self.queue())
+		# the other transaction's row is not visible yet, only the unique index catches it
+		with patch("frappe.db.exists", return_value=False):
+			self.assertIsNone(self.queue())
+
+	def test_failed_delivery_backs_off_and_retries(self):
+		self.sink.failures = 2
+		name = self.queue()
+		frappe.db.commit()
+
+		before = now_datetime()
+		self.assertEqual(deliver_notifications(), 0)
+		row = frappe.db.get_value("Design Notification", name, ["status", "attempts", "next_attempt_at", "last_error"], as_dict=True)
+		self.assertEqual((row.status, row.attempts), ("Pending", 1))
+		self.assertGreaterEqual(row.next_attempt_at, add_to_date(before, seconds=get_backoff(1)))
+		self.assertIn("500", row.last_error)
+
+		# not due yet
+		self.assertEqual(deliver_notifications(), 0)
+		self.assertEqual(len(self.sink.requests), 1)
+
+		self.make_due(name)
+		deliver_notifications()
+		self.assertEqual(get_backoff(2), 2 * get_backoff(1))
+
+		self.make_due(name)
+		self.assertEqual(deliver_notifications(), 1)
+		self.assertEqual(frappe.db.get_value("Design Notification", name, "status"), "Sent")
+		# every attempt carried the same key so the receiver can drop replays
+		self.assertEqual({key for key, _body in self.sink.requests}, {"_test-hook"})
+
+	def test_gives_up_after_max_attempts(self):
+		self.sink.failures = MAX_ATTEMPTS + 1
+		name = self.queue()
+		frappe.db.commit()
+
+		for _ in range(MAX_ATTEMPTS):
+			self.make_due(name)
+			deliver_notifications()
+
+		row = frappe.db.get_value("Design Notification", name, ["status", "attempts", "next_attempt_at"], as_dict=True)
+		self.assertEqual((row.status, row.attempts), ("Failed", MAX_ATTEMPTS))
+		self.assertIsNone(row.next_attempt_at)
+		self.assertEqual(len(self.sink.requests), MAX_ATTEMPTS)
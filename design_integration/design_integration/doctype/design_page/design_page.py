@@ -1,6 +1,10 @@
 import frappe
 from frappe import _
 
+from design_integration.design_integration.dashboard import get_design_stats
+from design_integration.design_integration.profiling import profile
+from design_integration.design_integration.status_counts import get_status_counts
+
 def get_context(context):
 	context.no_cache = 1
 	context.show_sidebar = True
@@ -15,15 +19,11 @@ def get_context(context):
 def get_design_statistics():
 	"""Get design statistics for the dashboard"""
 	try:
-		stats = {
-			'total_requests': frappe.db.count('Design Request'),
-			'open_requests': frappe.db.count('Design Request', filters={'status': 'Open'}),
-			'closed_requests': frappe.db.count('Design Request', filters={'status': 'Closed'}),
-			'total_items': frappe.db.count('Design Request Item'),
-			'pending_items': frappe.db.count('Design Request Item', filters={'design_status': 'Pending'}),
-			'completed_items': frappe.db.count('Design Request Item', filters={'design_status': 'Completed'})
+		stats = get_design_stats()
+		return {
+			key: stats[key]
+			for key in ('total_requests', 'open_requests', 'closed_requests', 'total_items', 'pending_items', 'completed_items')
 		}
-		return stats
 	except:
 		return {}
 
@@ -44,18 +44,13 @@ def get_chart_data():
 	"""Get chart data for the dashboard"""
 	try:
 		# Design status distribution
-		status_data = frappe.db.sql("""
-			SELECT design_status, COUNT(*) as count
-			FROM `tabDesign Request Item`
-			GROUP BY design_status
-		""", as_dict=1)
+		status_data = [
+			frappe._dict(design_status=row.status, count=row.count)
+			for row in get_status_counts('Design Request Item', 'status')
+		]
 		
 		# Approval status distribution
-		approval_data = frappe.db.sql("""
-			SELECT approval_status, COUNT(*) as count
-			FROM `tabDesign Request Item`
-			GROUP BY approval_status
-		""", as_dict=1)
+		approval_data = get_status_counts('Design Request Item', 'approval_status')
 		
 		return {
 			'status_data': status_data,
@@ -65,6 +60,7 @@ def get_chart_data():
 		return {}
 
 @frappe.whitelist()
+@profile
 def get_dashboard_data():
 	"""Get dashboard data for JavaScript"""
 	try:
@@ -1,65 +1,87 @@
+import base64
+import json
+from collections import Counter
+
 import frappe
 from frappe import _
-from frappe.utils import now_datetime, getdate
+from frappe.utils import cint, flt, now_datetime, getdate
 from frappe.model.document import Document
 
+from design_integration.design_integration.board_events import make_item_patch, publish_patches
+from design_integration.design_integration.bulk import bulk_insert_docs
+from design_integration.design_integration.columnar import COLUMNAR, to_columnar, validate_format
+from design_integration.design_integration.completion import (
+    close_if_complete,
+    get_open_items,
+    is_open,
+    update_open_items,
+)
+from design_integration.design_integration.dashboard import (
+    OVERDUE_DAYS,
+    clear_design_stats_cache,
+    get_design_stats,
+    get_my_request_count,
+)
+from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+    bulk_insert_design_request_items,
+)
+from design_integration.design_integration.indexes import add_doctype_indexes
+from design_integration.design_integration.item_cache import prefetch
+from design_integration.design_integration.naming import get_design_request_series_key, next_sequence
+from design_integration.design_integration.outbox import queue_notification
+from design_integration.design_integration.overdue_digest import enqueue_overdue_digests
+from design_integration.design_integration.profiling import profile, profile_hooks
+from design_integration.design_integration.stage_log import insert_stage_logs, make_stage_log
+from design_integration.design_integration.status_counts import get_status_counts, get_status_key, update_status_counts
+
 def has_permission():
     """Standalone function for app permission check"""
     return frappe.has_permission("Design Request", "read")
 
+@profile_hooks
 class DesignRequest(Document):
     def autoname(self):
         """Auto-generate name based on sales order"""
         if self.sales_order:
-            # Get the base name from sales order
-            base_name = self.sales_order
-            
-            # Check if there are existing design requests for this sales order
-            existing_requests = frappe.get_all(
-                "Design Request",
-                filters={"sales_order": self.sales_order},
-                fields=["name"],
-                order_by="creation desc"
-            )
-            
-            if existing_requests:
-                # Find the highest suffix number
-                max_suffix = 0
-                for req in existing_requests:
-                    if req.name.startswith(base_name + "-"):
-                        try:
-                            suffix = int(req.name.split("-")[-1])
-                            max_suffix = max(max_suffix, suffix)
-                        except ValueError:
-                            continue
-                
-                # Create new name with incremented suffix
-                self.name = f"{base_name}-{max_suffix + 1}"
-            else:
-                # First design request for this sales order
-                self.name = f"{base_name}-1"
+            # <sales order>-<n>, n drawn from a per sales order counter
+            key = get_design_request_series_key(self.sales_order)
+            self.name = f"{self.sales_order}-{next_sequence(key)}"
         else:
             # Fallback to naming series if no sales order
             if not self.naming_series:
                 self.naming_series = "DES-REQ-.YYYY.-"
     
+    def db_insert(self, *args, **kwargs):
+        super().db_insert(*args, **kwargs)
+        if self.flags.bulk_insert_items:
+            # Document.insert writes child rows one statement each; write the
+            # items table in one go and let the rows skip their own insert
+            bulk_insert_docs(self.items)
+            for row in self.items:
+                row.flags.inserted_with_parent = True
+    
+    def db_update(self, *args, **kwargs):
+        # open_items only moves by deltas from the item hooks; write back the
+        # stored count, not the one loaded with this document
+        if not self.is_new():
+            self.open_items = get_open_items(self.name)
+        super().db_update(*args, **kwargs)
+    
     def validate(self):
         """Validate the design request"""
         self.set_request_date()
         self.assign_roles()
+        self.check_completion_status()
     
     def before_insert(self):
         """Set initial values before insert"""
         if not self.request_date:
             self.request_date = now_datetime()
     
-    def after_insert(self):
-        """Actions after insert"""
-        self.check_completion_status()
-    
     def on_update(self):
         """Actions on update"""
-        self.check_completion_status()
+        if self.has_value_changed("assigned_to"):
+            self.send_assignment_notification()
     
     def set_request_date(self):
         """Set request date if not set"""
@@ -98,13 +120,15 @@ class DesignRequest(Document):
                 self.customer_name = sales_order.customer_name
     
     def check_completion_status(self):
-        """Check if all items are completed and update request status"""
-        if self.items:
-            all_completed = all(item.design_status == "Completed" for item in self.items)
-            if all_completed and self.status != "Closed":
+        """Close the request in this save if all item rows are completed.
+
+        Standalone Design Request Items close it through the open item counter
+        in ``completion``, without saving the request again.
+        """
+        if self.items and self.status != "Closed":
+            if all(item.design_status == "Completed" for item in self.items):
                 self.status = "Closed"
                 self.actual_completion = now_datetime()
-                self.save()
                 frappe.msgprint(_("All items completed. Design Request marked as closed."))
     
     def log_stage_transition(self):
@@ -120,46 +144,41 @@ class DesignRequest(Document):
             })
     
     def send_assignment_notification(self):
+        """Queue the ZohoCliq assignment card; it is sent once this save commits"""
         if self.assigned_to:
-            # Send ZohoCliq notification using razorpay_frappe integration
-            try:
-                from razorpay_frappe.utils import send_zohocliq_message
-                
-                message = {
-                    "card": {
-                        "title": "DESIGN REQUEST ASSIGNED",
-                        "theme": "modern-inline",
-                    },
-                    "text": f"**Design Request {self.name}** has been assigned to {self.assigned_to}",
-                    "slides": [
-                        {
-                            "type": "table",
-                            "title": "Request Details",
-                            "data": {
-                                "headers": ["Field", "Value"],
-                                "rows": [
-                                    {"Field": "Request ID", "Value": self.name},
-                                    {"Field": "Sales Order", "Value": self.sales_order},
-                                    {"Field": "Project", "Value": self.project_name or "Not set"},
-                                    {"Field": "Customer", "Value": self.customer_name},
-                                    {"Field": "Status", "Value": self.status},
-                                    {"Field": "Priority", "Value": self.priority}
-                                ]
-                            }
+            message = {
+                "card": {
+                    "title": "DESIGN REQUEST ASSIGNED",
+                    "theme": "modern-inline",
+                },
+                "text": f"**Design Request {self.name}** has been assigned to {self.assigned_to}",
+                "slides": [
+                    {
+                        "type": "table",
+                        "title": "Request Details",
+                        "data": {
+                            "headers": ["Field", "Value"],
+                            "rows": [
+                                {"Field": "Request ID", "Value": self.name},
+                                {"Field": "Sales Order", "Value": self.sales_order},
+                                {"Field": "Project", "Value": self.project_name or "Not set"},
+                                {"Field": "Customer", "Value": self.customer_name},
+                                {"Field": "Status", "Value": self.status},
+                                {"Field": "Priority", "Value": self.priority}
+                            ]
                         }
-                    ]
-                }
-                
-                # Get ZohoCliq settings
-                settings = frappe.get_doc("Razorpay Settings")
-                if settings.design_channel_unique:
-                    send_zohocliq_message(
-                        message,
-                        settings.design_channel_unique,
-                        "Design Request Assignment"
-                    )
-            except Exception as e:
-                frappe.log_error(f"Failed to send ZohoCliq notification: {str(e)}")
+                    }
+                ]
+            }
+            
+            queue_notification(
+                "ZohoCliq",
+                {"message": message, "title": "Design Request Assignment"},
+                # modified is new on every save, so assigning the same user again is a new event
+                idempotency_key=f"design-request-assignment::{self.name}::{self.assigned_to}::{self.modified}",
+                reference_doctype=self.doctype,
+                reference_name=self.name,
+            )
     
     def update_design_status(self, new_status):
         """Update the design status"""
@@ -204,76 +223,72 @@ class DesignRequest(Document):
         return False
 
 @frappe.whitelist()
+@profile
 def check_overdue_items():
-    """Check for overdue design items and send notifications"""
+    """Check for overdue design items and queue one digest email per assignee"""
     try:
-        # Get overdue items (older than 7 days and not completed)
-        overdue_items = frappe.db.sql("""
-            SELECT di.name, di.item_code, di.item_name, dr.name as request_id, 
-                   dr.customer_name, dr.assigned_to, dr.request_date
-            FROM `tabDesign Request Item` di
-            INNER JOIN `tabDesign Request` dr ON di.parent = dr.name
-            WHERE dr.docstatus = 0 AND di.design_status != 'Completed'
-            AND DATEDIFF(CURDATE(), dr.request_date) > 7
-        """, as_dict=True)
-        
-        if overdue_items:
-            # Send notifications for overdue items
-            for item in overdue_items:
-                if item.assigned_to:
-                    frappe.sendmail(
-                        recipients=[item.assigned_to],
-                        subject=f"Overdue Design Item: {item.item_code}",
-                        message=f"""
-                        <p>Hello,</p>
-                        <p>The following design item is overdue:</p>
-                        <ul>
-                            <li><strong>Item:</strong> {item.item_code} - {item.item_name}</li>
-                            <li><strong>Request:</strong> {item.request_id}</li>
-                            <li><strong>Customer:</strong> {item.customer_name}</li>
-                            <li><strong>Days Overdue:</strong> {(frappe.utils.nowdate() - item.request_date.date()).days}</li>
-                        </ul>
-                        <p>Please take action to complete this item.</p>
-                        """
-                    )
-            
-            frappe.logger().info(f"Sent overdue notifications for {len(overdue_items)} items")
-        
-        return len(overdue_items)
+        overdue_count = enqueue_overdue_digests()
+        frappe.logger().info(f"Queued overdue notifications for {overdue_count} items")
+        return overdue_count
         
     except Exception as e:
         frappe.log_error(f"Failed to check overdue items: {str(e)}")
         return 0
 
+# Only Sales Order lines in this item group go through the design workflow
+DESIGN_ITEM_GROUP = "Fabricated Equipment"
+
+def get_used_qty_map(sales_order):
+    """Qty already requested per Sales Order Item (so_detail) across live design requests"""
+    used = frappe.db.sql("""
+        SELECT
+            dri.so_detail,
+            SUM(dri.qty) AS used_qty
+        FROM `tabDesign Request Item Child` dri
+        INNER JOIN `tabDesign Request` dr
+            ON dr.name = dri.parent
+        WHERE
+            dr.sales_order = %s
+            AND dr.docstatus < 2
+        GROUP BY dri.so_detail
+    """, sales_order, as_dict=True)
+
+    return {row.so_detail: flt(row.used_qty) for row in used}
+
+def get_item_group_map(item_codes):
+    """item_code -> item_group for all ``item_codes`` in at most one query"""
+    return {
+        code: item.item_group
+        for code, item in prefetch(item_codes).items()
+        if item
+    }
+
 @frappe.whitelist()
+@profile
 def get_design_request_items(sales_order):
     """Get items from sales order for design request dialog"""
     try:
-        sales_order_doc = frappe.get_doc("Sales Order", sales_order)
+        so_items = frappe.get_all(
+            "Sales Order Item",
+            filters={"parent": sales_order, "parenttype": "Sales Order"},
+            fields=["name", "idx", "item_code", "item_name", "description", "qty", "uom"],
+            order_by="idx asc"
+        )
+
+        item_group_map = get_item_group_map([item.item_code for item in so_items])
+        used_qty_map = get_used_qty_map(sales_order)
         items = []
         
-        for idx, item in enumerate(sales_order_doc.items, 1):
-            item_group = frappe.get_value("Item", item.item_code, "item_group")
-            if item_group != "Fabricated Equipment":
+        for item in so_items:
+            if item_group_map.get(item.item_code) != DESIGN_ITEM_GROUP:
                 continue
 
-            used_qty = frappe.db.sql("""
-                SELECT IFNULL(SUM(dri.qty), 0)
-                FROM `tabDesign Request Item Child` dri
-                INNER JOIN `tabDesign Request` dr
-                    ON dr.name = dri.parent
-                WHERE
-                    dr.sales_order = %s
-                    AND dri.so_detail = %s
-                    AND dr.docstatus < 2
-            """, (sales_order, item.name), as_dict=False)[0][0]
-
-            remaining_qty = item.qty - used_qty
+            remaining_qty = flt(item.qty) - used_qty_map.get(item.name, 0)
             if remaining_qty <= 0:
                 continue
 
             items.append({
-                "idx": idx,
+                "idx": item.idx,
                 "item_code": item.item_code,
                 "item_name": item.item_name,
                 "description": item.description or "",
@@ -289,35 +304,24 @@ def get_design_request_items(sales_order):
         frappe.log_error(f"Failed to get design request items: {str(e)}")
         frappe.throw(f"Failed to get design request items: {str(e)}")
 
-import json
-from frappe.utils import flt
 @frappe.whitelist()
+@profile
 def create_design_request_from_sales_order(sales_order, selected_items=None):
     """Create a design request from sales order"""
     try:
-        sales_order_doc = frappe.get_doc("Sales Order", sales_order)
+        sales_order_doc = frappe.db.get_value(
+            "Sales Order", sales_order, ["project", "customer", "customer_name"], as_dict=True
+        )
+        if not sales_order_doc:
+            frappe.throw(_("Sales Order {0} not found").format(sales_order))
         try:
             selected_items = json.loads(str(selected_items))
         except:
             selected_items = selected_items
 
-        used_map = frappe.db.sql("""
-            SELECT
-                dri.so_detail,
-                SUM(dri.qty) AS used_qty
-            FROM `tabDesign Request Item Child` dri
-            INNER JOIN `tabDesign Request` dr
-                ON dr.name = dri.parent
-            WHERE
-                dr.sales_order = %s
-                AND dr.docstatus < 2
-            GROUP BY dri.so_detail
-        """, sales_order, as_dict=True)
-
-        used_qty_map = {
-            row.so_detail: row.used_qty
-            for row in used_map
-        }
+        selected_items = [row for row in selected_items if flt(row.get("qty", 0)) > 0]
+        so_items = lock_sales_order_items(sales_order, [row["so_detail"] for row in selected_items])
+        used_qty_map = get_used_qty_map(sales_order)
         
         # Create design request
         design_request = frappe.new_doc("Design Request")
@@ -327,19 +331,15 @@ def create_design_request_from_sales_order(sales_order, selected_items=None):
         design_request.customer_name = sales_order_doc.customer_name
         
         if sales_order_doc.project:
-            project = frappe.get_doc("Project", sales_order_doc.project)
-            design_request.project_name = project.project_name
+            design_request.project_name = frappe.db.get_value("Project", sales_order_doc.project, "project_name")
         
         for row in selected_items:
             requested_qty = flt(row.get("qty", 0))
-            if requested_qty <= 0:
-                continue
 
-            so_item = frappe.get_doc("Sales Order Item", row["so_detail"])
-
-            frappe.db.sql(
-                    "SELECT name FROM `tabSales Order Item` WHERE name = %s FOR UPDATE",
-                    so_item.name
+            so_item = so_items.get(row["so_detail"])
+            if not so_item:
+                frappe.throw(
+                    _("Sales Order Item {0} does not belong to {1}").format(row["so_detail"], sales_order)
                 )
 
             used_qty = used_qty_map.get(so_item.name, 0)
@@ -364,11 +364,15 @@ def create_design_request_from_sales_order(sales_order, selected_items=None):
         if not design_request.items:
             frappe.throw("No valid items to create Design Request")  
         
-        # Save the design request (autoname will be called automatically)
+        # Save the design request (autoname will be called automatically);
+        # its item rows go out in one multi-row INSERT, see db_insert
+        design_request.flags.bulk_insert_items = True
         design_request.insert()
         frappe.logger().info(f"Design request saved with name: {design_request.name}")
 
         # Create standalone Design Request Item docs for list view
+        company = design_request.company or frappe.defaults.get_global_default("company")
+        item_docs = []
         for child in design_request.items:
             item_doc = frappe.new_doc("Design Request Item")
             item_doc.item_code = child.item_code
@@ -379,12 +383,10 @@ def create_design_request_from_sales_order(sales_order, selected_items=None):
             item_doc.design_status = child.design_status
             item_doc.approval_status = child.approval_status
             item_doc.design_request = design_request.name
-            item_doc.company = design_request.company or frappe.defaults.get_global_default("company")
-            item_doc.insert(ignore_permissions=True)
-            # link back
+            item_doc.company = company
+            item_docs.append(item_doc)
 
-        
-        # Verify items were saved
+        bulk_insert_design_request_items(item_docs)
         
         frappe.msgprint(f"Design Request {design_request.name} created successfully with {len(design_request.items)} items")
         return design_request.name
@@ -393,158 +395,308 @@ def create_design_request_from_sales_order(sales_order, selected_items=None):
         frappe.log_error(f"Failed to create design request: {str(e)}")
         frappe.throw(f"Failed to create design request: {str(e)}")
 
+def lock_sales_order_items(sales_order, so_details):
+    """Lock the selected Sales Order Items with one statement and return them by name"""
+    if not so_details:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT name, item_code, item_name, description, qty, uom
+        FROM `tabSales Order Item`
+        WHERE parent = %(sales_order)s
+            AND parenttype = 'Sales Order'
+            AND name IN %(so_details)s
+        FOR UPDATE
+    """, {"sales_order": sales_order, "so_details": tuple(set(so_details))}, as_dict=True)
+
+    return {row.name: row for row in rows}
+
+MAX_PAGE_LENGTH = 500
+
+# Output key -> SQL expression for the design items listing. Anything a client
+# asks for through ``fields`` must be a key of this map.
+DESIGN_ITEM_COLUMNS = {
+    "item_id": "di.name",
+    "request_id": "dr.name",
+    "sales_order": "dr.sales_order",
+    "project": "dr.project",
+    "project_name": "dr.project_name",
+    "customer": "dr.customer",
+    "customer_name": "dr.customer_name",
+    "assigned_to": "dr.assigned_to",
+    "request_status": "dr.status",
+    "priority": "dr.priority",
+    "request_date": "dr.request_date",
+    "expected_completion": "dr.expected_completion",
+    "item_code": "di.item_code",
+    "item_name": "di.item_name",
+    "description": "di.description",
+    "qty": "di.qty",
+    "uom": "di.uom",
+    "design_status": "di.design_status",
+    "current_stage": "di.current_stage",
+    "approval_status": "di.approval_status",
+    "sku_generated": "di.sku_generated",
+    "item_created": "di.item_created",
+    "bom_created": "di.bom_created",
+    "nesting_completed": "di.nesting_completed",
+    "new_item_code": "di.new_item_code",
+    "bom_name": "di.bom_name",
+    "days_since_request": "IFNULL(DATEDIFF(CURDATE(), dr.request_date), 0)",
+    "is_overdue": f"(di.design_status != 'Completed' AND IFNULL(DATEDIFF(CURDATE(), dr.request_date), 0) > {OVERDUE_DAYS})",
+}
+
+# sort_by value -> SQL expression. NULLs are folded to a constant so the keyset
+# comparison in the cursor condition stays well defined.
+DESIGN_ITEM_SORT_MAP = {
+    "creation": "dr.creation",
+    "status": "IFNULL(di.design_status, '')",
+    "customer": "IFNULL(dr.customer_name, '')",
+    "sales_order": "IFNULL(dr.sales_order, '')",
+    "assigned_to": "IFNULL(dr.assigned_to, '')",
+    "priority": "IFNULL(dr.priority, '')",
+    "request_date": "IFNULL(dr.request_date, '1900-01-01')",
+}
+
+# filter key -> (SQL condition, whether the value is matched with LIKE)
+DESIGN_ITEM_FILTERS = {
+    "status": ("di.design_status = %(status)s", False),
+    "project_status": ("dr.status = %(project_status)s", False),
+    "customer": ("dr.customer_name LIKE %(customer)s", True),
+    "sales_order": ("dr.sales_order LIKE %(sales_order)s", True),
+    "assigned_to": ("dr.assigned_to = %(assigned_to)s", False),
+    "project": ("dr.project_name LIKE %(project)s", True),
+    "item_code": ("di.item_code LIKE %(item_code)s", True),
+    "item_name": ("di.item_name LIKE %(item_name)s", True),
+}
+
+def _get_design_item_conditions(filters):
+    """Return the WHERE clause and bound values for the design items listing"""
+    conditions = ["dr.docstatus = 0"]
+    values = {}
+
+    for key, (condition, is_like) in DESIGN_ITEM_FILTERS.items():
+        value = (filters or {}).get(key)
+        if not value:
+            continue
+        conditions.append(condition)
+        values[key] = f"%{value}%" if is_like else value
+
+    item_ids = (filters or {}).get("item_ids")
+    if item_ids:
+        conditions.append("di.name IN %(item_ids)s")
+        values["item_ids"] = tuple(item_ids)
+
+    return conditions, values
+
+def _get_design_item_columns(fields=None):
+    """Validate the requested projection against DESIGN_ITEM_COLUMNS"""
+    fields = frappe.parse_json(fields) if fields else list(DESIGN_ITEM_COLUMNS)
+
+    invalid = [field for field in fields if field not in DESIGN_ITEM_COLUMNS]
+    if invalid:
+        frappe.throw(_("Invalid fields requested: {0}").format(", ".join(invalid)))
+
+    # item_id is the keyset tie-breaker and the handle every client acts on
+    if "item_id" not in fields:
+        fields = ["item_id", *fields]
+
+    return ", ".join(f"{DESIGN_ITEM_COLUMNS[field]} AS `{field}`" for field in fields)
+
+def _get_design_item_order(sort_by, sort_order):
+    """Return the allow-listed sort expression and direction"""
+    sort_expr = DESIGN_ITEM_SORT_MAP.get(sort_by, DESIGN_ITEM_SORT_MAP["creation"])
+    direction = "ASC" if str(sort_order).lower() == "asc" else "DESC"
+    return sort_expr, direction
+
+def _encode_cursor(sort_value, name):
+    return base64.urlsafe_b64encode(json.dumps([str(sort_value), name]).encode()).decode()
+
+def _decode_cursor(cursor):
+    try:
+        sort_value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        frappe.throw(_("Invalid cursor"))
+    return sort_value, name
+
+def query_design_items(filters=None, sort_by="creation", sort_order="desc", cursor=None,
+                       page_length=None, fields=None):
+    """Run the design items listing and return ``(rows, next_cursor)``.
+
+    Pages are keyset based: ``cursor`` carries the sort value and item name of
+    the last row of the previous page, so every page costs the same no matter
+    how deep the client has scrolled. ``page_length=None`` returns all rows.
+    """
+    filters = frappe.parse_json(filters) if filters else {}
+    conditions, values = _get_design_item_conditions(filters)
+    sort_expr, direction = _get_design_item_order(sort_by, sort_order)
+
+    if cursor:
+        values["cursor_value"], values["cursor_name"] = _decode_cursor(cursor)
+        operator = ">" if direction == "ASC" else "<"
+        conditions.append(
+            f"({sort_expr} {operator} %(cursor_value)s"
+            f" OR ({sort_expr} = %(cursor_value)s AND di.name {operator} %(cursor_name)s))"
+        )
+
+    query = f"""
+        SELECT {_get_design_item_columns(fields)}, {sort_expr} AS `_sort_key`
+        FROM `tabDesign Request Item` di
+        INNER JOIN `tabDesign Request` dr ON di.design_request = dr.name
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {sort_expr} {direction}, di.name {direction}
+    """
+
+    if page_length:
+        # one extra row tells us whether another page exists
+        values["limit"] = page_length + 1
+        query += " LIMIT %(limit)s"
+
+    rows = frappe.db.sql(query, values, as_dict=True)
+
+    next_cursor = None
+    if page_length and len(rows) > page_length:
+        rows = rows[:page_length]
+        next_cursor = _encode_cursor(rows[-1]["_sort_key"], rows[-1]["item_id"])
+
+    for row in rows:
+        row.pop("_sort_key", None)
+        if "is_overdue" in row:
+            row["is_overdue"] = bool(row["is_overdue"])
+
+    return rows, next_cursor
+
+def get_design_items_summary(filters=None):
+    """Count the rows matching ``filters`` along with their status split"""
+    filters = frappe.parse_json(filters) if filters else {}
+    conditions, values = _get_design_item_conditions(filters)
+
+    summary = frappe.db.sql(f"""
+        SELECT
+            COUNT(*) AS total,
+            IFNULL(SUM(di.design_status != 'Completed'), 0) AS pending,
+            IFNULL(SUM(di.design_status = 'Completed'), 0) AS completed,
+            IFNULL(SUM({DESIGN_ITEM_COLUMNS["is_overdue"]}), 0) AS overdue
+        FROM `tabDesign Request Item` di
+        INNER JOIN `tabDesign Request` dr ON di.design_request = dr.name
+        WHERE {" AND ".join(conditions)}
+    """, values, as_dict=True)[0]
+
+    return {key: cint(value) for key, value in summary.items()}
+
 @frappe.whitelist()
-def get_all_design_items(filters=None, sort_by="creation", sort_order="desc"):
-    """Get all design items for dashboard view"""
+@profile
+def get_design_items_page(filters=None, sort_by="creation", sort_order="desc", cursor=None,
+                          page_length=50, fields=None, format=None):
+    """Get one page of design items for the tasks page and dashboard.
+
+    The first page (no cursor) also carries ``total_count`` and a status
+    ``summary`` for the filter set; later pages skip the count and the client
+    keeps the value it already has. ``format="columnar"`` sends ``items`` in
+    the compact form described in ``columnar.py``.
+    """
     try:
-        # Build filters
-        filter_conditions = []
-        
-        if filters:
-            if filters.get("status"):
-                filter_conditions.append(f"di.design_status = '{filters['status']}'")
-            if filters.get("customer"):
-                filter_conditions.append(f"dr.customer_name LIKE '%{filters['customer']}%'")
-            if filters.get("sales_order"):
-                filter_conditions.append(f"dr.sales_order LIKE '%{filters['sales_order']}%'")
-            if filters.get("assigned_to"):
-                filter_conditions.append(f"dr.assigned_to = '{filters['assigned_to']}'")
-            if filters.get("project"):
-                filter_conditions.append(f"dr.project_name LIKE '%{filters['project']}%'")
-            if filters.get("item_code"):
-                filter_conditions.append(f"di.item_code LIKE '%{filters['item_code']}%'")
-            if filters.get("item_name"):
-                filter_conditions.append(f"di.item_name LIKE '%{filters['item_name']}%'")
-        
-        # Build the query
-        query = """
-            SELECT 
-                di.name as item_id,
-                dr.name as request_id,
-                dr.sales_order,
-                dr.project,
-                dr.project_name,
-                dr.customer,
-                dr.customer_name,
-                dr.assigned_to,
-                dr.status as request_status,
-                dr.priority,
-                dr.request_date,
-                dr.expected_completion,
-                di.item_code,
-                di.item_name,
-                di.description,
-                di.qty,
-                di.uom,
-                di.rate,
-                di.amount,
-                di.design_status,
-                di.current_stage,
-                di.approval_status,
-                di.sku_generated,
-                di.item_created,
-                di.bom_created,
-                di.nesting_completed,
-                di.new_item_code,
-                di.bom_name,
-                di.idx
-            FROM `tabDesign Request Item` di
-            INNER JOIN `tabDesign Request` dr ON di.parent = dr.name
-            WHERE dr.docstatus = 0
-        """
-        
-        if filter_conditions:
-            query += " AND " + " AND ".join(filter_conditions)
-        
-        # Add sorting
-        if sort_by == "creation":
-            query += f" ORDER BY dr.creation {sort_order}"
-        elif sort_by == "status":
-            query += f" ORDER BY di.design_status {sort_order}"
-        elif sort_by == "customer":
-            query += f" ORDER BY dr.customer_name {sort_order}"
-        elif sort_by == "sales_order":
-            query += f" ORDER BY dr.sales_order {sort_order}"
-        elif sort_by == "assigned_to":
-            query += f" ORDER BY dr.assigned_to {sort_order}"
-        elif sort_by == "priority":
-            query += f" ORDER BY dr.priority {sort_order}"
-        elif sort_by == "request_date":
-            query += f" ORDER BY dr.request_date {sort_order}"
-        else:
-            query += f" ORDER BY dr.creation {sort_order}"
-        
-        items = frappe.db.sql(query, as_dict=True)
-        
-        # Add additional computed fields
-        for item in items:
-            item["days_since_request"] = (frappe.utils.nowdate() - item["request_date"].date()).days if item["request_date"] else 0
-            item["is_overdue"] = item["days_since_request"] > 7  # Consider overdue after 7 days
-        
-        return items
-        
+        format = validate_format(format)
+        page_length = min(max(cint(page_length), 1), MAX_PAGE_LENGTH)
+        items, next_cursor = query_design_items(
+            filters, sort_by, sort_order, cursor=cursor, page_length=page_length, fields=fields
+        )
+
+        response = {
+            "items": to_columnar(items) if format == COLUMNAR else items,
+            "next_cursor": next_cursor,
+            "has_more": bool(next_cursor),
+            "total_count": None,
+        }
+
+        if not cursor:
+            response["summary"] = get_design_items_summary(filters)
+            response["total_count"] = response["summary"]["total"]
+
+        return response
+
+    except Exception as e:
+        frappe.log_error(f"Failed to get design items page: {str(e)}")
+        frappe.throw(f"Failed to get design items: {str(e)}")
+
+@frappe.whitelist()
+def get_design_item_rows(names, fields=None):
+    """Re-read the board rows named by ``design_board_patch`` events.
+
+    Patches carry no values, so boards fetch them here; only items the user
+    can read through ``frappe.get_list`` (User Permissions included) come back.
+    """
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    names = list(names or [])[:MAX_PAGE_LENGTH]
+    if not names:
+        return []
+
+    permitted = frappe.get_list(
+        "Design Request Item", filters={"name": ["in", names]}, pluck="name", limit=len(names)
+    )
+    if not permitted:
+        return []
+
+    rows, _ = query_design_items({"item_ids": permitted}, fields=fields)
+    return rows
+
+@frappe.whitelist()
+@profile
+def get_all_design_items(filters=None, sort_by="creation", sort_order="desc", format=None):
+    """Get all design items for dashboard view.
+
+    Kept for callers that still expect the full list; new code should page
+    through ``get_design_items_page`` instead. ``format="columnar"`` returns
+    the compact form described in ``columnar.py``.
+    """
+    try:
+        format = validate_format(format)
+        items, _next_cursor = query_design_items(filters, sort_by, sort_order)
+        return to_columnar(items) if format == COLUMNAR else items
+
     except Exception as e:
         frappe.log_error(f"Failed to get design items: {str(e)}")
         frappe.throw(f"Failed to get design items: {str(e)}")
 
+# statuses each role may move a design item to; Administrator may set any
+ITEM_STATUS_ROLE_PERMISSIONS = {
+    "Project Manager": ["Approval Drawing", "Send for Approval", "Design"],
+    "Project User": ["Approval Drawing", "Send for Approval", "Design"],
+    "Design Manager": ["Send for Approval", "Modelling", "Production Drawing", "BOM", "Nesting"],
+    "Design User": ["Send for Approval", "Modelling", "Production Drawing", "BOM", "Nesting"]
+}
+
+# these create Items / BOMs / Work Orders, so they still go through the full document
+DOCUMENT_PATH_STATUSES = ("SKU Generation", "BOM", "Completed")
+
+# columns written by write_item_statuses; its rows are loaded with these
+STATUS_WRITE_FIELDS = ("design_status", "current_stage", "start_date", "completion_date", "nesting_completed")
+
+# batches above this size run as a background job
+BULK_STATUS_SYNC_LIMIT = 100
+BULK_STATUS_CHUNK = 500
+BULK_STATUS_PROGRESS_EVENT = "design_bulk_status_progress"
+
+def check_item_status_permission(new_status):
+    """Throw unless the session user may move design items to ``new_status``"""
+    if frappe.session.user == "Administrator":
+        return
+
+    allowed_statuses = set()
+    for role in frappe.get_roles(frappe.session.user):
+        allowed_statuses.update(ITEM_STATUS_ROLE_PERMISSIONS.get(role, []))
+
+    if new_status not in allowed_statuses:
+        frappe.throw(_("You don't have permission to set status to {0}").format(new_status))
+
 @frappe.whitelist()
+@profile
 def update_item_status(item_id, new_status):
     """Update individual item status"""
     try:
         item = frappe.get_doc("Design Request Item", item_id)
-        
-        # Validate role permissions
-        user_roles = frappe.get_roles(frappe.session.user)
-        allowed_statuses = []
-        
-        role_permissions = {
-            "Project Manager": ["Approval Drawing", "Send for Approval", "Design"],
-            "Project User": ["Approval Drawing", "Send for Approval", "Design"],
-            "Design Manager": ["Send for Approval", "Modelling", "Production Drawing", "BOM", "Nesting"],
-            "Design User": ["Send for Approval", "Modelling", "Production Drawing", "BOM", "Nesting"]
-        }
-        
-        for role in user_roles:
-            if role in role_permissions:
-                allowed_statuses.extend(role_permissions[role])
-        
-        if new_status not in allowed_statuses and frappe.session.user != "Administrator":
-            frappe.throw(_("You don't have permission to set status to {0}").format(new_status))
-        
-        # Log the transition
-        old_status = item.design_status
-        item.design_status = new_status
-        item.current_stage = new_status
-        
-        # Handle special status transitions
-        if new_status == "SKU Generation":
-            item.sku_generated = 1
-            # Create or link item
-            create_or_link_item(item)
-        elif new_status == "BOM":
-            item.bom_created = 1
-            # Create BOM
-            create_bom_for_item(item)
-        elif new_status == "Nesting":
-            item.nesting_completed = 1
-        elif new_status == "Completed":
-            item.completion_date = now_datetime()
-        
-        # Log stage transition
-        item.append("stage_transition_log", {
-            "stage": "Design Item",
-            "from_status": old_status,
-            "to_status": new_status,
-            "transition_date": now_datetime(),
-            "transitioned_by": frappe.session.user,
-            "remarks": f"Status changed to {new_status}"
-        })
-        
-        item.save()
-        
-        # Check if parent request should be completed
-        parent = frappe.get_doc("Design Request", item.parent)
-        parent.check_completion_status()
+        check_item_status_permission(new_status)
+        set_item_status(item, new_status)
         
         frappe.msgprint(f"Item status updated to {new_status}")
         return True
@@ -553,6 +705,207 @@ def update_item_status(item_id, new_status):
         frappe.log_error(f"Failed to update item status: {str(e)}")
         frappe.throw(f"Failed to update item status: {str(e)}")
 
+def set_item_status(item, new_status):
+    """Move one loaded Design Request Item to ``new_status`` and save it"""
+    item.design_status = new_status
+    item.current_stage = new_status
+    
+    # Handle special status transitions
+    if new_status == "SKU Generation":
+        item.sku_generated = 1
+        # Create or link item
+        create_or_link_item(item)
+    elif new_status == "BOM":
+        item.bom_created = 1
+        # Create BOM
+        create_bom_for_item(item)
+    elif new_status == "Nesting":
+        item.nesting_completed = 1
+    elif new_status == "Completed":
+        item.completion_date = now_datetime()
+    
+    # the item's on_update appends the transition to the Design Stage Log;
+    # closes the parent request through the open item counter once all items are done
+    item.save()
+
+@frappe.whitelist()
+@profile
+def bulk_update_item_status(items, new_status):
+    """Move many Design Request Items to ``new_status`` in one call.
+
+    Returns ``{"results": [{"item", "status", "error"}]}`` with a status of
+    updated, unchanged, not_found, not_permitted (outside the user's User
+    Permissions) or failed per item. Batches larger than
+    BULK_STATUS_SYNC_LIMIT are queued instead and ``{"job_id", "total"}`` is
+    returned; the job publishes BULK_STATUS_PROGRESS_EVENT as it goes.
+    """
+    items = list(dict.fromkeys(frappe.parse_json(items) or []))
+    if not frappe.has_permission("Design Request Item", "write"):
+        frappe.throw(_("Not permitted to update Design Request Items"), frappe.PermissionError)
+    check_item_status_permission(new_status)
+
+    if len(items) > BULK_STATUS_SYNC_LIMIT:
+        job_id = f"design_bulk_status::{frappe.generate_hash(length=10)}"
+        frappe.enqueue(
+            apply_item_status_batch,
+            queue="long",
+            job_id=job_id,
+            items=items,
+            new_status=new_status,
+            progress_id=job_id
+        )
+        return {"job_id": job_id, "total": len(items)}
+
+    return {"results": apply_item_status_batch(items, new_status)}
+
+def apply_item_status_batch(items, new_status, progress_id=None):
+    """Apply a status to ``items`` chunk by chunk; commits per chunk when run as a job"""
+    results = {}
+    for start in range(0, len(items), BULK_STATUS_CHUNK):
+        results.update(apply_item_status_chunk(items[start:start + BULK_STATUS_CHUNK], new_status))
+
+        if progress_id:
+            frappe.db.commit()
+            frappe.publish_realtime(
+                BULK_STATUS_PROGRESS_EVENT,
+                {"job_id": progress_id, "done": min(start + BULK_STATUS_CHUNK, len(items)), "total": len(items)},
+                user=frappe.session.user
+            )
+
+    results = [results[name] for name in items]
+    if progress_id:
+        frappe.publish_realtime(
+            BULK_STATUS_PROGRESS_EVENT,
+            {"job_id": progress_id, "done": len(items), "total": len(items), "results": results},
+            user=frappe.session.user
+        )
+    return results
+
+def apply_item_status_chunk(names, new_status):
+    """Update one chunk with a fixed number of queries; returns ``{name: result}``"""
+    rows = {
+        row.name: row
+        for row in frappe.get_all(
+            "Design Request Item",
+            filters={"name": ["in", names]},
+            fields=["name", "design_request", "company", "approval_status", *STATUS_WRITE_FIELDS]
+        )
+    }
+    # the UPDATE below bypasses save(), so User Permissions are applied here
+    permitted = set(frappe.get_list(
+        "Design Request Item", filters={"name": ["in", list(rows)]}, pluck="name", limit=len(rows)
+    )) if rows else set()
+
+    results, changed = {}, []
+    for name in names:
+        row = rows.get(name)
+        if not row:
+            results[name] = {"item": name, "status": "not_found"}
+        elif name not in permitted:
+            results[name] = {"item": name, "status": "not_permitted"}
+        elif row.design_status == new_status:
+            results[name] = {"item": name, "status": "unchanged"}
+        else:
+            changed.append(row)
+
+    if new_status in DOCUMENT_PATH_STATUSES:
+        for row in changed:
+            frappe.db.savepoint("design_bulk_status")
+            try:
+                set_item_status(frappe.get_doc("Design Request Item", row.name), new_status)
+                results[row.name] = {"item": row.name, "status": "updated"}
+            except Exception as e:
+                frappe.db.rollback(save_point="design_bulk_status")
+                frappe.clear_messages()
+                results[row.name] = {"item": row.name, "status": "failed", "error": str(e)}
+        return results
+
+    if changed:
+        write_item_statuses(changed, new_status)
+        for row in changed:
+            results[row.name] = {"item": row.name, "status": "updated"}
+    return results
+
+def get_status_writes(row, new_status, now):
+    """``{field: value}`` that moving loaded ``row`` to ``new_status`` writes, as in ``write_item_statuses``"""
+    return {
+        "design_status": new_status,
+        "current_stage": new_status,
+        "start_date": now if not row.start_date and new_status != "Pending" else row.start_date,
+        "completion_date": now if new_status == "Completed" else row.completion_date,
+        "nesting_completed": 1 if new_status == "Nesting" else row.nesting_completed,
+    }
+
+def make_status_version(row, values):
+    """Named, unsaved Version of a raw status write, as the item's track_changes would record it"""
+    version = frappe.new_doc("Version")
+    version.update({
+        "name": frappe.generate_hash(length=10),
+        "ref_doctype": "Design Request Item",
+        "docname": row.name,
+        "data": frappe.as_json({
+            "changed": [[field, row.get(field), value] for field, value in values.items() if row.get(field) != value],
+            "added": [],
+            "removed": [],
+            "row_changed": [],
+            "data_import": None,
+            "updater_reference": None,
+        }),
+    })
+    version.set_user_and_timestamp()
+    return version
+
+def write_item_statuses(rows, new_status):
+    """Set the status of loaded item ``rows`` with one UPDATE and one stage log INSERT.
+
+    Does what ``set_item_status`` and the item's save hooks would, for status
+    changes without side effects: stage timestamps, stage log rows, Version
+    rows (the doctype tracks changes), status counts, open item counters and
+    the stats cache. ``rows`` need the fields in STATUS_WRITE_FIELDS.
+    """
+    now, user = now_datetime(), frappe.session.user
+    names = tuple(row.name for row in rows)
+
+    frappe.db.sql("""
+        UPDATE `tabDesign Request Item`
+        SET
+            design_status = %(status)s,
+            current_stage = %(status)s,
+            start_date = CASE WHEN start_date IS NULL AND %(status)s != 'Pending' THEN %(now)s ELSE start_date END,
+            completion_date = CASE WHEN %(status)s = 'Completed' THEN %(now)s ELSE completion_date END,
+            nesting_completed = CASE WHEN %(status)s = 'Nesting' THEN 1 ELSE nesting_completed END,
+            modified = %(now)s,
+            modified_by = %(user)s
+        WHERE name IN %(names)s
+    """, {"status": new_status, "now": now, "user": user, "names": names})
+
+    transitions, versions = [], []
+    status_deltas, open_deltas = Counter(), Counter()
+    for row in rows:
+        updated = frappe._dict(row, design_status=new_status)
+        versions.append(make_status_version(row, get_status_writes(row, new_status, now)))
+        transitions.append(make_stage_log(
+            row.name, row.design_request, row.design_status, new_status, transition_date=now, transitioned_by=user
+        ))
+
+        status_deltas[get_status_key(row, "Design Request Item")] -= 1
+        status_deltas[get_status_key(updated, "Design Request Item")] += 1
+        if row.design_request:
+            open_deltas[row.design_request] += int(is_open(updated)) - int(is_open(row))
+
+    insert_stage_logs(transitions)
+    bulk_insert_docs(versions)
+    fields = ["design_status", "current_stage"]
+    if new_status == "Nesting":
+        fields.append("nesting_completed")
+    publish_patches([make_item_patch(row.name, fields) for row in rows])
+    update_status_counts(status_deltas)
+    update_open_items(open_deltas)
+    for design_request, delta in open_deltas.items():
+        if delta < 0:
+            close_if_complete(design_request)
+    clear_design_stats_cache()
+
 def create_or_link_item(item):
     """Create new item or link existing item for SKU generation"""
     try:
@@ -630,26 +983,15 @@ def create_bom_for_item(item):
         frappe.throw(f"Failed to create BOM: {str(e)}")
 
 @frappe.whitelist()
+@profile
 def get_dashboard_stats():
     """Get dashboard statistics for design requests"""
-    stats = {
-        "total_requests": frappe.db.count("Design Request"),
-        "open_requests": frappe.db.count("Design Request", {"status": "Open"}),
-        "closed_requests": frappe.db.count("Design Request", {"status": "Closed"}),
-        "my_requests": frappe.db.count("Design Request", {"assigned_to": frappe.session.user}),
-        "total_items": frappe.db.count("Design Request Item"),
-        "pending_items": frappe.db.count("Design Request Item", {"design_status": "Pending"}),
-        "completed_items": frappe.db.count("Design Request Item", {"design_status": "Completed"}),
-        "overdue_items": frappe.db.sql("""
-            SELECT COUNT(*) FROM `tabDesign Request Item` di
-            INNER JOIN `tabDesign Request` dr ON di.parent = dr.name
-            WHERE dr.docstatus = 0 AND di.design_status != 'Completed'
-            AND DATEDIFF(CURDATE(), dr.request_date) > 7
-        """)[0][0]
-    }
+    stats = dict(get_design_stats())
+    stats["my_requests"] = get_my_request_count()
     return stats
 
 @frappe.whitelist()
+@profile
 def update_design_status(design_request, new_status):
     """Update design request status"""
     try:
@@ -661,6 +1003,7 @@ def update_design_status(design_request, new_status):
         frappe.throw(f"Failed to update design status: {str(e)}")
 
 @frappe.whitelist()
+@profile
 def assign_to_user(design_request, user):
     """Assign design request to user"""
     try:
@@ -672,6 +1015,7 @@ def assign_to_user(design_request, user):
         frappe.throw(f"Failed to assign design request: {str(e)}")
 
 @frappe.whitelist()
+@profile
 def add_comment(design_request, comment):
     """Add comment to design request"""
     try:
@@ -683,6 +1027,7 @@ def add_comment(design_request, comment):
         frappe.throw(f"Failed to add comment: {str(e)}")
 
 @frappe.whitelist()
+@profile
 def get_recent_requests(limit=10):
     """Get recent design requests"""
     requests = frappe.get_all(
@@ -694,6 +1039,7 @@ def get_recent_requests(limit=10):
     return requests
 
 @frappe.whitelist()
+@profile
 def get_request_details(request_name):
     """Get detailed information about a design request"""
     request = frappe.get_doc("Design Request", request_name)
@@ -725,6 +1071,7 @@ def get_request_details(request_name):
     } 
 
 @frappe.whitelist()
+@profile
 def test_design_request_data(design_request_name):
     """Test function to verify design request data"""
     try:
@@ -749,26 +1096,19 @@ def test_design_request_data(design_request_name):
         return {"error": str(e)} 
 
 @frappe.whitelist()
+@profile
 def get_design_stages_chart_data():
     """Get data for design stages chart"""
     try:
-        # Get count of items by design status
-        stages_data = frappe.db.sql("""
-            SELECT 
-                design_status,
-                COUNT(*) as count
-            FROM `tabDesign Request Item`
-            WHERE design_status IS NOT NULL
-            GROUP BY design_status
-            ORDER BY count DESC
-        """, as_dict=True)
+        # Get count of items by design status from the running counts
+        stages_data = get_status_counts("Design Request Item", "status")
         
         # Format data for chart
         chart_data = {
-            "labels": [item.design_status for item in stages_data],
+            "labels": [item.status for item in stages_data if item.status],
             "datasets": [{
                 "name": "Items by Stage",
-                "values": [item.count for item in stages_data]
+                "values": [item.count for item in stages_data if item.status]
             }]
         }
         
@@ -779,26 +1119,19 @@ def get_design_stages_chart_data():
         return {"labels": [], "datasets": []}
 
 @frappe.whitelist()
+@profile
 def get_design_requests_chart_data():
     """Get data for design requests chart"""
     try:
-        # Get count of design requests by status
-        requests_data = frappe.db.sql("""
-            SELECT 
-                status,
-                COUNT(*) as count
-            FROM `tabDesign Request`
-            WHERE status IS NOT NULL
-            GROUP BY status
-            ORDER BY count DESC
-        """, as_dict=True)
+        # Get count of design requests by status from the running counts
+        requests_data = get_status_counts("Design Request", "status")
         
         # Format data for chart
         chart_data = {
-            "labels": [item.status for item in requests_data],
+            "labels": [item.status for item in requests_data if item.status],
             "datasets": [{
                 "name": "Design Requests by Status",
-                "values": [item.count for item in requests_data]
+                "values": [item.count for item in requests_data if item.status]
             }]
         }
         
@@ -806,4 +1139,8 @@ def get_design_requests_chart_data():
         
     except Exception as e:
         frappe.log_error(f"Failed to get design requests chart data: {str(e)}")
-        return {"labels": [], "datasets": []} 
\ No newline at end of file
+        return {"labels": [], "datasets": []} 
+
+
+def on_doctype_update():
+    add_doctype_indexes("Design Request")
\ No newline at end of file
@@ -0,0 +1,388 @@
+# Copyright (c) 2025, AxelGear and Contributors
+# See license.txt
+
+import json
+import math
+import threading
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from design_integration.design_integration.benchmark import run as run_benchmark
+from design_integration.design_integration.benchmark import seed as seed_benchmark
+from design_integration.design_integration.columnar import from_columnar
+from design_integration.design_integration.completion import reconcile_open_items
+from design_integration.design_integration.dashboard import DESIGN_STATS_CACHE_KEY, get_design_stats
+from design_integration.design_integration.doctype.design_request.design_request import (
+	DESIGN_ITEM_GROUP,
+	DesignRequest,
+	check_overdue_items,
+	create_design_request_from_sales_order,
+	get_all_design_items,
+	get_dashboard_stats,
+	get_design_items_page,
+	get_design_request_items,
+)
+from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+	bulk_insert_design_request_items,
+)
+from design_integration.design_integration.indexes import check_query_plans
+from design_integration.design_integration.naming import (
+	ensure_sequence_at_least,
+	get_design_request_series_key,
+	next_sequence,
+)
+from design_integration.design_integration.overdue_digest import DIGEST_CHUNK_SIZE, send_overdue_digests
+from design_integration.design_integration.profiling import PROFILING_FLAG, clear_samples, get_samples
+from design_integration.design_integration.query_capture import count_queries
+
+TEST_SALES_ORDER = "_T-SO-DESIGN-NAMING"
+TEST_DESIGN_ITEM = "_Test Fabricated Design Item"
+
+
+def run_in_parallel(target, workers):
+	"""Run ``target()`` from ``workers`` threads, each on its own site connection"""
+	site = frappe.local.site
+	results, errors = [], []
+
+	def worker():
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			results.append(target())
+			frappe.db.commit()
+		except Exception as e:
+			errors.append(e)
+		finally:
+			frappe.destroy()
+
+	threads = [threading.Thread(target=worker) for _ in range(workers)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	return results, errors
+
+
+def make_design_item():
+	"""Item that qualifies for the design workflow"""
+	if not frappe.db.exists("Item Group", DESIGN_ITEM_GROUP):
+		frappe.get_doc(
+			{
+				"doctype": "Item Group",
+				"item_group_name": DESIGN_ITEM_GROUP,
+				"parent_item_group": "All Item Groups",
+			}
+		).insert()
+
+	if not frappe.db.exists("Item", TEST_DESIGN_ITEM):
+		frappe.get_doc(
+			{
+				"doctype": "Item",
+				"item_code": TEST_DESIGN_ITEM,
+				"item_group": DESIGN_ITEM_GROUP,
+				"stock_uom": "Nos",
+				"is_stock_item": 0,
+			}
+		).insert()
+
+	return TEST_DESIGN_ITEM
+
+
+def make_design_sales_order(lines):
+	"""Submitted Sales Order with ``lines`` design-eligible rows"""
+	from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+
+	item_code = make_design_item()
+	return make_sales_order(
+		item_list=[
+			{"item_code": item_code, "qty": 2, "rate": 100, "warehouse": "_Test Warehouse - _TC"}
+			for _ in range(lines)
+		]
+	)
+
+
+def make_overdue_items(users, items_per_user):
+	"""One month-old Design Request per user, each with ``items_per_user`` pending items"""
+	item_code = make_design_item()
+
+	for user in users:
+		if not frappe.db.exists("User", user):
+			frappe.get_doc(
+				{"doctype": "User", "email": user, "first_name": user.split("@")[0], "send_welcome_email": 0}
+			).insert()
+
+		request = frappe.get_doc(
+			{
+				"doctype": "Design Request",
+				"sales_order": make_design_sales_order(lines=1).name,
+				"assigned_to": user,
+				"request_date": add_days(now_datetime(), -30),
+				"items": [{"item_code": item_code, "qty": 1}],
+			}
+		).insert()
+		bulk_insert_design_request_items(
+			[
+				frappe.new_doc("Design Request Item", item_code=item_code, qty=1, design_request=request.name)
+				for _ in range(items_per_user)
+			]
+		)
+
+
+class TestDesignRequest(FrappeTestCase):
+	def setUp(self):
+		self.series_key = get_design_request_series_key(TEST_SALES_ORDER)
+		self.clear_series()
+
+	def tearDown(self):
+		self.clear_series()
+
+	def clear_series(self):
+		frappe.db.sql("DELETE FROM `tabSeries` WHERE name = %s", self.series_key)
+		frappe.db.commit()
+
+	def test_autoname_uses_sales_order_counter(self):
+		first = frappe.new_doc("Design Request")
+		first.sales_order = TEST_SALES_ORDER
+		first.autoname()
+
+		second = frappe.new_doc("Design Request")
+		second.sales_order = TEST_SALES_ORDER
+		second.autoname()
+
+		self.assertEqual(first.name, f"{TEST_SALES_ORDER}-1")
+		self.assertEqual(second.name, f"{TEST_SALES_ORDER}-2")
+
+	def test_backfilled_counter_continues_after_existing_names(self):
+		ensure_sequence_at_least(self.series_key, 7)
+		# never moves a counter backwards
+		ensure_sequence_at_least(self.series_key, 3)
+
+		self.assertEqual(next_sequence(self.series_key), 8)
+
+	def test_parallel_allocation_has_no_duplicates(self):
+		frappe.db.commit()
+		results, errors = run_in_parallel(lambda: next_sequence(self.series_key), workers=20)
+
+		self.assertFalse(errors, errors)
+		self.assertEqual(sorted(results), list(range(1, 21)))
+
+	def test_design_request_items_query_count_does_not_grow_with_lines(self):
+		small = make_design_sales_order(lines=5)
+		large = make_design_sales_order(lines=200)
+		# warm the meta cache so only the resolver's own queries are counted
+		get_design_request_items(small.name)
+
+		with self.assertQueryCount(3):
+			self.assertEqual(len(get_design_request_items(small.name)), 5)
+
+		with self.assertQueryCount(3):
+			items = get_design_request_items(large.name)
+
+		self.assertEqual(len(items), 200)
+		self.assertEqual([item["idx"] for item in items], list(range(1, 201)))
+		self.assertTrue(all(item["qty"] == 2 for item in items))
+
+	def test_create_design_request_query_count_does_not_grow_with_lines(self):
+		def create(lines):
+			sales_order = make_design_sales_order(lines=lines)
+			selected = [{"so_detail": row.name, "qty": row.qty} for row in sales_order.items]
+			with count_queries() as queries:
+				name = create_design_request_from_sales_order(sales_order.name, frappe.as_json(selected))
+			return name, len(queries)
+
+		create(2)  # warm up meta and link caches
+		_small, small_count = create(10)
+		large, large_count = create(100)
+
+		self.assertEqual(small_count, large_count)
+		self.assertEqual(frappe.db.count("Design Request Item Child", {"parent": large}), 100)
+		self.assertEqual(frappe.db.count("Design Request Item", {"design_request": large}), 100)
+		self.assertFalse(
+			frappe.db.exists("Design Request Item", {"design_request": large, "item_name": ["is", "not set"]})
+		)
+
+	def test_dashboard_stats_are_cached_until_a_design_document_changes(self):
+		frappe.cache().delete_value(DESIGN_STATS_CACHE_KEY)
+		stats = get_dashboard_stats()
+		self.assertEqual(stats["total_requests"], frappe.db.count("Design Request"))
+		self.assertEqual(stats["total_items"], frappe.db.count("Design Request Item"))
+
+		with self.assertQueryCount(0):
+			get_design_stats()
+
+		sales_order = make_design_sales_order(lines=1)
+		create_design_request_from_sales_order(
+			sales_order.name, frappe.as_json([{"so_detail": sales_order.items[0].name, "qty": 1}])
+		)
+
+		self.assertIsNone(frappe.cache().get_value(DESIGN_STATS_CACHE_KEY))
+		self.assertEqual(get_dashboard_stats()["total_requests"], stats["total_requests"] + 1)
+
+	def test_overdue_digest_batches_items_per_assignee(self):
+		users = [f"_test_overdue_{i}@example.com" for i in range(5)]
+		make_overdue_items(users, items_per_user=2000)
+
+		with count_queries() as queries, patch("frappe.enqueue") as enqueue:
+			overdue_count = check_overdue_items()
+
+		self.assertGreaterEqual(overdue_count, 10000)
+		self.assertLessEqual(len(queries), 2)
+		queued_users = [user for call in enqueue.call_args_list for user in call.kwargs["users"]]
+		self.assertTrue(set(users) <= set(queued_users))
+		self.assertEqual(enqueue.call_count, math.ceil(len(queued_users) / DIGEST_CHUNK_SIZE))
+
+		run_id = f"_test-{frappe.generate_hash(length=8)}"
+		with (
+			patch("frappe.sendmail", side_effect=[Exception("SMTP down"), None, None, None, None]) as sendmail,
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe.db, "rollback"),
+			patch("frappe.log_error") as log_error,
+			count_queries() as queries,
+		):
+			send_overdue_digests(run_id, users)
+
+		self.assertEqual(len(queries), 1)
+		self.assertEqual(sendmail.call_count, 5)
+		self.assertEqual(log_error.call_count, 1)
+		self.assertTrue(all(len(call.kwargs["args"]["items"]) == 2000 for call in sendmail.call_args_list))
+
+		# a rerun only retries the user whose digest failed
+		with patch("frappe.sendmail") as sendmail, patch.object(frappe.db, "commit"):
+			send_overdue_digests(run_id, users)
+
+		self.assertEqual(sendmail.call_count, 1)
+		self.assertEqual(sendmail.call_args.kwargs["recipients"], [users[0]])
+
+	@contextmanager
+	def count_save_cycles(self):
+		validate = DesignRequest.validate
+		with patch.object(DesignRequest, "validate", autospec=True, side_effect=validate) as cycles:
+			yield cycles
+
+	def test_completing_items_closes_request_without_saving_it(self):
+		sales_order = make_design_sales_order(lines=2)
+		name = create_design_request_from_sales_order(
+			sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+		)
+		self.assertEqual(frappe.db.get_value("Design Request", name, "open_items"), 2)
+		items = [
+			frappe.get_doc("Design Request Item", item)
+			for item in frappe.get_all("Design Request Item", {"design_request": name}, pluck="name")
+		]
+
+		with self.count_save_cycles() as cycles:
+			items[0].design_status = "Completed"
+			items[0].save()
+			self.assertEqual(frappe.db.get_value("Design Request", name, ["status", "open_items"]), ("Open", 1))
+
+			items[1].design_status = "Completed"
+			items[1].save()
+
+		self.assertEqual(cycles.call_count, 0)
+		request = frappe.db.get_value("Design Request", name, ["status", "open_items", "actual_completion"], as_dict=True)
+		self.assertEqual((request.status, request.open_items), ("Closed", 0))
+		self.assertTrue(request.actual_completion)
+
+	def test_saving_a_stale_request_keeps_open_items(self):
+		sales_order = make_design_sales_order(lines=2)
+		name = create_design_request_from_sales_order(
+			sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+		)
+		request = frappe.get_doc("Design Request", name)
+
+		item = frappe.get_doc("Design Request Item", {"design_request": name})
+		item.design_status = "Completed"
+		item.save()
+
+		request.remarks = "edited after the item was completed"
+		request.save()
+		self.assertEqual(frappe.db.get_value("Design Request", name, "open_items"), 1)
+
+	def test_reconcile_corrects_drift_and_closes_finished_requests(self):
+		sales_order = make_design_sales_order(lines=2)
+		name = create_design_request_from_sales_order(
+			sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+		)
+		frappe.db.sql(
+			"UPDATE `tabDesign Request Item` SET design_status = 'Completed' WHERE design_request = %s", name
+		)
+
+		with patch.object(frappe.db, "commit"):
+			reconcile_open_items()
+
+		request = frappe.db.get_value("Design Request", name, ["status", "open_items"], as_dict=True)
+		self.assertEqual((request.status, request.open_items), ("Closed", 0))
+
+	def test_request_with_completed_rows_closes_in_one_save(self):
+		with self.count_save_cycles() as cycles:
+			request = frappe.get_doc(
+				{
+					"doctype": "Design Request",
+					"sales_order": make_design_sales_order(lines=1).name,
+					"items": [{"item_code": make_design_item(), "qty": 1, "design_status": "Completed"}],
+				}
+			).insert()
+
+		self.assertEqual(cycles.call_count, 1)
+		self.assertEqual(frappe.db.get_value("Design Request", request.name, "status"), "Closed")
+
+	def test_hot_queries_use_indexes(self):
+		# created by each doctype's on_doctype_update when the site was installed
+		make_overdue_items([f"_test_plan_{i}@example.com" for i in range(2)], items_per_user=1000)
+
+		self.assertEqual(check_query_plans(raise_exception=False), [])
+
+	def test_benchmark_reports_every_endpoint(self):
+		seed_benchmark(items=40, items_per_request=10, prefix="_TBENCH")
+		results = run_benchmark(iterations=3, prefix="_TBENCH")
+
+		self.assertEqual(results["iterations"], 3)
+		self.assertIn("create_design_request_from_sales_order", results["endpoints"])
+		for name, timing in results["endpoints"].items():
+			self.assertLessEqual(timing["p50_ms"], timing["p95_ms"], name)
+			self.assertGreaterEqual(timing["queries_max"], timing["queries_p50"], name)
+		# machine readable as is
+		self.assertEqual(json.loads(json.dumps(results)), results)
+
+	def test_columnar_items_decode_to_rows(self):
+		sales_order = make_design_sales_order(lines=3)
+		create_design_request_from_sales_order(
+			sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+		)
+
+		rows = get_all_design_items()
+		payload = get_all_design_items(format="columnar")
+		self.assertEqual(payload["length"], len(rows))
+		self.assertEqual(from_columnar(payload), rows)
+		self.assertTrue(all(isinstance(code, int) for code in payload["values"][payload["columns"].index("design_status")]))
+
+		page = get_design_items_page(page_length=2, format="columnar")
+		self.assertEqual(from_columnar(page["items"]), get_design_items_page(page_length=2)["items"])
+		self.assertEqual(from_columnar(get_all_design_items(filters={"customer": "_No Such Customer"}, format="columnar")), [])
+
+		self.assertRaises(frappe.ValidationError, get_all_design_items, format="xml")
+
+	def test_profiling_records_methods_and_hooks(self):
+		clear_samples()
+		frappe.cache().delete_value(DESIGN_STATS_CACHE_KEY)
+		get_dashboard_stats()
+		self.assertEqual(get_samples(), [])
+
+		with patch.dict(frappe.conf, {PROFILING_FLAG: 1}):
+			frappe.cache().delete_value(DESIGN_STATS_CACHE_KEY)
+			get_dashboard_stats()
+			sample = get_samples(1)[0]
+			self.assertEqual(sample.name, "design_request.get_dashboard_stats")
+			self.assertGreaterEqual(sample.sql_count, 2)
+			self.assertTrue(sample.slowest_sql)
+
+			sales_order = make_design_sales_order(lines=1)
+			create_design_request_from_sales_order(
+				sales_order.name, frappe.as_json([{"so_detail": sales_order.items[0].name, "qty": 1}])
+			)
+			self.assertIn("DesignRequest.validate", {sample.name for sample in get_samples()})
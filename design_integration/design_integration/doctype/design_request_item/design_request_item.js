@@ -13,15 +13,23 @@ frappe.ui.form.on("Design Request Item", {
 
             frm.add_custom_button(__("+ Add New Version"), () => {
 
-                frappe.call({
-                    method:"design_integration.design_integration.doctype.design_request_item.design_request_item.get_version_meta_data",
-                    callback:(r)=>{
-                        if(!r.message) return;
+                load_version_fields(frm).then((version_fields) => {
 
                         // Build dialog fields except design_request_item
-                        const fields = r.message.fields
+                        const fields = version_fields
                             .filter(df => df.fieldname !== "design_request_item")
+                            .filter(df => df.fieldname !== "version_blob")
                             .map(df => {
+                                if (df.fieldname === "new_version_file") {
+                                    // large files are sent in resumable chunks on Create
+                                    return {
+                                        fieldname: df.fieldname,
+                                        label: df.label,
+                                        fieldtype: "HTML",
+                                        options: '<label class="control-label">' + __(df.label) + '</label>'
+                                            + '<input type="file" class="form-control design-version-file">'
+                                    }
+                                }
                                 return {
                                     ...df,
                                     read_only: df.fieldname === "version_tag" ? 1 : 0
@@ -37,34 +45,56 @@ frappe.ui.form.on("Design Request Item", {
 
                                 // Force-set link without showing in dialog
                                 values.design_request_item = frm.doc.name;
-
-                                frappe.call({
-                                    method: "frappe.client.insert",
-                                    args: {
-                                        doc: {
-                                            doctype: "Design Version",
-                                            ...values
+                                // the tag shown is a preview; it is reserved when the version is inserted
+                                delete values.version_tag;
+
+                                const file = d.fields_dict.new_version_file.$wrapper.find("input[type=file]")[0].files[0];
+                                const created = (version) => {
+                                    frappe.msgprint(__("Design Version {0} Created", [version.version_tag]));
+                                    d.hide();
+                                    frappe.call({
+                                        method: "frappe.client.set_value",
+                                        args: {
+                                            doctype: "Design Request Item",
+                                            name: frm.doc.name,
+                                            fieldname:  "revision_reason",
+                                            value: ""
+                                        },
+                                        callback: () => {
+                                            frm.reload_doc()
                                         }
-                                    },
-                                    callback(r) {
-                                        if (!r.exc) {
-                                            frappe.msgprint("Design Version Created");
-                                            d.hide();
-                                            frappe.call({
-                                                method: "frappe.client.set_value",
-                                                args: {
-                                                    doctype: "Design Request Item",
-                                                    name: frm.doc.name,
-                                                    fieldname:  "revision_reason",
-                                                    value: ""
-                                                },
-                                                callback: () => {
-                                                    frm.reload_doc()
-                                                }
-                                            })
-                                            // frm.refresh()
+                                    })
+                                };
+
+                                if (!file) {
+                                    frappe.call({
+                                        method: "frappe.client.insert",
+                                        args: {
+                                            doc: {
+                                                doctype: "Design Version",
+                                                ...values
+                                            }
+                                        },
+                                        callback(r) {
+                                            if (!r.exc) created(r.message);
                                         }
+                                    });
+                                    return;
+                                }
+
+                                // the file and the version are created together once the last chunk is in
+                                d.get_primary_btn().prop("disabled", true);
+                                design_integration.upload_design_version(file, {
+                                    design_request_item: frm.doc.name,
+                                    version: values,
+                                    on_progress: (sent, total) => {
+                                        frappe.show_progress(__("Uploading {0}", [file.name]), sent, total, null, true);
                                     }
+                                }).then(created).catch((error) => {
+                                    frappe.hide_progress();
+                                    if (error && error.message) frappe.msgprint(error.message);
+                                }).finally(() => {
+                                    d.get_primary_btn().prop("disabled", false);
                                 });
                             }
                         });
@@ -82,12 +112,12 @@ frappe.ui.form.on("Design Request Item", {
                             }
                         })
                         
-                    }
-                })
+                });
             });
 
         }
-        render_all_versions(frm)
+        setup_version_panel(frm);
+        render_stage_log_placeholder(frm);
         frm.set_query("bom_name", ()=>{
             return {
 				filters: {
@@ -239,19 +269,115 @@ function toggle_status_fields(frm) {
 }
 
 
-function render_all_versions(frm){
+// The stage history lives in Design Stage Log and is only fetched on request
+function render_stage_log_placeholder(frm) {
+    const $wrapper = frm.fields_dict.stage_log_view.$wrapper;
+    if (frm.is_new()) {
+        $wrapper.empty();
+        return;
+    }
+
+    $wrapper.html(`<button class="btn btn-sm btn-default btn-load-stage-log">${__("Show Stage History")}</button>`);
+    $wrapper.find(".btn-load-stage-log").on("click", () => {
+        frappe.call({
+            method: "design_integration.design_integration.stage_log.get_item_stage_log",
+            args: { design_request_item: frm.doc.name },
+            callback: (r) => render_stage_log(frm, r.message || [])
+        });
+    });
+}
+
+function render_stage_log(frm, rows) {
+    if (!rows.length) {
+        frm.fields_dict.stage_log_view.$wrapper.html(`<p class="text-muted">${__("No stage transitions yet.")}</p>`);
+        return;
+    }
+
+    const body = rows.map((row) => `
+        <tr>
+            <td>${frappe.datetime.str_to_user(row.transition_date)}</td>
+            <td>${frappe.utils.escape_html(row.from_status || "")}</td>
+            <td>${frappe.utils.escape_html(row.to_status || "")}</td>
+            <td>${frappe.utils.escape_html(row.transitioned_by || "")}</td>
+            <td>${frappe.utils.escape_html(row.remarks || "")}</td>
+        </tr>
+    `).join("");
+
+    frm.fields_dict.stage_log_view.$wrapper.html(`
+        <table class="table table-bordered table-sm">
+            <thead>
+                <tr>
+                    <th>${__("Date")}</th>
+                    <th>${__("From")}</th>
+                    <th>${__("To")}</th>
+                    <th>${__("By")}</th>
+                    <th>${__("Remarks")}</th>
+                </tr>
+            </thead>
+            <tbody>${body}</tbody>
+        </table>
+    `);
+}
+
+const VERSIONS_METHOD = "design_integration.design_integration.doctype.design_request_item.design_request_item.get_versions";
+const VERSION_SCHEMA_KEY = "design_integration:version_schema";
+
+// Design Version fields for the "Add New Version" dialog, kept in localStorage
+// and only sent again by the server when its etag changes
+function load_version_fields(frm) {
+    const cached = JSON.parse(localStorage.getItem(VERSION_SCHEMA_KEY) || "null");
+    return frappe.xcall(VERSIONS_METHOD, {
+        design_request_item: frm.doc.name,
+        page_length: 0,
+        schema_etag: cached ? cached.etag : null
+    }).then((r) => cache_version_fields(r, cached));
+}
+
+function cache_version_fields(r, cached) {
+    if (!r.fields) return cached.fields;
+    localStorage.setItem(VERSION_SCHEMA_KEY, JSON.stringify({ etag: r.schema_etag, fields: r.fields }));
+    return r.fields;
+}
+
+// Versions are only fetched once the Versions tab is opened, a page at a time
+function setup_version_panel(frm) {
+    frm.fields_dict.version_view.$wrapper.empty();
+    frm.versions_loaded = false;
     if (frm.is_new()) return;
 
-    // fetch linked design versions
+    const active_tab = frm.get_active_tab && frm.get_active_tab();
+    if (active_tab && active_tab.df.fieldname === "versions_tab") {
+        render_all_versions(frm);
+    }
+
+    $(frm.wrapper).off("shown.bs.tab.design_versions").on("shown.bs.tab.design_versions", (e) => {
+        if (!frm.versions_loaded && (e.target.id || "").includes("versions_tab")) {
+            render_all_versions(frm);
+        }
+    });
+}
+
+function render_all_versions(frm, start = 0) {
+    if (frm.is_new()) return;
+    frm.versions_loaded = true;
+
+    const $wrapper = frm.fields_dict.version_view.$wrapper;
+    const cached = JSON.parse(localStorage.getItem(VERSION_SCHEMA_KEY) || "null");
+
     frappe.call({
-        method: "design_integration.design_integration.doctype.design_request_item.design_request_item.get_version_list",
+        method: VERSIONS_METHOD,
         args: {
-            design_request_item: frm.doc.name
+            design_request_item: frm.doc.name,
+            start: start,
+            schema_etag: cached ? cached.etag : null
         },
         callback: function(r) {
-            console.log(r)
-            if (!r.message || r.message.length === 0) {
-                frm.fields_dict.version_view.$wrapper.html(`
+            if (!r.message) return;
+            cache_version_fields(r.message, cached);
+            const { versions, total } = r.message;
+
+            if (!start && !versions.length) {
+                $wrapper.html(`
                     <div class="empty-state">
                         <div class="empty-state-icon">
                             <i class="fa fa-layer-group"></i>
@@ -263,133 +389,253 @@ function render_all_versions(frm){
                 return;
             }
 
-            let html = `
-                <div class="versions-container">
-                    <div class="versions-header">
-                        <h4><i class="fa fa-history"></i> Design Versions</h4>
-                        <span class="badge">${r.message.length} version${r.message.length > 1 ? 's' : ''}</span>
+            if (!start) {
+                $wrapper.html(`
+                    <div class="versions-container">
+                        <div class="versions-header">
+                            <h4><i class="fa fa-history"></i> Design Versions</h4>
+                            <span class="badge">${total} version${total > 1 ? 's' : ''}</span>
+                        </div>
+                        <div class="versions-timeline"></div>
                     </div>
-                    <div class="versions-timeline">
-            `;
+                `);
+            }
 
-            r.message.forEach((row, index) => {
-                let file_html = "";
-                let file_preview = "";
-                let file_badge = "";
-
-                if (row.new_version_file) {
-                    let ext = row.new_version_file.split('.').pop().toLowerCase();
-                    let fileName = row.new_version_file.split('/').pop();
-                    
-                    // Determine file type and icon
-                    if (["png","jpg","jpeg","webp","gif","bmp"].includes(ext)) {
-                        file_badge = `<span class="file-badge image-badge"><i class="fa fa-image"></i> Image</span>`;
-                        file_preview = `
-                            <div class="file-preview">
-                                <img src="${row.new_version_file}" class="preview-image" alt="${row.version_tag || 'Design'}">
-                                <div class="preview-overlay">
-                                    <a href="${row.new_version_file}" target="_blank" class="preview-link">
-                                        <i class="fa fa-expand"></i> View Full Size
-                                    </a>
-                                </div>
-                            </div>
-                        `;
-                    } 
-                    else if (ext === "pdf") {
-                        file_badge = `<span class="file-badge pdf-badge"><i class="fa fa-file-pdf"></i> PDF</span>`;
-                        file_preview = `
-                            <div class="file-preview">
-                                <div class="pdf-placeholder">
-                                    <i class="fa fa-file-pdf pdf-icon"></i>
-                                    <p>${fileName}</p>
-                                    <a href="${row.new_version_file}" target="_blank" class="btn-view-pdf">
-                                        <i class="fa fa-eye"></i> View PDF
-                                    </a>
-                                </div>
-                            </div>
-                        `;
-                    }
-                    else if (["doc","docx","odt"].includes(ext)) {
-                        file_badge = `<span class="file-badge doc-badge"><i class="fa fa-file-word"></i> Document</span>`;
-                    }
-                    else if (["ai","psd","eps","svg"].includes(ext)) {
-                        file_badge = `<span class="file-badge design-badge"><i class="fa fa-palette"></i> Design File</span>`;
-                    }
-                    else {
-                        file_badge = `<span class="file-badge"><i class="fa fa-file"></i> ${ext.toUpperCase()}</span>`;
-                    }
-                }
+            frm.loaded_versions = (start ? frm.loaded_versions || [] : []).concat(versions);
 
-                // Format date
-                let formattedDate = row.posting_date ? frappe.format(row.posting_date, { fieldtype: 'Date' }) : 'Not set';
-                
-                // Determine version status color
-                const statusColors = ['primary', 'success', 'warning', 'info'];
-                const colorIndex = index % statusColors.length;
-                
-                html += `
-                    <div class="version-card" data-version-name="${row.name}">
-                        <div class="version-header">
-                            <div class="version-marker" style="background-color: var(--${statusColors[colorIndex]})">
-                                <span class="version-number">V${index + 1}</span>
-                            </div>
-                            <div class="version-info">
-                                <h5>
-                                    ${row.version_tag || `Version ${index + 1}`}
-                                    ${file_badge}
-                                </h5>
-                                <div class="version-meta">
-                                    <span class="meta-item">
-                                        <i class="fa fa-calendar"></i> ${formattedDate}
-                                    </span>
-                                    ${row.created_by ? `<span class="meta-item"><i class="fa fa-user"></i> ${row.created_by}</span>` : ''}
-                                </div>
-                            </div>
-                        </div>
-                        
-                        ${row.description ? `
-                            <div class="version-description">
-                                <i class="fa fa-align-left"></i>
-                                <p>${row.description}</p>
-                            </div>
-                        ` : ''}
-                        
-                        ${file_preview ? `
-                            <div class="version-preview">
-                                ${file_preview}
-                            </div>
-                        ` : ''}
-                        
-                        <div class="version-actions">
-                            <div class="action-buttons">
-                                ${row.new_version_file ? `
-                                    <a href="${row.new_version_file}" target="_blank" class="btn btn-sm btn-primary">
-                                        <i class="fa fa-external-link"></i> Open
-                                    </a>
-                                    <a href="${row.new_version_file}" target="_blank" class="btn btn-sm btn-default" download>
-                                        <i class="fa fa-download"></i> Download
-                                    </a>
-                                ` : ''}
-                                <button class="btn btn-sm btn-danger btn-delete-version" data-version-name="${row.name}">
-                                    <i class="fa fa-trash"></i> Delete
-                                </button>
-                            </div>
-                        </div>
-                    </div>
-                `;
+            // newest first, numbered from the oldest
+            $wrapper.find(".versions-timeline").append(
+                versions.map((row, i) => version_card_html(row, total - start - i)).join("")
+            );
+
+            $wrapper.find(".btn-more-versions").remove();
+            const loaded = start + versions.length;
+            if (loaded < total) {
+                $(`<button class="btn btn-sm btn-default btn-more-versions">${__("Load More")} (${total - loaded})</button>`)
+                    .appendTo($wrapper.find(".versions-container"))
+                    .on("click", () => render_all_versions(frm, loaded));
+            }
+
+            // Add event listeners for delete and compare buttons
+            addDeleteListeners(frm);
+            $wrapper.find(".btn-compare-version").off("click").on("click", function() {
+                compareVersion(frm, $(this).data("version-name"));
             });
+        }
+    });
+}
+
+function compareVersion(frm, versionName) {
+    const loaded = frm.loaded_versions || [];
+    const others = loaded.filter((row) => row.name !== versionName);
+    if (!others.length) {
+        frappe.msgprint(__("There is no other version to compare with."));
+        return;
+    }
+    // default to the version just before this one
+    const previous = loaded[loaded.findIndex((row) => row.name === versionName) + 1] || others[0];
+
+    frappe.prompt([{
+        fieldname: "other_version",
+        fieldtype: "Select",
+        label: __("Compare With"),
+        options: others.map((row) => ({ value: row.name, label: row.version_tag || row.name })),
+        default: previous.name,
+        reqd: 1
+    }], (values) => {
+        frappe.call({
+            method: "design_integration.design_integration.previews.get_version_diff",
+            args: { version: versionName, other_version: values.other_version },
+            callback: (r) => r.message && showVersionDiff(r.message)
+        });
+    }, __("Compare Versions"), __("Compare"));
+}
 
-            html += `
+function showVersionDiff(diff) {
+    const format_value = (field, value) => {
+        if (value === null || value === undefined) return "";
+        return field === "file_size" ? format_file_size(value) : frappe.utils.escape_html(String(value));
+    };
+
+    const columns = diff.versions.map((row) => `
+        <div class="col-sm-6">
+            <h5>${frappe.utils.escape_html(row.version_tag || row.name)}</h5>
+            ${row.preview_url
+                ? `<img src="${row.preview_url}" class="img-responsive" style="max-width: 100%;">`
+                : `<p class="text-muted">${__("No preview")}</p>`}
+        </div>
+    `).join("");
+
+    let changes = `<p class="text-muted">${__("No differences in the file details.")}</p>`;
+    if (diff.same_content) {
+        changes = `<p class="text-muted">${__("Both versions have the same file.")}</p>`;
+    } else if (diff.changes.length) {
+        changes = `
+            <table class="table table-bordered table-sm">
+                <thead>
+                    <tr>
+                        <th>${__("Detail")}</th>
+                        <th>${frappe.utils.escape_html(diff.versions[0].version_tag || "")}</th>
+                        <th>${frappe.utils.escape_html(diff.versions[1].version_tag || "")}</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${diff.changes.map((change) => `
+                        <tr>
+                            <td>${frappe.utils.escape_html(change.field)}</td>
+                            <td>${format_value(change.field, change.from)}</td>
+                            <td>${format_value(change.field, change.to)}</td>
+                        </tr>
+                    `).join("")}
+                </tbody>
+            </table>
+        `;
+    }
+
+    const d = new frappe.ui.Dialog({
+        title: __("Compare Versions"),
+        size: "extra-large",
+        fields: [{ fieldtype: "HTML", fieldname: "diff" }]
+    });
+    d.fields_dict.diff.$wrapper.html(`<div class="row">${columns}</div>${changes}`);
+    d.show();
+}
+
+function version_card_html(row, number) {
+    let file_html = "";
+    let file_preview = "";
+    let file_badge = "";
+
+    if (row.new_version_file) {
+        let ext = row.new_version_file.split('.').pop().toLowerCase();
+        let fileName = row.new_version_file.split('/').pop();
+        
+        // Determine file type and icon
+        if (["png","jpg","jpeg","webp","gif","bmp"].includes(ext)) {
+            file_badge = `<span class="file-badge image-badge"><i class="fa fa-image"></i> Image</span>`;
+            file_preview = `
+                <div class="file-preview">
+                    <img src="${row.new_version_file}" class="preview-image" alt="${row.version_tag || 'Design'}">
+                    <div class="preview-overlay">
+                        <a href="${row.new_version_file}" target="_blank" class="preview-link">
+                            <i class="fa fa-expand"></i> View Full Size
+                        </a>
+                    </div>
+                </div>
+            `;
+        } 
+        else if (ext === "pdf") {
+            file_badge = `<span class="file-badge pdf-badge"><i class="fa fa-file-pdf"></i> PDF</span>`;
+            file_preview = `
+                <div class="file-preview">
+                    <div class="pdf-placeholder">
+                        <i class="fa fa-file-pdf pdf-icon"></i>
+                        <p>${fileName}</p>
+                        <a href="${row.new_version_file}" target="_blank" class="btn-view-pdf">
+                            <i class="fa fa-eye"></i> View PDF
+                        </a>
                     </div>
                 </div>
             `;
+        }
+        else if (["doc","docx","odt"].includes(ext)) {
+            file_badge = `<span class="file-badge doc-badge"><i class="fa fa-file-word"></i> Document</span>`;
+        }
+        else if (["ai","psd","eps","svg"].includes(ext)) {
+            file_badge = `<span class="file-badge design-badge"><i class="fa fa-palette"></i> Design File</span>`;
+        }
+        else {
+            file_badge = `<span class="file-badge"><i class="fa fa-file"></i> ${ext.toUpperCase()}</span>`;
+        }
+    }
+
+    // thumbnails are rendered in the background, once per file content
+    if (row.preview_url) {
+        file_preview = `
+            <div class="file-preview">
+                <img src="${row.preview_url}" class="preview-image" loading="lazy" alt="${row.version_tag || 'Design'}">
+                <div class="preview-overlay">
+                    <a href="${row.new_version_file}" target="_blank" class="preview-link">
+                        <i class="fa fa-expand"></i> ${__("Open File")}
+                    </a>
+                </div>
+            </div>
+        `;
+    } else if (row.preview_status === "Pending") {
+        file_preview = `<div class="file-preview"><p class="text-muted">${__("Preview is being generated")}</p></div>`;
+    }
 
-            frm.fields_dict.version_view.$wrapper.html(html);
+    // Format date
+    let formattedDate = row.posting_date ? frappe.format(row.posting_date, { fieldtype: 'Date' }) : 'Not set';
+    
+    // Determine version status color
+    const statusColors = ['primary', 'success', 'warning', 'info'];
+    const colorIndex = number % statusColors.length;
+    
+    return `
+        <div class="version-card" data-version-name="${row.name}">
+            <div class="version-header">
+                <div class="version-marker" style="background-color: var(--${statusColors[colorIndex]})">
+                    <span class="version-number">V${number}</span>
+                </div>
+                <div class="version-info">
+                    <h5>
+                        ${row.version_tag || `Version ${number}`}
+                        ${file_badge}
+                    </h5>
+                    <div class="version-meta">
+                        <span class="meta-item">
+                            <i class="fa fa-calendar"></i> ${formattedDate}
+                        </span>
+                        ${row.created_by ? `<span class="meta-item"><i class="fa fa-user"></i> ${row.created_by}</span>` : ''}
+                        ${row.file_size ? `<span class="meta-item" title="SHA-256 ${row.content_hash || ''}"><i class="fa fa-hdd-o"></i> ${format_file_size(row.file_size)}</span>` : ''}
+                    </div>
+                </div>
+            </div>
             
-            // Add event listeners for delete buttons
-            addDeleteListeners(frm);
-        }
-    });
+            ${row.description ? `
+                <div class="version-description">
+                    <i class="fa fa-align-left"></i>
+                    <p>${row.description}</p>
+                </div>
+            ` : ''}
+            
+            ${file_preview ? `
+                <div class="version-preview">
+                    ${file_preview}
+                </div>
+            ` : ''}
+            
+            <div class="version-actions">
+                <div class="action-buttons">
+                    ${row.new_version_file ? `
+                        <a href="${row.new_version_file}" target="_blank" class="btn btn-sm btn-primary">
+                            <i class="fa fa-external-link"></i> Open
+                        </a>
+                        <a href="${row.new_version_file}" target="_blank" class="btn btn-sm btn-default" download>
+                            <i class="fa fa-download"></i> Download
+                        </a>
+                    ` : ''}
+                    <button class="btn btn-sm btn-default btn-compare-version" data-version-name="${row.name}">
+                        <i class="fa fa-columns"></i> ${__("Compare")}
+                    </button>
+                    <button class="btn btn-sm btn-danger btn-delete-version" data-version-name="${row.name}">
+                        <i class="fa fa-trash"></i> Delete
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+function format_file_size(bytes) {
+    const units = ["B", "KB", "MB", "GB"];
+    let i = 0;
+    while (bytes >= 1024 && i < units.length - 1) {
+        bytes /= 1024;
+        i++;
+    }
+    return `${i ? bytes.toFixed(1) : bytes} ${units[i]}`;
 }
 
 function addDeleteListeners(frm) {
@@ -455,10 +701,7 @@ function deleteVersion(frm, versionName, versionCard) {
             
             // Remove card after animation
             setTimeout(() => {
-                // Refresh the versions list
-                render_all_versions(frm);
-                
-                // Refresh the form to update any related data
+                // Refresh the form (and with it the versions list)
                 frm.refresh();
             }, 300);
         }
@@ -1,56 +1,67 @@
+import hashlib
+from collections import Counter
+
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import now_datetime
+from frappe.utils import cint, now_datetime
 from frappe.utils import getdate
-from frappe.utils import now_datetime
-import frappe.model.naming
 
+from design_integration.design_integration.board_events import publish_patches
+from design_integration.design_integration.bulk import bulk_insert_docs
+from design_integration.design_integration.completion import is_open, update_open_items
+from design_integration.design_integration.dashboard import clear_design_stats_cache
+from design_integration.design_integration.indexes import add_doctype_indexes
+from design_integration.design_integration.item_cache import get_item, prefetch
+from design_integration.design_integration.naming import (
+    format_version_tag,
+    get_version_tag_key,
+    make_design_request_item_names,
+    peek_sequence,
+)
+from design_integration.design_integration.profiling import profile, profile_hooks
+from design_integration.design_integration.stage_log import insert_stage_logs, make_stage_log
+from design_integration.design_integration.status_counts import get_status_key, update_status_counts
+
+VERSION_PAGE_LENGTH = 20
+# keys of a DocField the version dialog uses
+VERSION_SCHEMA_KEYS = ("fieldname", "fieldtype", "label", "options", "reqd", "read_only", "default", "description")
+
+@profile_hooks
 class DesignRequestItem(Document):
     def autoname(self):
         """Generate name for Design Request Item"""
         if not self.name:
-            # Get the next number in the series
-            last_item = frappe.get_all(
-                "Design Request Item",
-                fields=["name"],
-                order_by="name desc",
-                limit=1
-            )
-            
-            if last_item:
-                try:
-                    last_number = int(last_item[0].name.split('-')[-1])
-                    next_number = last_number + 1
-                except:
-                    next_number = 1
-            else:
-                next_number = 1
-            
-            self.name = f"DES-IT-{next_number:06d}"
+            self.name = make_design_request_item_names(1)[0]
     
     def validate(self):
         """Validate Design Request Item"""
         self.validate_item()
+        # fields set here are written by this save and reach the boards as stored
+        self.handle_approval_status_change()
         self.update_current_stage()
+        self.set_stage_dates()
+        self.handle_field_dependencies()
         self.create_work_order()
         self.validate_revision_reason()
     
     def on_update(self):
         """Handle updates"""
-        self.handle_approval_status_change()
         self.log_stage_transition()
-        self.handle_field_dependencies()
     
     def validate_item(self):
         """Validate and populate item details"""
-        if self.item_code:
-            try:
-                item = frappe.get_doc("Item", self.item_code)
-                self.item_name = item.item_name
-                self.description = item.description or ""
-            except:
-                frappe.throw(_("Item {0} not found").format(self.item_code))
+        if not self.item_code:
+            return
+        # details were copied when the code was set; nothing to refresh
+        if not self.is_new() and self.item_name and not self.has_value_changed("item_code"):
+            return
+
+        item = get_item(self.item_code)
+        if not item:
+            frappe.throw(_("Item {0} not found").format(self.item_code))
+        self.item_name = item.item_name
+        self.description = item.description or ""
     
     def update_current_stage(self):
         """Update current stage based on design status"""
@@ -64,18 +75,7 @@ class DesignRequestItem(Document):
                 # Mark revision flag; keep current design_status unchanged
                 self.revision_requested = 1
                 self.approval_date = now_datetime()
-                # Log revision request in stage transition log
-                try:
-                    self.append("stage_transition_log", {
-                        "stage": "revision",
-                        "from_status": self.get_doc_before_save().design_status if self.get_doc_before_save() else self.design_status,
-                        "to_status": self.design_status,
-                        "transition_date": now_datetime(),
-                        "transitioned_by": frappe.session.user,
-                        "remarks": f"Revision requested: {getattr(self, 'revision_reason', '') or ''}"
-                    })
-                except Exception:
-                    pass
+                # logged as a revision in log_stage_transition
                 return
             
             if self.approval_status == "Approved":
@@ -104,25 +104,38 @@ class DesignRequestItem(Document):
                 # Do not change design_status; only approval_status reflects hold
                 self.approval_date = now_datetime()
     
-    def log_stage_transition(self):
-        """Log stage transitions (store as child rows, not raw dicts)"""
-        if self.is_new():
-            # don't log on first insert
+    def set_stage_dates(self):
+        """Set timing fields for Gantt when the status moves"""
+        if not self.get_doc_before_save() or not self.has_value_changed("design_status"):
             return
-        if self.has_value_changed("design_status"):
-            # set timing fields for Gantt
-            if not self.start_date and self.design_status and self.design_status != "Pending":
-                self.start_date = now_datetime()
-            if self.design_status == "Completed" and not self.completion_date:
-                self.completion_date = now_datetime()
-            self.append("stage_transition_log", {
-                "stage": "design_status",
-                "from_status": self.get_doc_before_save().design_status if self.get_doc_before_save() else "",
-                "to_status": self.design_status,
-                "transition_date": now_datetime(),
-                "transitioned_by": frappe.session.user,
-                "remarks": f"Status changed to {self.design_status}"
-            })
+        if not self.start_date and self.design_status and self.design_status != "Pending":
+            self.start_date = now_datetime()
+        if self.design_status == "Completed" and not self.completion_date:
+            self.completion_date = now_datetime()
+    
+    def log_stage_transition(self):
+        """Append revision requests and status changes to the Design Stage Log"""
+        previous = self.get_doc_before_save()
+        logs = []
+        if self.approval_status == "Revised" and self.has_value_changed("approval_status"):
+            logs.append(make_stage_log(
+                self.name,
+                self.design_request,
+                previous.design_status if previous else self.design_status,
+                self.design_status,
+                stage="revision",
+                remarks=f"Revision requested: {getattr(self, 'revision_reason', '') or ''}"
+            ))
+        # don't log the status on first insert
+        if previous and self.has_value_changed("design_status"):
+            logs.append(make_stage_log(
+                self.name,
+                self.design_request,
+                previous.design_status,
+                self.design_status
+            ))
+        if logs:
+            insert_stage_logs(logs)
     
     def handle_field_dependencies(self):
         """Handle automatic field updates based on dependencies"""
@@ -132,11 +145,8 @@ class DesignRequestItem(Document):
             self.item_created = 1
             
             # Fetch item name from the selected item
-            try:
-                item_doc = frappe.get_doc("Item", self.new_item_code)
-                self.new_item_name = item_doc.item_name
-            except:
-                self.new_item_name = ""
+            item = get_item(self.new_item_code)
+            self.new_item_name = item.item_name if item else ""
             
             frappe.msgprint(_("SKU Generated and Item Created automatically set to Yes."))
         
@@ -150,24 +160,25 @@ class DesignRequestItem(Document):
             self.nesting_completed = 1
         
     def create_work_order(self):
+        if not (self.design_status == "Completed" and self.bom_name):
+            return
         if frappe.db.exists("Work Order", {"design_request_item" : self.name}):
             return
-        if self.design_status == "Completed" and self.bom_name:
-            variant_of = None
-            if variant_of := frappe.db.get_value("Item",self.new_item_code ,"variant_of"):
-                variant_of = variant_of
-            from erpnext.manufacturing.doctype.work_order.work_order import make_work_order
-            wo_doc = make_work_order(
-                self.bom_name,
-                self.new_item_code,
-                self.qty or 1,
-                variant_items = variant_of,
-                use_multi_level_bom=1
-            )
-            wo_doc.design_request_item = self.name
-            if self.design_request:
-                wo_doc.sales_order = frappe.db.get_value("Design Request", self.design_request, "sales_order")
-            wo_doc.save(ignore_permissions=True)
+        variant_of = None
+        if variant_of := frappe.db.get_value("Item",self.new_item_code ,"variant_of"):
+            variant_of = variant_of
+        from erpnext.manufacturing.doctype.work_order.work_order import make_work_order
+        wo_doc = make_work_order(
+            self.bom_name,
+            self.new_item_code,
+            self.qty or 1,
+            variant_items = variant_of,
+            use_multi_level_bom=1
+        )
+        wo_doc.design_request_item = self.name
+        if self.design_request:
+            wo_doc.sales_order = frappe.db.get_value("Design Request", self.design_request, "sales_order")
+        wo_doc.save(ignore_permissions=True)
 
     def validate_revision_reason(self):
         if self.revision_requested and not self.revision_reason:
@@ -175,7 +186,42 @@ class DesignRequestItem(Document):
                 "Revision Reason is mandatory when Revision Requested is checked."
             )
             
+def bulk_insert_design_request_items(docs):
+    """Insert new Design Request Items with a fixed number of queries.
+
+    Runs the same steps as ``validate`` for every document, but names come
+    from one block reservation, Item details from one query, and the rows are
+    written with a single multi-row INSERT. ``on_update`` logs nothing for a
+    freshly created item, so it is not run here; the board insert patches are
+    published in one event instead.
+    """
+    if not docs:
+        return docs
+
+    prefetch([doc.item_code for doc in docs])
+
+    for doc, name in zip(docs, make_design_request_item_names(len(docs)), strict=True):
+        doc.name = name
+        doc.set_user_and_timestamp()
+        doc.docstatus = 0
+
+        doc.validate_item()
+        doc.handle_approval_status_change()
+        doc.update_current_stage()
+        doc.handle_field_dependencies()
+        doc.create_work_order()
+        doc.validate_revision_reason()
+
+    bulk_insert_docs(docs)
+    # the doc_events hooks do not run on this path
+    update_status_counts(Counter(get_status_key(doc) for doc in docs))
+    update_open_items(Counter(doc.design_request for doc in docs if is_open(doc)))
+    clear_design_stats_cache()
+    publish_patches([{"op": "insert", "key": "item_id", "name": doc.name} for doc in docs])
+    return docs
+
 @frappe.whitelist()
+@profile
 def update_design_status(docname, new_status):
     """Update design status from list view"""
     try:
@@ -202,19 +248,54 @@ def update_approval_status(docname, new_status):
         return {"success": False, "error": str(e)} 
 
 @frappe.whitelist()
-def get_version_meta_data():
-    return frappe.get_meta("Design Version")
+@profile
+def get_versions(design_request_item, start=0, page_length=VERSION_PAGE_LENGTH, schema_etag=None):
+    """Versions panel data: a page of versions (newest first, with their previews) and the version field schema.
 
+    ``fields`` is only sent when ``schema_etag`` differs from the current
+    one, so clients can keep the schema between calls. Pass
+    ``page_length=0`` to fetch just the schema.
+    """
+    frappe.has_permission("Design Request Item", "read", design_request_item, throw=True)
+    start, page_length = max(cint(start), 0), min(max(cint(page_length), 0), 100)
 
-@frappe.whitelist()
-def get_version_list(design_request_item):
-    return frappe.get_all("Design Version", filters={"design_request_item" : design_request_item}, fields=[
-        "name", "posting_date", "version_tag", "new_version_file", "description"
-    ])
+    schema = get_version_schema()
+    result = {
+        "schema_etag": schema["etag"],
+        "fields": None if schema_etag == schema["etag"] else schema["fields"],
+        "versions": [],
+        "total": 0,
+    }
+    if not page_length:
+        return result
+
+    result["versions"] = frappe.db.sql("""
+        SELECT v.name, v.version_tag, v.posting_date, v.description, v.new_version_file,
+            v.owner AS created_by, v.version_blob AS content_hash, b.file_size,
+            b.preview_status, b.preview_url
+        FROM `tabDesign Version` v
+        LEFT JOIN `tabDesign Version Blob` b ON b.name = v.version_blob
+        WHERE v.design_request_item = %s
+        ORDER BY v.posting_date DESC, v.creation DESC
+        LIMIT %s OFFSET %s
+    """, (design_request_item, page_length, start), as_dict=True)
+    result["total"] = frappe.db.count("Design Version", {"design_request_item": design_request_item})
+    return result
+
+
+def get_version_schema():
+    """Design Version fields trimmed to what a dialog needs, with an etag for client caching"""
+    fields = [
+        {key: df.get(key) for key in VERSION_SCHEMA_KEYS if df.get(key)}
+        for df in frappe.get_meta("Design Version").fields
+        if not df.hidden
+    ]
+    return {"etag": hashlib.md5(frappe.as_json(fields).encode()).hexdigest(), "fields": fields}
 
 
 
 @frappe.whitelist()
+@profile
 def delete_version(version_name, design_request_item):
     """Delete a design version"""
     try:
@@ -244,32 +325,14 @@ def delete_version(version_name, design_request_item):
         frappe.throw(_("Error deleting version: {0}").format(str(e)))
 
 @frappe.whitelist()
-def check_version_tab(version_tag, name):
-    return frappe.db.exists("Design Version", {"version_tag" : version_tag, "design_request_item" : name})
-
-@frappe.whitelist()
+@profile
 def get_next_version_tag(design_request_item):
-    doc = frappe.get_doc("Design Request Item", design_request_item)
-
-    base_version = f"V{doc.revision_count}"
-
-    versions = frappe.get_all(
-        "Design Version",
-        filters={"design_request_item": design_request_item},
-        pluck="version_tag"
+    """Tag the next version of the item will get; it is only reserved when the version is inserted"""
+    revision_count = frappe.db.get_value("Design Request Item", design_request_item, "revision_count") or 0
+    return format_version_tag(
+        revision_count, peek_sequence(get_version_tag_key(design_request_item, revision_count)) + 1
     )
 
-    # sub version of base version
-    suffixes = []
-    for version in versions:
-        if version == base_version:
-            suffixes.append(0)
-        elif version.startswith(f"{base_version}-"):
-            try:
-                suffixes.append(int(version.split("-")[-1]))
-            except ValueError:
-                pass
-    if not suffixes:
-        return base_version
-    else:
-        return f"{base_version}-{max(suffixes) + 1}"
\ No newline at end of file
+
+def on_doctype_update():
+    add_doctype_indexes("Design Request Item")
\ No newline at end of file
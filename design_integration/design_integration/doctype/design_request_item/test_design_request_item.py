@@ -1,9 +1,281 @@
 # Copyright (c) 2026, Axelgear and Contributors
 # See license.txt
 
-# import frappe
+import csv
+import os
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from design_integration.design_integration.board_events import BOARD_DOCTYPE, BOARD_EVENT
+from design_integration.design_integration.doctype.design_request.design_request import (
+	BULK_STATUS_SYNC_LIMIT,
+	bulk_update_item_status,
+	create_design_request_from_sales_order,
+	get_design_item_rows,
+)
+from design_integration.design_integration.doctype.design_request.test_design_request import (
+	make_design_sales_order,
+	run_in_parallel,
+)
+from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+	DesignRequestItem,
+)
+from design_integration.design_integration.export import build_design_items_export
+from design_integration.design_integration.item_cache import get_item, prefetch
+from design_integration.design_integration.naming import reserve_sequence_block
+from design_integration.design_integration.query_capture import count_queries
+from design_integration.design_integration.status_counts import get_status_counts, reconcile_status_counts
+
+TEST_SERIES = "_T-DES-IT-"
+
+
+def make_design_request_items(lines=1):
+	"""Design Request with ``lines`` standalone items, returned as the item docs"""
+	sales_order = make_design_sales_order(lines=lines)
+	request = create_design_request_from_sales_order(
+		sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+	)
+	return [
+		frappe.get_doc("Design Request Item", name)
+		for name in frappe.get_all("Design Request Item", {"design_request": request}, pluck="name")
+	]
+
+
+def get_actual_status_counts():
+	return {
+		row.design_status: row.count
+		for row in frappe.db.sql(
+			"""SELECT design_status, COUNT(*) AS count FROM `tabDesign Request Item`
+			WHERE IFNULL(design_status, '') != '' GROUP BY design_status""",
+			as_dict=True,
+		)
+	}
+
 
 class TestDesignRequestItem(FrappeTestCase):
-	pass
+	def setUp(self):
+		self.clear_series()
+
+	def tearDown(self):
+		self.clear_series()
+
+	def clear_series(self):
+		frappe.db.sql("DELETE FROM `tabSeries` WHERE name = %s", TEST_SERIES)
+		frappe.db.commit()
+
+	def test_block_is_contiguous(self):
+		self.assertEqual(reserve_sequence_block(TEST_SERIES, 3), [1, 2, 3])
+		self.assertEqual(reserve_sequence_block(TEST_SERIES, 2), [4, 5])
+		self.assertEqual(reserve_sequence_block(TEST_SERIES, 0), [])
+
+	def test_parallel_blocks_do_not_overlap(self):
+		workers, block_size = 10, 5
+		blocks, errors = run_in_parallel(lambda: reserve_sequence_block(TEST_SERIES, block_size), workers)
+
+		self.assertFalse(errors, errors)
+		for block in blocks:
+			self.assertEqual(block, list(range(block[0], block[0] + block_size)))
+
+		numbers = sorted(number for block in blocks for number in block)
+		self.assertEqual(numbers, list(range(1, workers * block_size + 1)))
+
+	def test_status_counts_follow_status_changes(self):
+		reconcile_status_counts()
+		item = make_design_request_items(lines=3)[0]
+		self.assertEqual(
+			{row.status: row.count for row in get_status_counts("Design Request Item")}, get_actual_status_counts()
+		)
+
+		item.design_status = "Approval Drawing"
+		item.save()
+		self.assertEqual(
+			{row.status: row.count for row in get_status_counts("Design Request Item")}, get_actual_status_counts()
+		)
+
+		item.delete()
+		self.assertEqual(
+			{row.status: row.count for row in get_status_counts("Design Request Item")}, get_actual_status_counts()
+		)
+
+	def test_save_with_unchanged_item_code_skips_item_lookup(self):
+		item = make_design_request_items(lines=1)[0]
+		item.approval_remarks = "touched"
+
+		with count_queries() as queries:
+			item.save()
+
+		# link validation still checks the code exists; the details are not re-read
+		self.assertFalse([query for query in queries if "`tabItem`" in query and "item_name" in query])
+
+	def test_item_cache_is_invalidated_on_item_update(self):
+		item_code = make_design_request_items(lines=1)[0].item_code
+		prefetch([item_code, "_Test Missing Design Item"])
+
+		with self.assertQueryCount(0):
+			self.assertIsNone(get_item("_Test Missing Design Item"))
+			cached = get_item(item_code)
+
+		item = frappe.get_doc("Item", item_code)
+		item.description = f"{cached.description or ''} revised"
+		item.save()
+
+		self.assertEqual(get_item(item_code).description, item.description)
+
+	def test_bulk_status_update_uses_fixed_queries(self):
+		def move(lines):
+			names = [item.name for item in make_design_request_items(lines=lines)]
+			with count_queries() as queries:
+				results = bulk_update_item_status(frappe.as_json([*names, "_Test Missing Item"]), "Modelling")["results"]
+			return names, results, len(queries)
+
+		move(2)  # warm up meta caches
+		_names, _results, small_count = move(5)
+		names, results, large_count = move(40)
+
+		self.assertEqual(small_count, large_count)
+		self.assertEqual([result["status"] for result in results], ["updated"] * 40 + ["not_found"])
+		self.assertEqual(frappe.db.count("Design Request Item", {"name": ["in", names], "design_status": "Modelling"}), 40)
+		self.assertEqual(
+			frappe.db.count("Design Stage Log", {"design_request_item": ["in", names], "to_status": "Modelling"}), 40
+		)
+		self.assertEqual(
+			{row.status: row.count for row in get_status_counts("Design Request Item")}, get_actual_status_counts()
+		)
+
+		# already there
+		self.assertEqual(
+			{result["status"] for result in bulk_update_item_status(names[:3], "Modelling")["results"]}, {"unchanged"}
+		)
+
+	def test_bulk_status_update_skips_items_outside_user_permissions(self):
+		names = [item.name for item in make_design_request_items(lines=2)]
+		# as if a User Permission hid the first item from the session user
+		with patch("frappe.get_list", return_value=names[1:]):
+			results = bulk_update_item_status(names, "Modelling")["results"]
+
+		self.assertEqual([result["status"] for result in results], ["not_permitted", "updated"])
+		self.assertEqual(frappe.db.get_value("Design Request Item", names[0], "design_status"), "Pending")
+
+	def test_bulk_status_update_records_versions(self):
+		names = [item.name for item in make_design_request_items(lines=2)]
+		bulk_update_item_status(names, "Modelling")
+
+		for name in names:
+			version = frappe.get_last_doc("Version", {"ref_doctype": "Design Request Item", "docname": name})
+			self.assertIn(["design_status", "Pending", "Modelling"], frappe.parse_json(version.data)["changed"])
+
+	def test_bulk_completion_closes_request_once(self):
+		items = make_design_request_items(lines=3)
+		bulk_update_item_status([item.name for item in items], "Completed")
+
+		request = frappe.db.get_value("Design Request", items[0].design_request, ["status", "open_items"], as_dict=True)
+		self.assertEqual((request.status, request.open_items), ("Closed", 0))
+
+	def test_bulk_completion_creates_work_orders(self):
+		items = make_design_request_items(lines=2)
+		with patch.object(DesignRequestItem, "create_work_order", autospec=True) as create_work_order:
+			bulk_update_item_status([item.name for item in items], "Completed")
+
+		self.assertEqual(
+			sorted(call.args[0].name for call in create_work_order.call_args_list),
+			sorted(item.name for item in items),
+		)
+
+	def test_large_bulk_status_update_is_queued(self):
+		names = [f"_Test Item {i}" for i in range(BULK_STATUS_SYNC_LIMIT + 1)]
+		with patch("frappe.enqueue") as enqueue:
+			response = bulk_update_item_status(names, "Modelling")
+
+		self.assertEqual(response["total"], len(names))
+		self.assertEqual(enqueue.call_args.kwargs["job_id"], response["job_id"])
+		self.assertEqual(enqueue.call_args.kwargs["items"], names)
+
+	def test_status_change_publishes_board_patch(self):
+		item = make_design_request_items(lines=1)[0]
+		item.design_status = "Approval Drawing"
+
+		with patch("frappe.publish_realtime") as publish_realtime:
+			item.save()
+
+		board_calls = [call for call in publish_realtime.call_args_list if call.args[0] == BOARD_EVENT]
+		self.assertEqual(len(board_calls), 1)
+		self.assertEqual(board_calls[0].kwargs["doctype"], BOARD_DOCTYPE)
+		self.assertEqual(
+			board_calls[0].args[1]["patches"],
+			[
+				{
+					"op": "update",
+					"key": "item_id",
+					"name": item.name,
+					"fields": ["design_status", "current_stage", "is_overdue"],
+				}
+			],
+		)
+
+	def test_approval_publishes_the_stored_status(self):
+		item = make_design_request_items(lines=1)[0]
+		item.approval_status = "Rejected"
+
+		with patch("frappe.publish_realtime") as publish_realtime:
+			item.save()
+
+		stored = frappe.db.get_value("Design Request Item", item.name, ["design_status", "approval_status"], as_dict=True)
+		self.assertEqual((stored.design_status, stored.approval_status), ("Approval Drawing", "Rejected"))
+		patches = [
+			board_patch
+			for call in publish_realtime.call_args_list
+			if call.args[0] == BOARD_EVENT
+			for board_patch in call.args[1]["patches"]
+		]
+		self.assertEqual([board_patch["name"] for board_patch in patches], [item.name])
+		self.assertIn("design_status", patches[0]["fields"])
+		self.assertNotIn("changed", patches[0])
+
+	def test_board_rows_are_reread_with_user_permissions(self):
+		names = [item.name for item in make_design_request_items(lines=2)]
+		# as if a User Permission hid the first item from the session user
+		with patch("frappe.get_list", return_value=names[1:]):
+			rows = get_design_item_rows(frappe.as_json(names), fields=["design_status"])
+
+		self.assertEqual(rows, [{"item_id": names[1], "design_status": "Pending"}])
+
+	def test_created_items_publish_board_inserts(self):
+		sales_order = make_design_sales_order(lines=3)
+		with patch("frappe.publish_realtime") as publish_realtime:
+			request = create_design_request_from_sales_order(
+				sales_order.name, frappe.as_json([{"so_detail": row.name, "qty": row.qty} for row in sales_order.items])
+			)
+
+		inserted = [
+			board_patch["name"]
+			for call in publish_realtime.call_args_list
+			if call.args[0] == BOARD_EVENT
+			for board_patch in call.args[1]["patches"]
+			if board_patch["op"] == "insert"
+		]
+		self.assertEqual(
+			sorted(inserted), sorted(frappe.get_all("Design Request Item", {"design_request": request}, pluck="name"))
+		)
+
+	def test_export_writes_items_with_latest_transition(self):
+		items = make_design_request_items(lines=3)
+		bulk_update_item_status([item.name for item in items], "Modelling")
+		bulk_update_item_status([items[0].name], "Production Drawing")
+		sales_order = frappe.db.get_value("Design Request", items[0].design_request, "sales_order")
+
+		file_doc = build_design_items_export({"sales_order": sales_order}, "csv")
+		self.addCleanup(file_doc.delete)
+		with open(file_doc.get_full_path(), newline="") as f:
+			rows = {row["item_id"]: row for row in csv.DictReader(f)}
+
+		self.assertEqual(set(rows), {item.name for item in items})
+		self.assertEqual(rows[items[0].name]["last_transition_from"], "Modelling")
+		self.assertEqual(rows[items[0].name]["last_transition_to"], "Production Drawing")
+		self.assertEqual(rows[items[1].name]["last_transition_to"], "Modelling")
+		self.assertEqual(rows[items[1].name]["request_id"], items[1].design_request)
+
+		file_doc = build_design_items_export({"sales_order": sales_order}, "xlsx")
+		self.addCleanup(file_doc.delete)
+		self.assertTrue(os.path.getsize(file_doc.get_full_path()))
@@ -3,7 +3,18 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import now_datetime
 
+from design_integration.design_integration.indexes import add_doctype_indexes
+from design_integration.design_integration.item_cache import get_item
+from design_integration.design_integration.profiling import profile_hooks
+
+@profile_hooks
 class DesignRequestItemChild(Document):
+    def db_insert(self, *args, **kwargs):
+        # already written by DesignRequest.db_insert in a multi-row INSERT
+        if self.flags.inserted_with_parent:
+            return
+        super().db_insert(*args, **kwargs)
+    
     def validate(self):
         """Validate Design Request Item Child"""
         self.validate_item()
@@ -18,12 +29,11 @@ class DesignRequestItemChild(Document):
     def validate_item(self):
         """Validate and populate item details"""
         if self.item_code:
-            try:
-                item = frappe.get_doc("Item", self.item_code)
-                self.item_name = item.item_name
-                self.description = item.description or ""
-            except:
+            item = get_item(self.item_code)
+            if not item:
                 frappe.throw(_("Item {0} not found").format(self.item_code))
+            self.item_name = item.item_name
+            self.description = item.description or ""
     
     def update_current_stage(self):
         """Update current stage based on design status"""
@@ -64,11 +74,8 @@ class DesignRequestItemChild(Document):
             self.item_created = 1
             
             # Fetch item name from the selected item
-            try:
-                item_doc = frappe.get_doc("Item", self.new_item_code)
-                self.new_item_name = item_doc.item_name
-            except:
-                self.new_item_name = ""
+            item = get_item(self.new_item_code)
+            self.new_item_name = item.item_name if item else ""
             
             frappe.msgprint(_("SKU Generated and Item Created automatically set to Yes."))
         
@@ -79,4 +86,8 @@ class DesignRequestItemChild(Document):
         
         # Handle nesting completion
         if self.design_status == "Nesting":
-            self.nesting_completed = 1 
\ No newline at end of file
+            self.nesting_completed = 1 
+
+
+def on_doctype_update():
+    add_doctype_indexes("Design Request Item Child")
\ No newline at end of file
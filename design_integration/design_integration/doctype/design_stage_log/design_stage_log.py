@@ -0,0 +1,19 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+
+from design_integration.design_integration.indexes import add_doctype_indexes
+
+
+class DesignStageLog(Document):
+	def validate(self):
+		# append-only: history is never rewritten
+		if not self.is_new():
+			frappe.throw(_("Design Stage Log entries can not be changed"))
+
+
+def on_doctype_update():
+	add_doctype_indexes("Design Stage Log")
@@ -0,0 +1,106 @@
+# Copyright (c) 2026, Axelgear and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, get_datetime
+
+from design_integration.design_integration.doctype.design_request_item.test_design_request_item import (
+	make_design_request_items,
+)
+from design_integration.design_integration.stage_durations import (
+	get_stage_lead_times,
+	rebuild_stage_durations,
+)
+from design_integration.design_integration.stage_log import (
+	get_item_stage_log,
+	get_stage_timeline,
+	insert_stage_logs,
+	make_stage_log,
+)
+
+
+class TestDesignStageLog(FrappeTestCase):
+	def test_status_change_is_logged_outside_the_item(self):
+		item = make_design_request_items(lines=1)[0]
+		item.design_status = "Approval Drawing"
+		item.save()
+
+		self.assertFalse(item.meta.get_table_fields())
+		history = get_item_stage_log(item.name)
+		self.assertEqual(
+			[(row.from_status, row.to_status) for row in history], [("Pending", "Approval Drawing")]
+		)
+
+		log = frappe.get_last_doc("Design Stage Log", {"design_request_item": item.name})
+		log.to_status = "Completed"
+		self.assertRaises(frappe.ValidationError, log.save)
+
+		item.delete()
+		self.assertFalse(frappe.db.exists("Design Stage Log", {"design_request_item": item.name}))
+
+	def test_timeline_segments(self):
+		first, second = make_design_request_items(lines=2)
+		start = get_datetime("2026-03-01 09:00:00")
+
+		def at(hours):
+			return add_to_date(start, hours=hours)
+
+		insert_stage_logs(
+			[
+				make_stage_log(
+					first.name, first.design_request, "Pending", "Design", transition_date=at(-24)
+				),
+				make_stage_log(
+					first.name, first.design_request, "Design", "Modelling", transition_date=at(2)
+				),
+				make_stage_log(first.name, first.design_request, "Modelling", "BOM", transition_date=at(30)),
+				make_stage_log(
+					second.name, second.design_request, "Pending", "Design", transition_date=at(-1)
+				),
+			]
+		)
+
+		timeline = get_stage_timeline(start, at(24), design_request=first.design_request)
+		self.assertEqual(
+			[(segment["status"], segment["start"], segment["end"]) for segment in timeline[first.name]],
+			[("Design", start, at(2)), ("Modelling", at(2), None)],
+		)
+		# no transition inside the range, but in Design all along
+		self.assertEqual([segment["status"] for segment in timeline[second.name]], ["Design"])
+
+		# without a scope only items that moved inside the range are returned
+		self.assertNotIn(second.name, get_stage_timeline(start, at(24)))
+
+	def test_lead_times_follow_transitions(self):
+		items = make_design_request_items(lines=3)
+		month_start = get_datetime("2031-05-01 00:00:00")
+
+		def lead_times():
+			return {
+				row.stage: row
+				for row in get_stage_lead_times("2031-05-01", "2031-05-31", company=items[0].company)
+			}
+
+		logs = []
+		for item, hours in zip(items, (10, 20, 100), strict=True):
+			entered = add_to_date(month_start, days=1)
+			logs += [
+				make_stage_log(item.name, item.design_request, "Pending", "Design", transition_date=entered),
+				make_stage_log(
+					item.name,
+					item.design_request,
+					"Design",
+					"Modelling",
+					transition_date=add_to_date(entered, hours=hours),
+				),
+			]
+		insert_stage_logs(logs)
+
+		design = lead_times()["Design"]
+		self.assertEqual((design.count, design.max_hours, design.mean_hours), (3, 100, 43.33))
+		self.assertTrue(16 <= design.p50_hours <= 24, design.p50_hours)
+		self.assertTrue(72 <= design.p90_hours <= 100, design.p90_hours)
+
+		rebuild_stage_durations()
+		self.assertEqual(lead_times()["Design"], design)
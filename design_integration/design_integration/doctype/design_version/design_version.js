@@ -1,8 +1,18 @@
 // Copyright (c) 2026, Axelgear and contributors
 // For license information, please see license.txt
 
-// frappe.ui.form.on("Design Version", {
-// 	refresh(frm) {
-
-// 	},
-// });
+frappe.ui.form.on("Design Version", {
+	refresh(frm) {
+		if (!frm.doc.docstatus) {
+			frm.add_custom_button(__("Upload File"), () => {
+				new frappe.ui.FileUploader({
+					allow_multiple: false,
+					method: "design_integration.design_integration.version_store.upload_version_file",
+					on_success(blob) {
+						frm.set_value("new_version_file", blob.file_url);
+					},
+				});
+			});
+		}
+	},
+});
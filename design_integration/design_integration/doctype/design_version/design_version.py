@@ -1,9 +1,39 @@
 # Copyright (c) 2026, Axelgear and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from design_integration.design_integration.indexes import add_doctype_indexes, add_doctype_unique_indexes
+from design_integration.design_integration.naming import make_version_tag, reserve_version_tag
+from design_integration.design_integration.previews import queue_blob_preview
+from design_integration.design_integration.version_store import get_blob_name, update_blob_references
+
 
 class DesignVersion(Document):
-	pass
+	def before_insert(self):
+		if not self.design_request_item:
+			return
+		if self.version_tag:
+			reserve_version_tag(self.design_request_item, self.version_tag)
+		else:
+			self.version_tag = make_version_tag(self.design_request_item)
+
+	def validate(self):
+		if self.is_new() or self.has_value_changed("new_version_file"):
+			self.version_blob = get_blob_name(self.new_version_file)
+
+	def on_update(self):
+		previous_blob = (self.get_doc_before_save() or {}).get("version_blob")
+		update_blob_references(previous_blob, self.version_blob)
+		if self.version_blob != previous_blob:
+			# rendered once per content; a re-upload of the same file finds it done
+			queue_blob_preview(self.version_blob)
+
+	def on_trash(self):
+		# the file itself stays with the blob until nothing references it
+		update_blob_references(self.version_blob, None)
+
+
+def on_doctype_update():
+	add_doctype_indexes("Design Version")
+	add_doctype_unique_indexes("Design Version")
@@ -1,9 +1,232 @@
 # Copyright (c) 2026, Axelgear and Contributors
 # See license.txt
 
-# import frappe
+import hashlib
+import io
+import os
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+from werkzeug.datastructures import FileStorage
+
+from design_integration.design_integration.doctype.design_request.test_design_request import run_in_parallel
+from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+	delete_version,
+	get_next_version_tag,
+	get_versions,
+)
+from design_integration.design_integration.doctype.design_request_item.test_design_request_item import (
+	make_design_request_items,
+)
+from design_integration.design_integration.naming import get_version_tag_key, make_version_tag
+from design_integration.design_integration.previews import (
+	PREVIEW_TIMEOUT_MINUTES,
+	get_version_diff,
+	queue_blob_preview,
+	render_blob_preview,
+	requeue_stale_previews,
+)
+from design_integration.design_integration.version_store import get_blob_path, store_stream
+from design_integration.design_integration.version_upload import (
+	complete_version_upload,
+	get_version_upload,
+	start_version_upload,
+	upload_version_chunk,
+)
 
 
 class TestDesignVersion(FrappeTestCase):
-	pass
+	def test_identical_uploads_share_one_blob(self):
+		item = make_design_request_items(lines=1)[0]
+		content = f"drawing {frappe.generate_hash()}".encode()
+
+		first = store_stream(io.BytesIO(content), "front.pdf")
+		second = store_stream(io.BytesIO(content), "copy of front.pdf")
+		self.assertEqual(first.name, second.name)
+		self.assertEqual(frappe.db.count("File", {"file_url": first.file_url}), 1)
+
+		versions = [
+			frappe.get_doc(
+				{
+					"doctype": "Design Version",
+					"design_request_item": item.name,
+					"version_tag": tag,
+					"new_version_file": first.file_url,
+				}
+			).insert()
+			for tag in ("V1", "V2")
+		]
+		self.assertEqual([version.version_blob for version in versions], [first.name] * 2)
+		self.assertEqual(frappe.db.get_value("Design Version Blob", first.name, "ref_count"), 2)
+
+		delete_version(versions[0].name, item.name)
+		self.assertEqual(frappe.db.get_value("Design Version Blob", first.name, "ref_count"), 1)
+		with open(get_blob_path(first.file_url), "rb") as f:
+			self.assertEqual(f.read(), content)
+
+		versions[1].delete()
+		self.assertEqual(frappe.db.get_value("Design Version Blob", first.name, "ref_count"), 0)
+		self.assertTrue(os.path.exists(get_blob_path(first.file_url)))
+
+	def test_chunked_upload_resumes_and_creates_version(self):
+		item = make_design_request_items(lines=1)[0]
+		content = os.urandom(3000)
+		upload = start_version_upload(
+			item.name, "assembly.step", len(content), checksum=hashlib.sha256(content).hexdigest()
+		)
+
+		def send(offset, data, checksum=None):
+			request = frappe._dict(files={"chunk": FileStorage(io.BytesIO(data), "chunk")})
+			with patch.object(frappe.local, "request", request, create=True):
+				return upload_version_chunk(upload["upload_id"], offset, checksum)
+
+		self.assertEqual(send(0, content[:1000])["received"], 1000)
+		# a damaged resend is dropped and the upload stays where it was
+		self.assertRaises(frappe.ValidationError, send, 500, content[500:2000], "0" * 64)
+		self.assertEqual(get_version_upload(upload["upload_id"])["received"], 500)
+		self.assertRaises(frappe.ValidationError, complete_version_upload, upload["upload_id"])
+
+		send(500, content[500:2000], hashlib.sha256(content[500:2000]).hexdigest())
+		send(2000, content[2000:])
+		version = complete_version_upload(
+			upload["upload_id"], {"version_tag": "V1", "description": "Chunked"}
+		)
+
+		self.assertEqual(version.design_request_item, item.name)
+		self.assertEqual(version.version_blob, hashlib.sha256(content).hexdigest())
+		with open(get_blob_path(version.new_version_file), "rb") as f:
+			self.assertEqual(f.read(), content)
+
+	def test_upload_is_checked_against_checksum_sent_at_completion(self):
+		item = make_design_request_items(lines=1)[0]
+		content = os.urandom(1500)
+		upload = start_version_upload(item.name, "panel.dxf", len(content))
+
+		request = frappe._dict(files={"chunk": FileStorage(io.BytesIO(content), "chunk")})
+		with patch.object(frappe.local, "request", request, create=True):
+			upload_version_chunk(upload["upload_id"], 0)
+
+		self.assertRaises(
+			frappe.ValidationError, complete_version_upload, upload["upload_id"], checksum="0" * 64
+		)
+		# the damaged upload is discarded
+		self.assertIsNone(get_version_upload(upload["upload_id"]))
+
+	def test_versions_are_paged_newest_first(self):
+		item = make_design_request_items(lines=1)[0]
+		for day, tag in enumerate(("V1", "V2", "V3"), start=1):
+			frappe.get_doc(
+				{
+					"doctype": "Design Version",
+					"design_request_item": item.name,
+					"version_tag": tag,
+					"posting_date": f"2026-01-0{day}",
+				}
+			).insert()
+
+		first = get_versions(item.name, page_length=2)
+		self.assertEqual(first["total"], 3)
+		self.assertEqual([row.version_tag for row in first["versions"]], ["V3", "V2"])
+		self.assertIn("version_tag", [df["fieldname"] for df in first["fields"]])
+
+		second = get_versions(item.name, start=2, page_length=2, schema_etag=first["schema_etag"])
+		self.assertEqual([row.version_tag for row in second["versions"]], ["V1"])
+		# the client already holds this schema
+		self.assertIsNone(second["fields"])
+
+	def test_tags_are_reserved_on_insert(self):
+		item = make_design_request_items(lines=1)[0]
+
+		def insert(**values):
+			return frappe.get_doc(
+				{"doctype": "Design Version", "design_request_item": item.name, **values}
+			).insert()
+
+		self.assertEqual(get_next_version_tag(item.name), "V0")
+		self.assertEqual([insert().version_tag for _ in range(2)], ["V0", "V0-1"])
+		self.assertEqual(get_next_version_tag(item.name), "V0-2")
+
+		# a tag given by hand moves the counter past it
+		insert(version_tag="V0-5")
+		self.assertEqual(insert().version_tag, "V0-6")
+
+	def test_parallel_tag_allocation_has_no_duplicates(self):
+		design_request_item = f"_T-VER-{frappe.generate_hash(length=8)}"
+		frappe.db.commit()
+		try:
+			results, errors = run_in_parallel(lambda: make_version_tag(design_request_item), workers=10)
+			self.assertFalse(errors, errors)
+			self.assertEqual(sorted(results), sorted(["V0", *(f"V0-{n}" for n in range(1, 10))]))
+		finally:
+			frappe.db.sql(
+				"DELETE FROM `tabSeries` WHERE name = %s", get_version_tag_key(design_request_item, 0)
+			)
+			frappe.db.commit()
+
+	def test_previews_are_rendered_once_per_content(self):
+		from PIL import Image
+
+		item = make_design_request_items(lines=1)[0]
+
+		def png(width, height):
+			# a random colour keeps the content (and so the blob) new on every run
+			out = io.BytesIO()
+			Image.new("RGB", (width, height), tuple(os.urandom(3))).save(out, "PNG")
+			out.seek(0)
+			return out
+
+		def insert(blob):
+			return frappe.get_doc(
+				{
+					"doctype": "Design Version",
+					"design_request_item": item.name,
+					"new_version_file": blob.file_url,
+				}
+			).insert()
+
+		wide, tall = store_stream(png(1200, 600), "wide.png"), store_stream(png(300, 900), "tall.png")
+		with patch("frappe.enqueue") as enqueue:
+			first = insert(wide)
+			insert(wide)
+			second = insert(tall)
+		self.assertEqual(
+			[call.kwargs["blob_name"] for call in enqueue.call_args_list], [wide.name, tall.name]
+		)
+
+		for blob in (wide, tall):
+			render_blob_preview(blob.name)
+		preview = frappe.db.get_value(
+			"Design Version Blob", wide.name, ["preview_status", "preview_url", "preview_meta"], as_dict=True
+		)
+		self.assertEqual(preview.preview_status, "Ready")
+		with Image.open(get_blob_path(preview.preview_url)) as thumbnail:
+			self.assertEqual(thumbnail.size, (480, 240))
+		self.assertEqual(frappe.parse_json(preview.preview_meta)["width"], 1200)
+
+		diff = get_version_diff(second.name, first.name)
+		self.assertFalse(diff["same_content"])
+		self.assertIn({"field": "width", "from": 1200, "to": 300}, diff["changes"])
+
+	def test_lost_preview_jobs_are_queued_again(self):
+		blob = store_stream(io.BytesIO(f"drawing {frappe.generate_hash()}".encode()), "lost.pdf")
+		with patch("frappe.enqueue"):
+			queue_blob_preview(blob.name)
+
+		# the job is presumed running until the timeout passes
+		with patch("frappe.enqueue") as enqueue:
+			queue_blob_preview(blob.name)
+			requeue_stale_previews()
+		self.assertNotIn(blob.name, [call.kwargs["blob_name"] for call in enqueue.call_args_list])
+
+		frappe.db.set_value(
+			"Design Version Blob",
+			blob.name,
+			"preview_queued_at",
+			add_to_date(now_datetime(), minutes=-PREVIEW_TIMEOUT_MINUTES - 1),
+			update_modified=False,
+		)
+		with patch("frappe.enqueue") as enqueue:
+			requeue_stale_previews()
+		self.assertIn(blob.name, [call.kwargs["blob_name"] for call in enqueue.call_args_list])
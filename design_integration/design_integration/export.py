@@ -0,0 +1,166 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Background export of the design register to CSV or XLSX.
+
+Rows come off an unbuffered (server side) cursor and are written straight to
+a private file, so memory stays flat however many items match. Each row
+carries the item, its request and its latest stage transition. When the file
+is complete it is registered as a private File and the requesting user gets
+EXPORT_EVENT with its URL; progress is published along the way.
+
+While the unbuffered cursor is open the connection can not run any other
+statement, so nothing inside the write loop may touch the database.
+"""
+
+import csv
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import now_datetime
+
+from design_integration.design_integration.files import make_private_file
+from design_integration.design_integration.profiling import profile
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_EVENT = "design_items_export"
+EXPORT_PROGRESS_EVERY = 5000
+
+# column header -> SQL expression; design item and request columns come from
+# DESIGN_ITEM_COLUMNS, these are appended after them
+TRANSITION_COLUMNS = {
+	"last_transition_from": "lt.from_status",
+	"last_transition_to": "lt.to_status",
+	"last_transition_date": "lt.transition_date",
+	"last_transitioned_by": "lt.transitioned_by",
+}
+
+
+@frappe.whitelist()
+@profile
+def export_design_items(filters=None, file_format="csv"):
+	"""Queue an export of the design items matching ``filters``; returns ``{"job_id"}``"""
+	if file_format not in EXPORT_FORMATS:
+		frappe.throw(_("Export format must be one of {0}").format(", ".join(EXPORT_FORMATS)))
+	if not frappe.has_permission("Design Request Item", "export"):
+		frappe.throw(_("Not permitted to export Design Request Items"), frappe.PermissionError)
+
+	job_id = f"design_items_export::{frappe.generate_hash(length=10)}"
+	frappe.enqueue(
+		build_design_items_export,
+		queue="long",
+		timeout=3600,
+		job_id=job_id,
+		filters=filters,
+		file_format=file_format,
+		export_id=job_id,
+	)
+	return {"job_id": job_id}
+
+
+def build_design_items_export(filters=None, file_format="csv", export_id=None):
+	"""Write the export file and register it; returns the File document"""
+	file_name = f"design-items-{now_datetime().strftime('%Y%m%d-%H%M%S')}-{frappe.generate_hash(length=6)}.{file_format}"
+	path = frappe.get_site_path("private", "files", file_name)
+
+	try:
+		query, values, columns = get_export_query(filters)
+		writer = XLSXWriter if file_format == "xlsx" else CSVWriter
+
+		with writer(path, columns) as out, frappe.db.unbuffered_cursor():
+			written = 0
+			for row in frappe.db.sql(query, values, as_iterator=True):
+				out.write(row)
+				written += 1
+				if export_id and not written % EXPORT_PROGRESS_EVERY:
+					publish_export_progress(export_id, written=written)
+
+		# File.insert would read the whole export back into memory to hash it
+		file_doc = make_private_file(file_name)
+		file_doc.db_insert()
+		frappe.db.commit()
+
+	except Exception as e:
+		if os.path.exists(path):
+			os.remove(path)
+		frappe.log_error(f"Failed to export design items: {e!s}")
+		if export_id:
+			publish_export_progress(export_id, error=str(e))
+		raise
+
+	if export_id:
+		publish_export_progress(export_id, written=written, file_url=file_doc.file_url)
+	return file_doc
+
+
+def get_export_query(filters=None):
+	"""Return ``(query, values, column headers)`` for the export"""
+	from design_integration.design_integration.doctype.design_request.design_request import (
+		DESIGN_ITEM_COLUMNS,
+		_get_design_item_conditions,
+	)
+
+	filters = frappe.parse_json(filters) if filters else {}
+	conditions, values = _get_design_item_conditions(filters)
+	columns = {**DESIGN_ITEM_COLUMNS, **TRANSITION_COLUMNS}
+
+	query = f"""
+		SELECT {", ".join(f"{expression} AS `{column}`" for column, expression in columns.items())}
+		FROM `tabDesign Request Item` di
+		INNER JOIN `tabDesign Request` dr ON di.design_request = dr.name
+		LEFT JOIN `tabDesign Stage Log` lt ON lt.name = (
+			SELECT t.name FROM `tabDesign Stage Log` t
+			WHERE t.design_request_item = di.name
+			ORDER BY t.transition_date DESC, t.creation DESC
+			LIMIT 1
+		)
+		WHERE {" AND ".join(conditions)}
+		ORDER BY dr.creation DESC, di.name DESC
+	"""
+	return query, values, list(columns)
+
+
+def publish_export_progress(export_id, **data):
+	frappe.publish_realtime(EXPORT_EVENT, {"export_id": export_id, **data}, user=frappe.session.user)
+
+
+class CSVWriter:
+	def __init__(self, path, columns):
+		self.path = path
+		self.columns = columns
+
+	def __enter__(self):
+		self.file = open(self.path, "w", newline="", encoding="utf-8")
+		self.writer = csv.writer(self.file)
+		self.writer.writerow(self.columns)
+		return self
+
+	def write(self, row):
+		self.writer.writerow(row)
+
+	def __exit__(self, *exc):
+		self.file.close()
+
+
+class XLSXWriter:
+	"""openpyxl's write-only mode keeps only the current row in memory"""
+
+	def __init__(self, path, columns):
+		self.path = path
+		self.columns = columns
+
+	def __enter__(self):
+		from openpyxl import Workbook
+
+		self.workbook = Workbook(write_only=True)
+		self.sheet = self.workbook.create_sheet(_("Design Items"))
+		self.sheet.append(self.columns)
+		return self
+
+	def write(self, row):
+		self.sheet.append(list(row))
+
+	def __exit__(self, *exc):
+		self.workbook.save(self.path)
+		self.workbook.close()
@@ -0,0 +1,35 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""File records for files this app writes to ``private/files`` itself.
+
+``File.insert`` runs ``save_file``, which reads the content back into memory
+to hash it and may write a second copy. Exports, version files and previews
+are already on disk, so their File rows are written with ``db_insert``.
+"""
+
+import os
+
+import frappe
+
+
+def make_private_file(stored_name, attached_to_doctype=None, attached_to_name=None, file_size=None):
+	"""Named, unsaved File for ``private/files/<stored_name>``; write it with ``db_insert()``"""
+	if file_size is None:
+		file_size = os.path.getsize(frappe.get_site_path("private", "files", stored_name))
+
+	file_doc = frappe.new_doc("File")
+	file_doc.update(
+		{
+			"name": frappe.generate_hash(length=10),
+			"file_name": stored_name,
+			"file_url": f"/private/files/{stored_name}",
+			"file_size": file_size,
+			"is_private": 1,
+			"folder": "Home/Attachments" if attached_to_doctype else "Home",
+			"attached_to_doctype": attached_to_doctype,
+			"attached_to_name": attached_to_name,
+		}
+	)
+	file_doc.set_user_and_timestamp()
+	return file_doc
@@ -0,0 +1,195 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Composite indexes for the hot design queries, and a plan checker for them.
+
+``DESIGN_INDEXES`` lists each index next to the query shape it serves. Each
+doctype creates its own from ``on_doctype_update`` when it is synced, and the
+``add_design_indexes`` patch adds them to sites installed before. ``check_query_plans`` runs every
+entry of ``QUERY_CHECKS`` against the current site, EXPLAINs each SELECT
+it issues, and reports any full scan of a table that holds real data:
+
+	bench --site <site> execute design_integration.design_integration.indexes.check_query_plans
+"""
+
+import frappe
+from frappe.utils import add_days, now_datetime
+
+from design_integration.design_integration.query_capture import watch_queries
+
+# doctype -> [(index name, columns)]
+DESIGN_INDEXES = {
+	"Design Request Item": [
+		# joins from a request to its items, open item recount, overdue digest
+		("design_request_status_index", ("design_request", "design_status")),
+		# listing and stats filtered by workflow status
+		("design_approval_status_index", ("design_status", "approval_status")),
+	],
+	"Design Request Item Child": [
+		# qty already requested per Sales Order line
+		("parent_so_detail_index", ("parent", "so_detail", "qty")),
+	],
+	"Design Request": [
+		# requests of a Sales Order
+		("sales_order_docstatus_index", ("sales_order", "docstatus")),
+		# my requests, assigned_to filter and overdue digest
+		("assigned_request_date_index", ("assigned_to", "docstatus", "request_date")),
+		# default listing order
+		("docstatus_creation_index", ("docstatus", "creation")),
+	],
+	"Design Notification": [
+		# outbox claim
+		("status_next_attempt_index", ("status", "next_attempt_at")),
+	],
+	"Design Stage Log": [
+		# history of an item, latest transition, timeline of listed items
+		("item_transition_date_index", ("design_request_item", "transition_date")),
+		# timeline of a request
+		("request_transition_date_index", ("design_request", "transition_date")),
+	],
+	"Design Version": [
+		# versions panel of an item, newest first
+		("item_posting_date_index", ("design_request_item", "posting_date", "creation")),
+	],
+}
+
+# doctype -> [(constraint name, columns)]
+DESIGN_UNIQUE_INDEXES = {
+	"Design Version": [
+		# one tag per item, allocated by naming.make_version_tag
+		("item_version_tag_unique", ("design_request_item", "version_tag")),
+	],
+}
+
+# scans of tables smaller than this are left to the optimizer
+SCAN_ROW_THRESHOLD = 100
+
+
+def add_design_indexes():
+	for doctype in DESIGN_INDEXES:
+		add_doctype_indexes(doctype)
+
+
+def add_doctype_indexes(doctype):
+	for index_name, columns in DESIGN_INDEXES.get(doctype, ()):
+		frappe.db.add_index(doctype, list(columns), index_name)
+
+
+def add_doctype_unique_indexes(doctype):
+	for constraint_name, columns in DESIGN_UNIQUE_INDEXES.get(doctype, ()):
+		frappe.db.add_unique(doctype, list(columns), constraint_name)
+
+
+def _sample(doctype, field):
+	return frappe.db.get_value(doctype, {field: ["is", "set"]}, field, order_by="creation desc")
+
+
+def _used_qty():
+	from design_integration.design_integration.doctype.design_request.design_request import get_used_qty_map
+
+	sales_order = _sample("Design Request", "sales_order")
+	return lambda: get_used_qty_map(sales_order)
+
+
+def _listing(filter_field=None, sort_by="creation"):
+	from design_integration.design_integration.doctype.design_request.design_request import query_design_items
+
+	def setup():
+		filters = None
+		if filter_field:
+			doctype, field = filter_field
+			filters = {"status" if field == "design_status" else field: _sample(doctype, field)}
+
+		def run():
+			_rows, next_cursor = query_design_items(filters=filters, sort_by=sort_by, page_length=20)
+			if next_cursor:
+				query_design_items(filters=filters, sort_by=sort_by, cursor=next_cursor, page_length=20)
+
+		return run
+
+	return setup
+
+
+def _my_requests():
+	from design_integration.design_integration.dashboard import get_my_request_count
+
+	user = _sample("Design Request", "assigned_to")
+	return lambda: get_my_request_count(user)
+
+
+def _request_items():
+	design_request = _sample("Design Request Item", "design_request")
+	return lambda: frappe.get_all("Design Request Item", {"design_request": design_request}, pluck="name")
+
+
+def _overdue():
+	from design_integration.design_integration.overdue_digest import get_overdue_assignees, get_overdue_items
+
+	def run():
+		users = [row.assigned_to for row in get_overdue_assignees()]
+		if users:
+			get_overdue_items(users[:1])
+
+	return run
+
+
+def _stage_timeline():
+	from design_integration.design_integration.stage_log import get_stage_timeline
+
+	design_request = _sample("Design Stage Log", "design_request")
+	transition_date = _sample("Design Stage Log", "transition_date") or now_datetime()
+	return lambda: get_stage_timeline(
+		add_days(transition_date, -7), transition_date, design_request=design_request
+	)
+
+
+def _item_versions():
+	from design_integration.design_integration.doctype.design_request_item.design_request_item import (
+		get_versions,
+	)
+
+	design_request_item = _sample("Design Version", "design_request_item")
+	return lambda: get_versions(design_request_item)
+
+
+# name -> setup returning a read-only callable that issues the production query shape;
+# setup picks sample values from the site and its own queries are not checked
+QUERY_CHECKS = {
+	"used qty per sales order line": _used_qty,
+	"design items listing": _listing(),
+	"design items by status": _listing(("Design Request Item", "design_status")),
+	"design items by assignee": _listing(("Design Request", "assigned_to"), sort_by="request_date"),
+	"my requests": _my_requests,
+	"items of a request": _request_items,
+	"overdue digest": _overdue,
+	"stage timeline of a request": _stage_timeline,
+	"versions of an item": _item_versions,
+}
+
+
+def check_query_plans(raise_exception=True):
+	"""EXPLAIN every registered query and return (or throw) the full scans found"""
+	problems = []
+	for name, setup in QUERY_CHECKS.items():
+		for query, values in _capture_selects(setup()):
+			for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True):
+				if (row.get("type") or "").upper() == "ALL" and (row.get("rows") or 0) >= SCAN_ROW_THRESHOLD:
+					problems.append(f"{name}: full scan of {row.table} ({row.rows} rows)")
+
+	if problems and raise_exception:
+		frappe.throw("<br>".join(problems), title=frappe._("Design queries without an index"))
+	return problems
+
+
+def _capture_selects(run):
+	"""Call ``run`` and return the (query, values) of every SELECT it sent"""
+	captured = []
+
+	def capture(query, values, elapsed_ms):
+		if str(query).lstrip().upper().startswith("SELECT"):
+			captured.append((str(query), values))
+
+	with watch_queries(capture):
+		run()
+
+	return captured
@@ -0,0 +1,56 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Request-scoped lookup of the Item columns the design controllers copy.
+
+Details are memoized on ``frappe.local`` so they live for one request or
+background job. Bulk flows call ``prefetch`` once for a whole batch; single
+saves go through ``get_item`` and only hit the database on a miss. The Item
+doc_events hooks drop entries when an Item changes within the same request.
+"""
+
+import frappe
+
+ITEM_FIELDS = ("item_name", "description", "item_group")
+
+
+def prefetch(item_codes):
+	"""``{item_code: details or None}`` for ``item_codes``, fetching misses in one query"""
+	cache = _get_cache()
+	missing = list({code for code in item_codes if code and code not in cache})
+
+	if missing:
+		found = {
+			item.name: item
+			for item in frappe.get_all(
+				"Item", filters={"name": ["in", missing]}, fields=["name", *ITEM_FIELDS]
+			)
+		}
+		for code in missing:
+			# misses are remembered too, so a bad code is not looked up twice
+			cache[code] = found.get(code)
+
+	return {code: cache.get(code) for code in item_codes if code}
+
+
+def get_item(item_code):
+	"""Details for one item, or None if it does not exist"""
+	return prefetch([item_code]).get(item_code) if item_code else None
+
+
+def clear_item_cache(doc=None, method=None, old_name=None, *args):
+	"""Item on_update / on_trash / after_rename hook"""
+	cache = _get_cache()
+	if not doc:
+		cache.clear()
+		return
+
+	cache.pop(doc.name, None)
+	if old_name:
+		cache.pop(old_name, None)
+
+
+def _get_cache():
+	if not hasattr(frappe.local, "design_item_cache"):
+		frappe.local.design_item_cache = {}
+	return frappe.local.design_item_cache
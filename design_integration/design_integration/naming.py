@@ -0,0 +1,121 @@
+# Copyright (c) 2025, AxelGear and contributors
+# For license information, please see license.txt
+
+"""Race-free name sequences kept in Frappe's ``tabSeries`` counter table.
+
+A sequence is a ``tabSeries`` row keyed by the name prefix, the same way
+naming series are stored. Incrementing it is a single upsert, so the row lock
+is taken by the write itself and two transactions can never read the same
+value, even when the row does not exist yet.
+
+Design Version tags use one sequence per item and revision, taken when the
+version is inserted; a unique index on (design_request_item, version_tag)
+backs it up.
+"""
+
+import re
+
+import frappe
+
+DESIGN_REQUEST_ITEM_SERIES = "DES-IT-"
+VERSION_TAG_PATTERN = re.compile(r"^V(\d+)(?:-(\d+))?$")
+
+
+def next_sequence(key):
+	"""Increment the ``key`` sequence and return the new value"""
+	return reserve_sequence_block(key, 1)[0]
+
+
+def reserve_sequence_block(key, count):
+	"""Advance the ``key`` sequence by ``count`` and return the reserved numbers.
+
+	The numbers are contiguous and belong to the calling transaction alone; a
+	rollback hands them back together with the rest of the transaction.
+	"""
+	if count < 1:
+		return []
+
+	if frappe.db.db_type == "postgres":
+		frappe.db.sql(
+			"""INSERT INTO `tabSeries` (name, current) VALUES (%(key)s, %(count)s)
+			ON CONFLICT (name) DO UPDATE SET current = `tabSeries`.current + %(count)s""",
+			{"key": key, "count": count},
+		)
+	else:
+		frappe.db.sql(
+			"""INSERT INTO `tabSeries` (name, current) VALUES (%(key)s, %(count)s)
+			ON DUPLICATE KEY UPDATE current = current + %(count)s""",
+			{"key": key, "count": count},
+		)
+
+	# the upsert holds the row lock until commit, so this read sees our value
+	last = peek_sequence(key)
+	return list(range(last - count + 1, last + 1))
+
+
+def peek_sequence(key):
+	"""Current value of the ``key`` sequence (0 if it was never used), without reserving anything"""
+	current = frappe.db.sql("SELECT current FROM `tabSeries` WHERE name = %s", key)
+	return current[0][0] if current else 0
+
+
+def ensure_sequence_at_least(key, value):
+	"""Raise the ``key`` sequence to ``value`` if it is currently lower"""
+	if frappe.db.db_type == "postgres":
+		frappe.db.sql(
+			"""INSERT INTO `tabSeries` (name, current) VALUES (%(key)s, %(value)s)
+			ON CONFLICT (name) DO UPDATE SET current = GREATEST(`tabSeries`.current, %(value)s)""",
+			{"key": key, "value": value},
+		)
+	else:
+		frappe.db.sql(
+			"""INSERT INTO `tabSeries` (name, current) VALUES (%(key)s, %(value)s)
+			ON DUPLICATE KEY UPDATE current = GREATEST(current, %(value)s)""",
+			{"key": key, "value": value},
+		)
+
+
+def get_design_request_series_key(sales_order):
+	"""Sequence key for Design Requests raised against ``sales_order``"""
+	return f"{sales_order}-"
+
+
+def make_design_request_item_names(count):
+	"""Reserve ``count`` consecutive Design Request Item names in one round trip"""
+	return [
+		f"{DESIGN_REQUEST_ITEM_SERIES}{number:06d}"
+		for number in reserve_sequence_block(DESIGN_REQUEST_ITEM_SERIES, count)
+	]
+
+
+def get_version_tag_key(design_request_item, revision_count):
+	"""Sequence key for the version tags of one revision of an item"""
+	return f"{design_request_item}-V{revision_count}-"
+
+
+def format_version_tag(revision_count, sequence):
+	"""The first version of a revision is ``V<revision>``, the next ones ``V<revision>-1``, ``V<revision>-2``..."""
+	return f"V{revision_count}" if sequence <= 1 else f"V{revision_count}-{sequence - 1}"
+
+
+def parse_version_tag(version_tag):
+	"""``(revision_count, sequence)`` of a tag made by ``format_version_tag``, else None"""
+	match = VERSION_TAG_PATTERN.match(version_tag or "")
+	if not match:
+		return None
+	return int(match.group(1)), int(match.group(2) or 0) + 1
+
+
+def make_version_tag(design_request_item):
+	"""Reserve the next tag of the item's current revision"""
+	revision_count = frappe.db.get_value("Design Request Item", design_request_item, "revision_count") or 0
+	return format_version_tag(
+		revision_count, next_sequence(get_version_tag_key(design_request_item, revision_count))
+	)
+
+
+def reserve_version_tag(design_request_item, version_tag):
+	"""Keep the counter ahead of a tag that was chosen by hand or imported"""
+	parsed = parse_version_tag(version_tag)
+	if parsed:
+		ensure_sequence_at_least(get_version_tag_key(design_request_item, parsed[0]), parsed[1])
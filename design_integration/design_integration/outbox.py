@@ -0,0 +1,181 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Transactional outbox for chat and webhook notifications.
+
+Callers write a ``Design Notification`` row inside their own transaction via
+``queue_notification``; nothing leaves the server until that transaction
+commits. A background worker then claims due rows, delivers them and either
+marks them sent or schedules a retry with exponential backoff. Every row
+carries an idempotency key, so queueing the same event twice is a no-op and
+receivers that understand the ``Idempotency-Key`` header can drop replays.
+
+Email is not routed through here: ``frappe.sendmail`` already writes to
+Frappe's own Email Queue, which is delivered the same way.
+"""
+
+import json
+import time
+from datetime import timedelta
+
+import frappe
+from frappe.utils import now_datetime
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30  # seconds before the first retry, doubled on each failure
+BACKOFF_CAP = 6 * 60 * 60
+CLAIM_LEASE = 10 * 60  # a row stuck in Sending this long is claimed again
+DELIVERY_BATCH = 50
+WEBHOOK_TIMEOUT = 10
+
+
+def queue_notification(channel, payload, idempotency_key, reference_doctype=None, reference_name=None):
+	"""Record a notification for delivery after the current transaction commits"""
+	if frappe.db.exists("Design Notification", {"idempotency_key": idempotency_key}):
+		return None
+
+	# a failed INSERT aborts the whole transaction on Postgres, and that is
+	# the caller's save
+	frappe.db.savepoint("design_notification")
+	try:
+		doc = frappe.get_doc(
+			{
+				"doctype": "Design Notification",
+				"channel": channel,
+				"payload": json.dumps(payload, default=str),
+				"idempotency_key": idempotency_key,
+				"reference_doctype": reference_doctype,
+				"reference_name": reference_name,
+				"status": "Pending",
+				"next_attempt_at": now_datetime(),
+			}
+		).insert(ignore_permissions=True)
+	except (frappe.DuplicateEntryError, frappe.UniqueValidationError):
+		frappe.db.rollback(save_point="design_notification")
+		# queued concurrently by another transaction; a clash on the unique
+		# idempotency_key column surfaces as UniqueValidationError
+		return None
+
+	frappe.enqueue(
+		deliver_notifications,
+		queue="short",
+		job_id="design_notification_delivery",
+		deduplicate=True,
+		enqueue_after_commit=True,
+	)
+	return doc.name
+
+
+def deliver_notifications(limit=DELIVERY_BATCH):
+	"""Worker entry point (also run by the scheduler): deliver every due notification"""
+	delivered = 0
+	while names := claim_due_notifications(limit):
+		for name in names:
+			delivered += deliver_notification(name)
+		if len(names) < limit:
+			break
+	return delivered
+
+
+def claim_due_notifications(limit=DELIVERY_BATCH):
+	"""Move up to ``limit`` due rows to Sending and return their names.
+
+	Claiming is a short transaction of its own, so no row lock is held while
+	talking to the remote service and parallel workers never share a row.
+	"""
+	now = now_datetime()
+	names = frappe.db.sql(
+		"""SELECT name FROM `tabDesign Notification`
+		WHERE (status = 'Pending' AND next_attempt_at <= %(now)s)
+			OR (status = 'Sending' AND claimed_at < %(stale)s)
+		ORDER BY next_attempt_at
+		LIMIT %(limit)s
+		FOR UPDATE SKIP LOCKED""",
+		{"now": now, "stale": now - timedelta(seconds=CLAIM_LEASE), "limit": limit},
+		pluck=True,
+	)
+
+	if names:
+		frappe.db.sql(
+			"""UPDATE `tabDesign Notification` SET status = 'Sending', claimed_at = %(now)s
+			WHERE name IN %(names)s""",
+			{"now": now, "names": tuple(names)},
+		)
+	frappe.db.commit()
+	return names
+
+
+def deliver_notification(name):
+	"""Send one claimed notification; returns 1 when it went out"""
+	row = frappe.db.get_value(
+		"Design Notification", name, ["channel", "payload", "idempotency_key", "attempts"], as_dict=True
+	)
+	attempts = (row.attempts or 0) + 1
+	started = time.monotonic()
+
+	try:
+		SENDERS[row.channel](json.loads(row.payload), row.idempotency_key)
+	except Exception:
+		failed = attempts >= MAX_ATTEMPTS
+		frappe.db.set_value(
+			"Design Notification",
+			name,
+			{
+				"status": "Failed" if failed else "Pending",
+				"attempts": attempts,
+				"next_attempt_at": None
+				if failed
+				else now_datetime() + timedelta(seconds=get_backoff(attempts)),
+				"duration": (time.monotonic() - started) * 1000,
+				"last_error": frappe.get_traceback(),
+			},
+			update_modified=False,
+		)
+		frappe.db.commit()
+		return 0
+
+	frappe.db.set_value(
+		"Design Notification",
+		name,
+		{
+			"status": "Sent",
+			"attempts": attempts,
+			"sent_at": now_datetime(),
+			"duration": (time.monotonic() - started) * 1000,
+			"last_error": None,
+		},
+		update_modified=False,
+	)
+	frappe.db.commit()
+	return 1
+
+
+def get_backoff(attempts):
+	"""Seconds to wait after the ``attempts``-th failure"""
+	return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_CAP)
+
+
+def send_zohocliq(payload, idempotency_key):
+	from razorpay_frappe.utils import send_zohocliq_message
+
+	channel = frappe.db.get_single_value("Razorpay Settings", "design_channel_unique")
+	if channel:
+		send_zohocliq_message(payload["message"], channel, payload["title"])
+
+
+def send_webhook(payload, idempotency_key):
+	import requests
+
+	response = requests.post(
+		payload["url"],
+		json=payload["body"],
+		headers={"Idempotency-Key": idempotency_key},
+		timeout=WEBHOOK_TIMEOUT,
+	)
+	response.raise_for_status()
+
+
+SENDERS = {
+	"ZohoCliq": send_zohocliq,
+	"Webhook": send_webhook,
+}
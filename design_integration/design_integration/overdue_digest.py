@@ -0,0 +1,124 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Daily overdue digest: one email per assignee listing all of their overdue items.
+
+The scheduler job only finds the assignees and enqueues chunks of them on the
+``long`` queue. Each chunk job loads the items for its users in one query and
+marks every user as sent for the day, so a rerun of the same day skips users
+that already got their digest.
+"""
+
+import frappe
+from frappe.utils import nowdate
+
+from design_integration.design_integration.dashboard import OVERDUE_DAYS
+
+DIGEST_CHUNK_SIZE = 50
+PROGRESS_TTL = 2 * 24 * 60 * 60
+
+# shared by both queries so the scheduler and the jobs agree on "overdue"
+OVERDUE_CONDITIONS = f"""
+	dr.docstatus = 0
+	AND di.design_status != 'Completed'
+	AND dr.assigned_to != ''
+	AND dr.request_date < DATE_SUB(CURDATE(), INTERVAL {OVERDUE_DAYS} DAY)
+"""
+
+
+def enqueue_overdue_digests(run_id=None):
+	"""Enqueue digest jobs for every assignee with overdue items; returns the item count"""
+	run_id = run_id or nowdate()
+	assignees = get_overdue_assignees()
+
+	done = get_sent_users(run_id)
+	pending = [row.assigned_to for row in assignees if row.assigned_to not in done]
+
+	for start in range(0, len(pending), DIGEST_CHUNK_SIZE):
+		users = pending[start : start + DIGEST_CHUNK_SIZE]
+		frappe.enqueue(
+			send_overdue_digests,
+			queue="long",
+			job_id=f"design_overdue_digest::{run_id}::{users[0]}",
+			deduplicate=True,
+			run_id=run_id,
+			users=users,
+		)
+
+	frappe.logger().info(
+		f"Queued overdue digests for {len(pending)} of {len(assignees)} users ({run_id})"
+	)
+	return sum(row.item_count for row in assignees)
+
+
+def send_overdue_digests(run_id, users):
+	"""Background job: send one digest to each of ``users`` not yet done for ``run_id``"""
+	users = [user for user in users if user not in get_sent_users(run_id)]
+	if not users:
+		return
+
+	items_by_user = {}
+	for item in get_overdue_items(users):
+		items_by_user.setdefault(item.assigned_to, []).append(item)
+
+	for user, items in items_by_user.items():
+		try:
+			frappe.sendmail(
+				recipients=[user],
+				subject=f"{len(items)} Overdue Design Item{'s' if len(items) > 1 else ''}",
+				template="overdue_design_items",
+				args={"items": items},
+			)
+			frappe.db.commit()
+			mark_user_sent(run_id, user)
+		except Exception:
+			# one bad address must not hold back the rest of the chunk
+			frappe.db.rollback()
+			frappe.log_error(frappe.get_traceback(), f"Overdue digest failed for {user}")
+
+
+def get_overdue_assignees():
+	"""``[{assigned_to, item_count}]`` for every assignee with overdue items"""
+	return frappe.db.sql(
+		f"""
+		SELECT dr.assigned_to, COUNT(*) AS item_count
+		FROM `tabDesign Request Item` di
+		INNER JOIN `tabDesign Request` dr ON di.design_request = dr.name
+		WHERE {OVERDUE_CONDITIONS}
+		GROUP BY dr.assigned_to
+		ORDER BY dr.assigned_to
+	""",
+		as_dict=True,
+	)
+
+
+def get_overdue_items(users):
+	"""Overdue items assigned to any of ``users``, most overdue first per user"""
+	return frappe.db.sql(
+		f"""
+		SELECT dr.assigned_to, di.name, di.item_code, di.item_name, dr.name AS request_id,
+			dr.customer_name, DATEDIFF(CURDATE(), dr.request_date) AS days_overdue
+		FROM `tabDesign Request Item` di
+		INNER JOIN `tabDesign Request` dr ON di.design_request = dr.name
+		WHERE {OVERDUE_CONDITIONS} AND dr.assigned_to IN %(users)s
+		ORDER BY dr.assigned_to, days_overdue DESC, di.name
+	""",
+		{"users": tuple(users)},
+		as_dict=True,
+	)
+
+
+def get_sent_users(run_id):
+	return {
+		frappe.safe_decode(user) for user in (frappe.cache().hgetall(_get_progress_key(run_id)) or {})
+	}
+
+
+def mark_user_sent(run_id, user):
+	key = _get_progress_key(run_id)
+	frappe.cache().hset(key, user, 1)
+	frappe.cache().expire(frappe.cache().make_key(key), PROGRESS_TTL)
+
+
+def _get_progress_key(run_id):
+	return f"design_integration:overdue_digest:{run_id}"
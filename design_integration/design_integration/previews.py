@@ -0,0 +1,330 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Thumbnails and file details of Design Version files.
+
+Inserting a Design Version queues ``render_blob_preview`` for its blob on the
+long queue. The worker reads the stored file and writes a PNG thumbnail
+(at most THUMBNAIL_SIZE) next to it, attached to the blob. It also records
+what it learnt about the file in ``preview_meta``: dimensions, page count,
+DXF layers and entity counts. Blobs are named after their content hash, so a
+re-upload of the same content finds the preview already there and nothing
+is queued. A preview still Pending PREVIEW_TIMEOUT_MINUTES after it was queued
+lost its job (worker died, queue flushed) and is queued again, by the next
+upload of that content or by the hourly ``requeue_stale_previews``.
+
+Images go through Pillow. For PDFs the page count comes from pypdf, and the
+first page is drawn with PyMuPDF when it is installed. DXF drawings are read
+with ezdxf (pure Python) and their lines, polylines, circles and arcs are
+drawn with Pillow. PyMuPDF and ezdxf are optional: without PyMuPDF a PDF
+only gets its details, and without ezdxf DXF files are Unsupported.
+"""
+
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, get_datetime, now_datetime
+
+from design_integration.design_integration.files import make_private_file
+from design_integration.design_integration.profiling import profile
+from design_integration.design_integration.version_store import BLOB_DOCTYPE, get_blob_path
+
+PREVIEW_PREFIX = "design-version-preview-"
+THUMBNAIL_SIZE = (480, 480)
+# a drawing with more entities than this is only described, not drawn
+MAX_DXF_ENTITIES = 200000
+# states of a finished preview
+DONE_STATUSES = ("Ready", "Unsupported")
+# a Pending preview older than this is taken to have lost its job
+PREVIEW_TIMEOUT_MINUTES = 60
+
+
+def queue_blob_preview(blob_name):
+	"""Queue a preview of ``blob_name`` unless its content was already handled"""
+	if not blob_name:
+		return
+	preview = frappe.db.get_value(
+		BLOB_DOCTYPE, blob_name, ["preview_status", "preview_queued_at"], as_dict=True
+	)
+	if preview and is_preview_handled(preview):
+		return
+	_enqueue_preview(blob_name)
+
+
+def is_preview_handled(preview):
+	"""Whether the preview is finished, or was queued recently enough to be on its way"""
+	if preview.preview_status in DONE_STATUSES:
+		return True
+	return (
+		preview.preview_status == "Pending"
+		and bool(preview.preview_queued_at)
+		and get_datetime(preview.preview_queued_at)
+		> add_to_date(now_datetime(), minutes=-PREVIEW_TIMEOUT_MINUTES)
+	)
+
+
+def requeue_stale_previews():
+	"""Hourly: queue blobs that were never queued or whose preview job was lost"""
+	for preview in frappe.get_all(
+		BLOB_DOCTYPE,
+		filters={"preview_status": ["not in", (*DONE_STATUSES, "Failed")]},
+		fields=["name", "preview_status", "preview_queued_at"],
+	):
+		if not is_preview_handled(preview):
+			_enqueue_preview(preview.name)
+
+
+def queue_missing_previews():
+	"""Queue every blob without a finished preview, including ones whose job was lost"""
+	for blob_name in frappe.get_all(
+		BLOB_DOCTYPE, filters={"preview_status": ["not in", DONE_STATUSES]}, pluck="name"
+	):
+		_enqueue_preview(blob_name)
+
+
+def _enqueue_preview(blob_name):
+	frappe.db.set_value(
+		BLOB_DOCTYPE,
+		blob_name,
+		{"preview_status": "Pending", "preview_queued_at": now_datetime()},
+		update_modified=False,
+	)
+	frappe.enqueue(
+		render_blob_preview,
+		queue="long",
+		job_id=f"design_version_preview::{blob_name}",
+		deduplicate=True,
+		enqueue_after_commit=True,
+		blob_name=blob_name,
+	)
+
+
+def render_blob_preview(blob_name):
+	"""Worker: write the thumbnail and details of one blob"""
+	file_url = frappe.db.get_value(BLOB_DOCTYPE, blob_name, "file_url")
+	if not file_url:
+		return
+
+	extension = os.path.splitext(file_url)[1].lstrip(".").lower()
+	renderer = RENDERERS.get(extension)
+	details = {"extension": extension}
+	status, preview_url = "Unsupported", None
+
+	if renderer:
+		try:
+			image, file_details = renderer(get_blob_path(file_url))
+			details.update(file_details)
+			if image:
+				preview_url = save_thumbnail(blob_name, image)
+			status = "Ready"
+		except ImportError as e:
+			# the library for this format is not installed
+			details["reason"] = str(e)
+		except Exception as e:
+			frappe.log_error(f"Failed to render preview of design version file {blob_name}: {e!s}")
+			frappe.db.rollback()
+			status = "Failed"
+
+	frappe.db.set_value(
+		BLOB_DOCTYPE,
+		blob_name,
+		{"preview_status": status, "preview_url": preview_url, "preview_meta": frappe.as_json(details)},
+		update_modified=False,
+	)
+	frappe.db.commit()
+
+
+def save_thumbnail(blob_name, image):
+	"""Write ``image`` as the blob's PNG preview and return its URL"""
+	stored_name = f"{PREVIEW_PREFIX}{blob_name}.png"
+	if image.mode not in ("RGB", "RGBA", "L"):
+		image = image.convert("RGBA")
+	image.save(get_blob_path(stored_name), "PNG", optimize=True)
+
+	file_url = f"/private/files/{stored_name}"
+	if not frappe.db.exists("File", {"file_url": file_url, "attached_to_name": blob_name}):
+		make_private_file(stored_name, BLOB_DOCTYPE, blob_name).db_insert()
+	return file_url
+
+
+def delete_preview(blob_name):
+	"""Remove the preview file of a blob that is being purged"""
+	path = get_blob_path(f"{PREVIEW_PREFIX}{blob_name}.png")
+	if os.path.exists(path):
+		os.remove(path)
+
+
+@frappe.whitelist()
+@profile
+def get_version_diff(version, other_version):
+	"""Both versions side by side, with the file details that differ between them"""
+	for name in (version, other_version):
+		frappe.has_permission("Design Version", "read", name, throw=True)
+
+	rows = {
+		row.name: row
+		for row in frappe.db.sql(
+			"""
+			SELECT v.name, v.version_tag, v.posting_date, v.description, v.new_version_file,
+				v.version_blob AS content_hash, b.file_size, b.preview_status, b.preview_url, b.preview_meta
+			FROM `tabDesign Version` v
+			LEFT JOIN `tabDesign Version Blob` b ON b.name = v.version_blob
+			WHERE v.name IN %(names)s
+			""",
+			{"names": (version, other_version)},
+			as_dict=True,
+		)
+	}
+	if len(rows) < 2:
+		frappe.throw(_("Pick two different versions to compare"))
+
+	old, new = rows[other_version], rows[version]
+	for row in (old, new):
+		row.details = _flatten(frappe.parse_json(row.pop("preview_meta") or "{}"))
+		row.details["file_size"] = row.file_size
+
+	return {
+		"versions": [old, new],
+		"same_content": bool(old.content_hash) and old.content_hash == new.content_hash,
+		"changes": [
+			{"field": key, "from": old.details.get(key), "to": new.details.get(key)}
+			for key in sorted(set(old.details) | set(new.details))
+			if old.details.get(key) != new.details.get(key)
+		],
+	}
+
+
+def render_image(path):
+	from PIL import Image
+
+	with Image.open(path) as image:
+		details = {"format": image.format, "width": image.width, "height": image.height}
+		# lets JPEG decode at a reduced size instead of full resolution
+		image.draft("RGB", THUMBNAIL_SIZE)
+		image.thumbnail(THUMBNAIL_SIZE)
+		return image.copy(), details
+
+
+def render_pdf(path):
+	from pypdf import PdfReader
+
+	reader = PdfReader(path)
+	first_page = reader.pages[0] if reader.pages else None
+	details = {"page_count": len(reader.pages)}
+	if first_page:
+		details.update(
+			width=round(float(first_page.mediabox.width), 1),
+			height=round(float(first_page.mediabox.height), 1),
+		)
+
+	try:
+		import fitz
+	except ImportError:
+		return None, details
+
+	from PIL import Image
+
+	with fitz.open(path) as document:
+		if not document.page_count:
+			return None, details
+		page = document[0]
+		scale = min(THUMBNAIL_SIZE[0] / page.rect.width, THUMBNAIL_SIZE[1] / page.rect.height)
+		pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+		return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples), details
+
+
+def render_dxf(path):
+	import ezdxf
+	from ezdxf import bbox
+
+	document = ezdxf.readfile(path)
+	modelspace = document.modelspace()
+	entity_counts = {}
+	for entity in modelspace:
+		entity_counts[entity.dxftype()] = entity_counts.get(entity.dxftype(), 0) + 1
+
+	details = {
+		"dxf_version": document.dxfversion,
+		"layers": len(document.layers),
+		"entity_counts": entity_counts,
+	}
+	extents = bbox.extents(modelspace, fast=True)
+	if not extents.has_data:
+		return None, details
+
+	details.update(width=round(extents.size.x, 3), height=round(extents.size.y, 3))
+	if sum(entity_counts.values()) > MAX_DXF_ENTITIES:
+		return None, details
+	return _draw_dxf(modelspace, extents), details
+
+
+def _draw_dxf(modelspace, extents):
+	from PIL import Image, ImageDraw
+
+	margin = 8
+	scale = min(
+		(THUMBNAIL_SIZE[0] - 2 * margin) / (extents.size.x or 1),
+		(THUMBNAIL_SIZE[1] - 2 * margin) / (extents.size.y or 1),
+	)
+	image = Image.new("RGB", THUMBNAIL_SIZE, "white")
+	draw = ImageDraw.Draw(image)
+
+	def point(x, y):
+		# drawing y grows upwards, image y downwards
+		return (
+			margin + (x - extents.extmin.x) * scale,
+			THUMBNAIL_SIZE[1] - margin - (y - extents.extmin.y) * scale,
+		)
+
+	def circle_box(center, radius):
+		x, y = point(center.x, center.y)
+		return (x - radius * scale, y - radius * scale, x + radius * scale, y + radius * scale)
+
+	for entity in modelspace:
+		kind = entity.dxftype()
+		if kind == "LINE":
+			draw.line([point(*entity.dxf.start[:2]), point(*entity.dxf.end[:2])], fill="black")
+		elif kind == "LWPOLYLINE":
+			points = [point(x, y) for x, y in entity.get_points("xy")]
+			if entity.closed and points:
+				points.append(points[0])
+			if len(points) > 1:
+				draw.line(points, fill="black")
+		elif kind == "POLYLINE":
+			points = [point(vertex[0], vertex[1]) for vertex in entity.points()]
+			if entity.is_closed and points:
+				points.append(points[0])
+			if len(points) > 1:
+				draw.line(points, fill="black")
+		elif kind == "CIRCLE":
+			draw.ellipse(circle_box(entity.dxf.center, entity.dxf.radius), outline="black")
+		elif kind == "ARC":
+			# counter-clockwise in the drawing is clockwise once y is flipped
+			end = (
+				entity.dxf.end_angle
+				if entity.dxf.end_angle > entity.dxf.start_angle
+				else entity.dxf.end_angle + 360
+			)
+			draw.arc(
+				circle_box(entity.dxf.center, entity.dxf.radius), -end, -entity.dxf.start_angle, fill="black"
+			)
+
+	return image
+
+
+def _flatten(details, prefix=""):
+	flat = {}
+	for key, value in details.items():
+		if isinstance(value, dict):
+			flat.update(_flatten(value, f"{prefix}{key}."))
+		else:
+			flat[f"{prefix}{key}"] = value
+	return flat
+
+
+RENDERERS = {
+	**dict.fromkeys(("png", "jpg", "jpeg", "gif", "bmp", "webp", "tif", "tiff"), render_image),
+	"pdf": render_pdf,
+	"dxf": render_dxf,
+}
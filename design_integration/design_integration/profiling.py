@@ -0,0 +1,145 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Opt-in timing and query counting for whitelisted methods and controller hooks.
+
+Turn it on per site with ``bench --site <site> set-config design_profiling 1``.
+While enabled, every call wrapped by ``profile`` (and every controller hook
+of a class decorated with ``profile_hooks``) records its wall time, SQL
+count, SQL time and slowest statement into a Redis ring buffer, which the
+"Design Perf Log" report reads. A request sent with an ``X-Design-Timing``
+header gets the outermost spans back in a response header of that name.
+When the flag is off the wrappers only check it and call through.
+"""
+
+import functools
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+import frappe
+from frappe.utils import now_datetime
+
+from design_integration.design_integration.query_capture import watch_queries
+
+PROFILING_FLAG = "design_profiling"
+PERF_LOG_KEY = "design_perf_log"
+PERF_LOG_SIZE = 2000
+TIMING_HEADER = "X-Design-Timing"
+MAX_STATEMENT_LENGTH = 1000
+
+
+def is_profiling_enabled():
+	return bool(frappe.conf.get(PROFILING_FLAG))
+
+
+def profile(fn=None, *, name=None, kind="method"):
+	"""Decorator recording a sample per call when profiling is enabled"""
+	if fn is None:
+		return functools.partial(profile, name=name, kind=kind)
+
+	span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		if not is_profiling_enabled():
+			return fn(*args, **kwargs)
+		with profile_span(span_name, kind):
+			return fn(*args, **kwargs)
+
+	return wrapper
+
+
+def profile_hooks(cls):
+	"""Class decorator: profile every controller hook (and its doc_events) run through ``run_method``"""
+	run_method = cls.run_method
+
+	@functools.wraps(run_method)
+	def profiled_run_method(self, method, *args, **kwargs):
+		if not is_profiling_enabled():
+			return run_method(self, method, *args, **kwargs)
+		with profile_span(f"{cls.__name__}.{method}", "hook"):
+			return run_method(self, method, *args, **kwargs)
+
+	cls.run_method = profiled_run_method
+	return cls
+
+
+@contextmanager
+def profile_span(name, kind="method"):
+	"""Measure one span; statements count toward every span open at the time"""
+	sample = frappe._dict(name=name, kind=kind, sql_count=0, sql_ms=0.0, slowest_sql_ms=0.0, slowest_sql=None)
+	stack = _get_stack()
+	# the outermost span watches the statements for every span below it
+	watcher = watch_queries(_count_statement) if not stack else nullcontext()
+	stack.append(sample)
+	started = time.perf_counter()
+
+	try:
+		with watcher:
+			yield sample
+	finally:
+		sample.wall_ms = round((time.perf_counter() - started) * 1000, 3)
+		sample.sql_ms = round(sample.sql_ms, 3)
+		stack.pop()
+		if not stack:
+			frappe.local.design_profile_roots = [*_get_roots(), sample]
+		record_sample(sample)
+
+
+def record_sample(sample):
+	sample.update(
+		{
+			"timestamp": str(now_datetime()),
+			"user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+			"path": getattr(frappe.local, "request", None) and frappe.local.request.path,
+		}
+	)
+	try:
+		frappe.cache().lpush(PERF_LOG_KEY, json.dumps(sample, default=str))
+		frappe.cache().ltrim(PERF_LOG_KEY, 0, PERF_LOG_SIZE - 1)
+	except Exception:
+		# profiling must never break the call being profiled
+		pass
+
+
+def get_samples(limit=PERF_LOG_SIZE):
+	"""Most recent samples first"""
+	return [
+		frappe._dict(json.loads(sample)) for sample in frappe.cache().lrange(PERF_LOG_KEY, 0, int(limit) - 1)
+	]
+
+
+def clear_samples():
+	frappe.cache().delete_value(PERF_LOG_KEY)
+
+
+def add_timing_header(response=None, request=None):
+	"""after_request hook: report this request's top-level spans when the client asked for them"""
+	roots = _get_roots()
+	if not roots or response is None or not (request and request.headers.get(TIMING_HEADER)):
+		return
+
+	response.headers[TIMING_HEADER] = ", ".join(
+		f"{sample.name};wall={sample.wall_ms};sql={sample.sql_count};sql_ms={sample.sql_ms}"
+		for sample in roots
+	)
+
+
+def _get_stack():
+	if not hasattr(frappe.local, "design_profile_stack"):
+		frappe.local.design_profile_stack = []
+	return frappe.local.design_profile_stack
+
+
+def _get_roots():
+	return getattr(frappe.local, "design_profile_roots", [])
+
+
+def _count_statement(query, values, elapsed_ms):
+	for sample in _get_stack():
+		sample.sql_count += 1
+		sample.sql_ms += elapsed_ms
+		if elapsed_ms > sample.slowest_sql_ms:
+			sample.slowest_sql_ms = round(elapsed_ms, 3)
+			sample.slowest_sql = str(query)[:MAX_STATEMENT_LENGTH]
@@ -0,0 +1,41 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Watch the statements sent through ``frappe.db.sql``.
+
+The one place that wraps ``frappe.db.sql``: the profiler, the benchmark, the
+plan checker and the query count tests all go through ``watch_queries``.
+Watchers nest; each restores the function it replaced when its block ends.
+"""
+
+import time
+from contextlib import contextmanager
+
+import frappe
+
+
+@contextmanager
+def watch_queries(callback):
+	"""Call ``callback(query, values, elapsed_ms)`` after every statement sent inside the block"""
+	orig_sql = frappe.db.sql
+
+	def sql(query, values=(), *args, **kwargs):
+		started = time.perf_counter()
+		try:
+			return orig_sql(query, values, *args, **kwargs)
+		finally:
+			callback(query, values, (time.perf_counter() - started) * 1000)
+
+	frappe.db.sql = sql
+	try:
+		yield
+	finally:
+		frappe.db.sql = orig_sql
+
+
+@contextmanager
+def count_queries():
+	"""Collect every statement sent through frappe.db.sql inside the block"""
+	queries = []
+	with watch_queries(lambda query, values, elapsed_ms: queries.append(query)):
+		yield queries
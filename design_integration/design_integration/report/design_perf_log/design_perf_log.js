@@ -0,0 +1,29 @@
+// Copyright (c) 2026, Axelgear and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Design Perf Log"] = {
+	filters: [
+		{
+			fieldname: "span",
+			label: __("Span"),
+			fieldtype: "Data",
+		},
+		{
+			fieldname: "kind",
+			label: __("Kind"),
+			fieldtype: "Select",
+			options: "\nmethod\nhook",
+		},
+		{
+			fieldname: "min_wall_ms",
+			label: __("Min Wall (ms)"),
+			fieldtype: "Float",
+		},
+		{
+			fieldname: "group_by_span",
+			label: __("Group by Span"),
+			fieldtype: "Check",
+			default: 1,
+		},
+	],
+};
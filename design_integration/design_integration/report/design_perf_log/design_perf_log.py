@@ -0,0 +1,90 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+import math
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+from design_integration.design_integration.profiling import get_samples, is_profiling_enabled
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	samples = [sample for sample in get_samples() if matches(sample, filters)]
+
+	if filters.group_by_span:
+		return get_summary_columns(), get_summary(samples), get_message()
+	return get_columns(), samples, get_message()
+
+
+def matches(sample, filters):
+	if filters.span and filters.span.lower() not in sample.name.lower():
+		return False
+	if filters.kind and sample.kind != filters.kind:
+		return False
+	return flt(sample.wall_ms) >= flt(filters.min_wall_ms)
+
+
+def get_summary(samples):
+	spans = {}
+	for sample in samples:
+		spans.setdefault(sample.name, []).append(sample)
+
+	rows = []
+	for name, calls in spans.items():
+		wall = sorted(flt(call.wall_ms) for call in calls)
+		slowest = max(calls, key=lambda call: flt(call.slowest_sql_ms))
+		rows.append(
+			{
+				"name": name,
+				"kind": calls[0].kind,
+				"calls": len(calls),
+				"p50_ms": wall[(len(wall) - 1) // 2],
+				"p95_ms": wall[math.ceil(len(wall) * 0.95) - 1],
+				"max_ms": wall[-1],
+				"avg_sql_count": flt(sum(cint(call.sql_count) for call in calls) / len(calls), 1),
+				"avg_sql_ms": flt(sum(flt(call.sql_ms) for call in calls) / len(calls), 3),
+				"slowest_sql_ms": slowest.slowest_sql_ms,
+				"slowest_sql": slowest.slowest_sql,
+			}
+		)
+	return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def get_message():
+	if not is_profiling_enabled():
+		return _("Profiling is off. Enable it with: bench --site {0} set-config design_profiling 1").format(
+			frappe.local.site
+		)
+
+
+def get_columns():
+	return [
+		{"label": _("Time"), "fieldname": "timestamp", "fieldtype": "Datetime", "width": 160},
+		{"label": _("Span"), "fieldname": "name", "fieldtype": "Data", "width": 260},
+		{"label": _("Kind"), "fieldname": "kind", "fieldtype": "Data", "width": 80},
+		{"label": _("Wall (ms)"), "fieldname": "wall_ms", "fieldtype": "Float", "width": 100},
+		{"label": _("SQL Count"), "fieldname": "sql_count", "fieldtype": "Int", "width": 90},
+		{"label": _("SQL (ms)"), "fieldname": "sql_ms", "fieldtype": "Float", "width": 100},
+		{"label": _("Slowest SQL (ms)"), "fieldname": "slowest_sql_ms", "fieldtype": "Float", "width": 120},
+		{"label": _("Slowest Statement"), "fieldname": "slowest_sql", "fieldtype": "Code", "width": 300},
+		{"label": _("User"), "fieldname": "user", "fieldtype": "Link", "options": "User", "width": 140},
+		{"label": _("Path"), "fieldname": "path", "fieldtype": "Data", "width": 200},
+	]
+
+
+def get_summary_columns():
+	return [
+		{"label": _("Span"), "fieldname": "name", "fieldtype": "Data", "width": 260},
+		{"label": _("Kind"), "fieldname": "kind", "fieldtype": "Data", "width": 80},
+		{"label": _("Calls"), "fieldname": "calls", "fieldtype": "Int", "width": 80},
+		{"label": _("p50 (ms)"), "fieldname": "p50_ms", "fieldtype": "Float", "width": 100},
+		{"label": _("p95 (ms)"), "fieldname": "p95_ms", "fieldtype": "Float", "width": 100},
+		{"label": _("Max (ms)"), "fieldname": "max_ms", "fieldtype": "Float", "width": 100},
+		{"label": _("Avg SQL Count"), "fieldname": "avg_sql_count", "fieldtype": "Float", "width": 110},
+		{"label": _("Avg SQL (ms)"), "fieldname": "avg_sql_ms", "fieldtype": "Float", "width": 110},
+		{"label": _("Slowest SQL (ms)"), "fieldname": "slowest_sql_ms", "fieldtype": "Float", "width": 120},
+		{"label": _("Slowest Statement"), "fieldname": "slowest_sql", "fieldtype": "Code", "width": 300},
+	]
@@ -0,0 +1,243 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Stage lead-time histograms built from the Design Stage Log.
+
+When an item leaves a stage, the time it spent there (since the previous
+status change, or since the item was created) lands in one bucket of a
+histogram kept per (stage, company, designer, month). ``Design Stage
+Duration`` holds one row per bucket with its count, total and maximum, and
+``insert_stage_logs`` upserts them in the same transaction as the log rows,
+so reading a year of lead times sums a few hundred rows instead of walking
+the history. Percentiles are interpolated inside the bucket they fall in.
+
+The designer is the request's assignee and the month is the one the item left
+the stage in. Deleting an item leaves its past durations in place;
+``rebuild_stage_durations`` recomputes everything from the log.
+"""
+
+import hashlib
+from bisect import bisect_left
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, get_first_day, getdate, now_datetime
+
+from design_integration.design_integration.profiling import profile
+
+# upper bounds in hours; anything longer goes to the overflow bucket
+DURATION_BUCKETS = (1, 2, 4, 8, 16, 24, 48, 72, 120, 168, 240, 336, 504, 720, 1080, 1440, 2160)
+LEAD_TIME_GROUPS = ("company", "designer", "month")
+UPSERT_CHUNK = 1000
+
+
+def get_bucket(hours):
+	return bisect_left(DURATION_BUCKETS, hours)
+
+
+def add_duration(durations, stage, company, designer, exited, hours):
+	"""Accumulate one stay into ``{row key: [count, total hours, max hours]}``"""
+	hours = max(hours, 0)
+	key = (stage, company, designer, str(get_first_day(exited)), get_bucket(hours))
+	row = durations.setdefault(key, [0, 0.0, 0.0])
+	row[0] += 1
+	row[1] += hours
+	row[2] = max(row[2], hours)
+
+
+def record_stage_durations(logs):
+	"""Add the stays ended by ``logs`` (Design Stage Log docs not yet inserted)"""
+	logs = [log for log in logs if (log.from_status or "") != (log.to_status or "")]
+	if not logs:
+		return
+
+	items = {
+		row.name: row
+		for row in frappe.db.sql(
+			"""
+			SELECT di.name, di.creation, IFNULL(di.company, '') AS company,
+				IFNULL(dr.assigned_to, '') AS designer,
+				(SELECT MAX(l.transition_date) FROM `tabDesign Stage Log` l
+				WHERE l.design_request_item = di.name
+					AND IFNULL(l.from_status, '') != IFNULL(l.to_status, '')) AS entered
+			FROM `tabDesign Request Item` di
+			LEFT JOIN `tabDesign Request` dr ON dr.name = di.design_request
+			WHERE di.name IN %(items)s
+			""",
+			{"items": list({log.design_request_item for log in logs})},
+			as_dict=True,
+		)
+	}
+
+	durations = {}
+	for log in sorted(logs, key=lambda log: get_datetime(log.transition_date)):
+		item = items.get(log.design_request_item)
+		if not item:
+			continue
+		exited = get_datetime(log.transition_date)
+		entered = get_datetime(item.entered or item.creation)
+		add_duration(
+			durations,
+			log.from_status or "",
+			item.company,
+			item.designer,
+			exited,
+			(exited - entered).total_seconds() / 3600,
+		)
+		item.entered = exited
+
+	update_stage_durations(durations)
+
+
+def update_stage_durations(durations):
+	"""Upsert ``{row key: [count, total hours, max hours]}`` into the histogram rows"""
+	now, user = now_datetime(), frappe.session.user
+	values = [(_get_row_name(key), *key, *row, now, now, user, user) for key, row in durations.items()]
+
+	if frappe.db.db_type == "postgres":
+		conflict = """ON CONFLICT (name) DO UPDATE SET
+			item_count = `tabDesign Stage Duration`.item_count + EXCLUDED.item_count,
+			total_hours = `tabDesign Stage Duration`.total_hours + EXCLUDED.total_hours,
+			max_hours = GREATEST(`tabDesign Stage Duration`.max_hours, EXCLUDED.max_hours),
+			modified = EXCLUDED.modified"""
+	else:
+		conflict = """ON DUPLICATE KEY UPDATE
+			item_count = item_count + VALUES(item_count),
+			total_hours = total_hours + VALUES(total_hours),
+			max_hours = GREATEST(max_hours, VALUES(max_hours)),
+			modified = VALUES(modified)"""
+
+	for start in range(0, len(values), UPSERT_CHUNK):
+		chunk = values[start : start + UPSERT_CHUNK]
+		frappe.db.sql(
+			f"""INSERT INTO `tabDesign Stage Duration`
+				(name, stage, company, designer, month, bucket, item_count, total_hours, max_hours,
+				creation, modified, owner, modified_by)
+			VALUES {", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))}
+			{conflict}""",
+			[value for row in chunk for value in row],
+		)
+
+
+@frappe.whitelist()
+@profile
+def get_stage_lead_times(from_date=None, to_date=None, company=None, designer=None, group_by=None):
+	"""Lead time per stage (and ``group_by`` value) from the histogram rows.
+
+	Returns ``[{"stage", group_by, "count", "mean_hours", "p50_hours",
+	"p90_hours", "max_hours"}]`` in workflow order. Dates are matched by month.
+	"""
+	frappe.has_permission("Design Request Item", "read", throw=True)
+	if group_by and group_by not in LEAD_TIME_GROUPS:
+		frappe.throw(_("Cannot group lead times by {0}").format(group_by))
+
+	conditions, values = ["item_count > 0"], {}
+	if from_date:
+		conditions.append("month >= %(from_month)s")
+		values["from_month"] = get_first_day(getdate(from_date))
+	if to_date:
+		conditions.append("month <= %(to_month)s")
+		values["to_month"] = get_first_day(getdate(to_date))
+	for field, value in (("company", company), ("designer", designer)):
+		if value:
+			conditions.append(f"{field} = %({field})s")
+			values[field] = value
+
+	group = f"`{group_by}`" if group_by else "''"
+	rows = frappe.db.sql(
+		f"""SELECT stage, {group} AS group_value, bucket,
+			SUM(item_count) AS count, SUM(total_hours) AS total_hours, MAX(max_hours) AS max_hours
+		FROM `tabDesign Stage Duration`
+		WHERE {" AND ".join(conditions)}
+		GROUP BY stage, group_value, bucket
+		ORDER BY stage, group_value, bucket""",
+		values,
+		as_dict=True,
+	)
+
+	histograms = {}
+	for row in rows:
+		histograms.setdefault((row.stage, row.group_value), []).append(row)
+
+	stage_order = frappe.get_meta("Design Request Item").get_options("design_status").split("\n")
+	result = []
+	for (stage, group_value), buckets in sorted(
+		histograms.items(),
+		key=lambda entry: (_get_stage_rank(stage_order, entry[0][0]), str(entry[0][1])),
+	):
+		row = frappe._dict(stage=stage)
+		if group_by:
+			row[group_by] = group_value or None
+		row.update(summarize_histogram(buckets))
+		result.append(row)
+
+	return result
+
+
+def summarize_histogram(buckets):
+	"""count, mean, p50, p90 and max hours from ``[{bucket, count, total_hours, max_hours}]``"""
+	buckets = sorted(buckets, key=lambda row: row.bucket)
+	count = sum(int(row.count) for row in buckets)
+	max_hours = max(float(row.max_hours) for row in buckets)
+	return {
+		"count": count,
+		"mean_hours": round(sum(float(row.total_hours) for row in buckets) / count, 2),
+		"p50_hours": round(_get_percentile(buckets, count, 50, max_hours), 2),
+		"p90_hours": round(_get_percentile(buckets, count, 90, max_hours), 2),
+		"max_hours": round(max_hours, 2),
+	}
+
+
+def rebuild_stage_durations():
+	"""Recompute every histogram row from the Design Stage Log"""
+	durations = {}
+	with frappe.db.unbuffered_cursor():
+		for stage, exited, entered, company, designer in frappe.db.sql(
+			"""
+			SELECT IFNULL(l.from_status, ''), l.transition_date,
+				IFNULL(LAG(l.transition_date) OVER (
+					PARTITION BY l.design_request_item ORDER BY l.transition_date, l.creation
+				), di.creation),
+				IFNULL(di.company, ''), IFNULL(dr.assigned_to, '')
+			FROM `tabDesign Stage Log` l
+			INNER JOIN `tabDesign Request Item` di ON di.name = l.design_request_item
+			LEFT JOIN `tabDesign Request` dr ON dr.name = di.design_request
+			WHERE IFNULL(l.from_status, '') != IFNULL(l.to_status, '')
+			""",
+			as_iterator=True,
+		):
+			exited = get_datetime(exited)
+			add_duration(
+				durations,
+				stage,
+				company,
+				designer,
+				exited,
+				(exited - get_datetime(entered)).total_seconds() / 3600,
+			)
+
+	frappe.db.delete("Design Stage Duration")
+	update_stage_durations(durations)
+	frappe.db.commit()
+
+
+def _get_percentile(buckets, count, percent, max_hours):
+	"""Interpolate linearly inside the bucket holding the rank"""
+	rank = percent / 100 * count
+	seen = 0
+	for row in buckets:
+		if seen + int(row.count) >= rank:
+			lower = DURATION_BUCKETS[row.bucket - 1] if row.bucket else 0
+			upper = DURATION_BUCKETS[row.bucket] if row.bucket < len(DURATION_BUCKETS) else max_hours
+			value = lower + (upper - lower) * (rank - seen) / int(row.count)
+			return min(value, max_hours)
+		seen += int(row.count)
+	return max_hours
+
+
+def _get_stage_rank(stage_order, stage):
+	return stage_order.index(stage) if stage in stage_order else len(stage_order)
+
+
+def _get_row_name(key):
+	return hashlib.md5("\x1f".join(str(part) for part in key).encode()).hexdigest()
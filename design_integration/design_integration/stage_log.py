@@ -0,0 +1,163 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Append-only stage history of design items.
+
+Transitions used to be child rows of the item, so every ``get_doc`` of a
+heavily revised item loaded its whole history and cross-item timelines had
+to scan the child table. They now live in ``Design Stage Log`` rows indexed
+on (design_request_item, transition_date) and (design_request,
+transition_date), written with a plain INSERT and never updated.
+``get_stage_timeline`` turns them into status segments for Gantt and
+timeline views.
+"""
+
+from itertools import groupby
+
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+from design_integration.design_integration.bulk import bulk_insert_docs
+from design_integration.design_integration.profiling import profile
+from design_integration.design_integration.stage_durations import record_stage_durations
+
+STAGE_LOG_DOCTYPE = "Design Stage Log"
+STAGE_LOG_FIELDS = ["design_request_item", "to_status", "transition_date", "transitioned_by"]
+
+
+def make_stage_log(
+	design_request_item,
+	design_request,
+	from_status,
+	to_status,
+	stage="design_status",
+	remarks=None,
+	transition_date=None,
+	transitioned_by=None,
+):
+	"""Return a named, unsaved log entry ready for ``insert_stage_logs``"""
+	log = frappe.new_doc(STAGE_LOG_DOCTYPE)
+	log.update(
+		{
+			"name": frappe.generate_hash(length=10),
+			"design_request_item": design_request_item,
+			"design_request": design_request,
+			"stage": stage,
+			"from_status": from_status,
+			"to_status": to_status,
+			"transition_date": transition_date or now_datetime(),
+			"transitioned_by": transitioned_by or frappe.session.user,
+			"remarks": remarks or f"Status changed to {to_status}",
+		}
+	)
+	log.set_user_and_timestamp()
+	return log
+
+
+def insert_stage_logs(logs):
+	"""Write log entries and fold the stays they end into the lead-time histograms"""
+	record_stage_durations(logs)
+	bulk_insert_docs(logs)
+
+
+def delete_item_stage_log(doc, method=None):
+	"""on_trash hook on Design Request Item; the history goes with the item"""
+	frappe.db.delete(STAGE_LOG_DOCTYPE, {"design_request_item": doc.name})
+
+
+@frappe.whitelist()
+@profile
+def get_item_stage_log(design_request_item):
+	"""Full history of one item, newest first"""
+	frappe.has_permission("Design Request Item", "read", design_request_item, throw=True)
+	return frappe.get_all(
+		STAGE_LOG_DOCTYPE,
+		filters={"design_request_item": design_request_item},
+		fields=["stage", "from_status", "to_status", "transition_date", "transitioned_by", "remarks"],
+		order_by="transition_date desc, creation desc",
+	)
+
+
+@frappe.whitelist()
+@profile
+def get_stage_timeline(from_date, to_date, items=None, design_request=None):
+	"""Status segments overlapping ``[from_date, to_date)``, per design item.
+
+	Returns ``{item: [{"status", "start", "end", "transitioned_by"}]}`` in
+	time order; ``end`` is None when the segment is still open at
+	``to_date``. Without ``items`` or ``design_request`` only items with a
+	transition inside the range are included.
+	"""
+	frappe.has_permission("Design Request Item", "read", throw=True)
+	values = {
+		"from_date": get_datetime(from_date),
+		"to_date": get_datetime(to_date),
+		"items": frappe.parse_json(items) if items else None,
+		"design_request": design_request,
+	}
+
+	scope = []
+	if values["items"]:
+		scope.append("design_request_item IN %(items)s")
+	if design_request:
+		scope.append("design_request = %(design_request)s")
+
+	in_range = frappe.db.sql(
+		f"""
+		SELECT {", ".join(STAGE_LOG_FIELDS)}
+		FROM `tabDesign Stage Log`
+		WHERE transition_date >= %(from_date)s AND transition_date < %(to_date)s
+			{"".join(f" AND {condition}" for condition in scope)}
+		ORDER BY design_request_item, transition_date, creation
+		""",
+		values,
+		as_dict=True,
+	)
+
+	if not scope:
+		values["items"] = sorted({row.design_request_item for row in in_range})
+		if not values["items"]:
+			return {}
+		scope.append("design_request_item IN %(items)s")
+
+	# the status each item was already in when the range opened
+	opening = {
+		row.design_request_item: row
+		for row in frappe.db.sql(
+			f"""
+			SELECT {", ".join(f"log.{field}" for field in STAGE_LOG_FIELDS)}
+			FROM `tabDesign Stage Log` log
+			INNER JOIN (
+				SELECT design_request_item, MAX(transition_date) AS transition_date
+				FROM `tabDesign Stage Log`
+				WHERE transition_date < %(from_date)s AND {" AND ".join(scope)}
+				GROUP BY design_request_item
+			) latest ON latest.design_request_item = log.design_request_item
+				AND latest.transition_date = log.transition_date
+			ORDER BY log.creation
+			""",
+			values,
+			as_dict=True,
+		)
+	}
+
+	timeline = {}
+	for item, rows in groupby(in_range, key=lambda row: row.design_request_item):
+		timeline[item] = _make_segments([opening.pop(item, None), *rows], values["from_date"])
+	for item, row in opening.items():
+		timeline[item] = _make_segments([row], values["from_date"])
+
+	return timeline
+
+
+def _make_segments(rows, from_date):
+	rows = [row for row in rows if row]
+	return [
+		{
+			"status": row.to_status,
+			"start": max(get_datetime(row.transition_date), from_date),
+			"end": rows[i + 1].transition_date if i + 1 < len(rows) else None,
+			"transitioned_by": row.transitioned_by,
+		}
+		for i, row in enumerate(rows)
+	]
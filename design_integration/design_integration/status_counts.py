@@ -0,0 +1,140 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Running status counts behind the design charts.
+
+``Design Status Count`` holds one row per (doctype, status, approval status,
+company). Document hooks move a record between rows as deltas when its status
+changes, so a chart reads a handful of rows instead of grouping the whole
+table. ``reconcile_status_counts`` rebuilds the rows from scratch to repair
+any drift.
+"""
+
+import hashlib
+from collections import Counter
+
+import frappe
+from frappe.utils import now_datetime
+
+# doctype -> (status field, approval status field or None)
+COUNTED_FIELDS = {
+	"Design Request Item": ("design_status", "approval_status"),
+	"Design Request": ("status", None),
+}
+
+
+def get_status_key(doc, doctype=None):
+	"""(doctype, status, approval status, company) bucket for ``doc``"""
+	doctype = doctype or doc.doctype
+	status_field, approval_field = COUNTED_FIELDS[doctype]
+	return (
+		doctype,
+		doc.get(status_field) or "",
+		(doc.get(approval_field) if approval_field else None) or "",
+		doc.get("company") or "",
+	)
+
+
+def update_status_counts(deltas):
+	"""Apply ``{status key: delta}`` to the count rows with one upsert"""
+	deltas = {key: delta for key, delta in deltas.items() if delta}
+	if not deltas:
+		return
+
+	now, user = now_datetime(), frappe.session.user
+	values = [
+		(_get_row_name(key), *key, delta, now, now, user, user) for key, delta in deltas.items()
+	]
+	placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(values))
+	params = [value for row in values for value in row]
+
+	if frappe.db.db_type == "postgres":
+		conflict = """ON CONFLICT (name) DO UPDATE SET
+			record_count = `tabDesign Status Count`.record_count + EXCLUDED.record_count,
+			modified = EXCLUDED.modified"""
+	else:
+		conflict = """ON DUPLICATE KEY UPDATE
+			record_count = record_count + VALUES(record_count),
+			modified = VALUES(modified)"""
+
+	frappe.db.sql(
+		f"""INSERT INTO `tabDesign Status Count`
+			(name, reference_doctype, status, approval_status, company, record_count,
+			creation, modified, owner, modified_by)
+		VALUES {placeholders}
+		{conflict}""",
+		params,
+	)
+
+
+def get_status_counts(doctype, group_by="status"):
+	"""``[{group_by: value, count: n}]`` for ``doctype``, largest first"""
+	if group_by not in ("status", "approval_status", "company"):
+		frappe.throw(frappe._("Cannot group status counts by {0}").format(group_by))
+
+	rows = frappe.db.sql(
+		f"""SELECT `{group_by}` AS value, SUM(record_count) AS count
+		FROM `tabDesign Status Count`
+		WHERE reference_doctype = %s
+		GROUP BY `{group_by}`
+		HAVING SUM(record_count) > 0
+		ORDER BY count DESC""",
+		doctype,
+		as_dict=True,
+	)
+	# empty strings stand in for NULL in the count rows
+	return [frappe._dict({group_by: row.value or None, "count": int(row.count)}) for row in rows]
+
+
+def track_status_change(doc, method=None):
+	"""before_save hook: move ``doc`` from its old bucket to its new one.
+
+	Runs last before the row is written, so the new key is exactly what gets
+	stored; the delta shares the save's transaction and rolls back with it.
+	"""
+	new_key = get_status_key(doc)
+	previous = doc.get_doc_before_save()
+	old_key = get_status_key(previous) if previous else None
+
+	if old_key != new_key:
+		deltas = Counter({new_key: 1})
+		if old_key:
+			deltas[old_key] -= 1
+		update_status_counts(deltas)
+
+
+def track_status_delete(doc, method=None):
+	"""on_trash hook"""
+	update_status_counts({get_status_key(doc): -1})
+
+
+def reconcile_status_counts():
+	"""Rebuild every count row from the source tables"""
+	actual = Counter()
+	for doctype, (status_field, approval_field) in COUNTED_FIELDS.items():
+		approval = f"`{approval_field}`" if approval_field else "''"
+		for row in frappe.db.sql(
+			f"""SELECT IFNULL(`{status_field}`, '') AS status, IFNULL({approval}, '') AS approval_status,
+				IFNULL(company, '') AS company, COUNT(*) AS count
+			FROM `tab{doctype}`
+			GROUP BY 1, 2, 3""",
+			as_dict=True,
+		):
+			actual[(doctype, row.status, row.approval_status, row.company)] = int(row.count)
+
+	stored = {
+		(row.reference_doctype, row.status or "", row.approval_status or "", row.company or ""): row.record_count
+		for row in frappe.get_all(
+			"Design Status Count",
+			fields=["reference_doctype", "status", "approval_status", "company", "record_count"],
+		)
+	}
+
+	drift = {key: actual.get(key, 0) - stored.get(key, 0) for key in set(actual) | set(stored)}
+	update_status_counts(drift)
+	frappe.db.commit()
+
+
+def _get_row_name(key):
+	# company names alone can fill the 140 character name column
+	return hashlib.md5("\x1f".join(key).encode()).hexdigest()
@@ -0,0 +1,243 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Content-addressed storage for Design Version files.
+
+An upload is hashed (SHA-256) while it is copied to disk in CHUNK_SIZE
+pieces; large files arrive in resumable chunks through ``version_upload``
+and are hashed once complete. Each distinct content is kept once as a
+``Design Version Blob`` named after its hash, with a single private file and
+a single File record attached to the blob, so it is served by Frappe's
+private file handler to whoever may read the blob; blobs carry the same
+permissions as Design Version. Re-uploading identical content returns the
+existing blob and writes nothing.
+
+Design Versions point at a blob through ``version_blob`` (and keep its URL in
+``new_version_file``); the blob's ``ref_count`` counts them. Deleting a
+version only releases its reference. ``purge_unreferenced_blobs`` removes
+blobs nobody has referenced for PURGE_AFTER_HOURS, including uploads that
+never made it into a version.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now_datetime
+
+from design_integration.design_integration.files import make_private_file
+from design_integration.design_integration.profiling import profile
+
+BLOB_DOCTYPE = "Design Version Blob"
+BLOB_PREFIX = "design-version-"
+CHUNK_SIZE = 1024 * 1024
+PURGE_AFTER_HOURS = 24
+
+
+@frappe.whitelist()
+@profile
+def upload_version_file():
+	"""Store the uploaded ``file`` and return its blob (``name``, ``file_url``, ...).
+
+	Works both as a direct multipart POST and as the ``method`` of Frappe's
+	``upload_file`` (which has already read the content into memory).
+	"""
+	if not frappe.has_permission("Design Version", "create"):
+		frappe.throw(_("Not permitted to upload design versions"), frappe.PermissionError)
+
+	if getattr(frappe.local, "uploaded_file", None) is not None:
+		stream, file_name = io.BytesIO(frappe.local.uploaded_file), frappe.local.uploaded_filename
+	elif frappe.request and frappe.request.files.get("file"):
+		uploaded = frappe.request.files["file"]
+		stream, file_name = uploaded.stream, uploaded.filename
+	else:
+		frappe.throw(_("No file was uploaded"))
+
+	return store_stream(stream, file_name)
+
+
+def store_stream(stream, file_name):
+	"""Hash and store ``stream``; returns the (possibly existing) blob as a dict"""
+	digest = hashlib.sha256()
+	size = 0
+	temp_path = get_blob_path(f".{BLOB_PREFIX}{frappe.generate_hash(length=12)}.part")
+
+	try:
+		with open(temp_path, "wb") as f:
+			while chunk := stream.read(CHUNK_SIZE):
+				digest.update(chunk)
+				f.write(chunk)
+				size += len(chunk)
+
+		return store_file(temp_path, file_name, digest.hexdigest(), size)
+
+	finally:
+		if os.path.exists(temp_path):
+			os.remove(temp_path)
+
+
+def store_file(path, file_name, content_hash, size):
+	"""Register the complete file at ``path`` as a blob; returns the blob as a dict.
+
+	The content is hard-linked into the store, so ``path`` is left for the
+	caller to remove. A file placed here is removed again if the transaction
+	rolls back.
+	"""
+	blob = get_blob(content_hash)
+	if not blob:
+		stored_name = f"{BLOB_PREFIX}{content_hash}{os.path.splitext(file_name or '')[1].lower()}"
+		blob = insert_blob(content_hash, file_name or stored_name, stored_name, size)
+
+	# the row may have survived its file; put the content back
+	target = get_blob_path(blob.file_url)
+	if not os.path.exists(target):
+		try:
+			os.link(path, target)
+		except FileExistsError:
+			# placed by a concurrent upload of the same content
+			return blob
+		except OSError:
+			shutil.copyfile(path, target)
+		frappe.db.after_rollback.add(lambda: os.path.exists(target) and os.remove(target))
+
+	return blob
+
+
+def hash_file(path):
+	digest = hashlib.sha256()
+	with open(path, "rb") as f:
+		while chunk := f.read(CHUNK_SIZE):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def insert_blob(content_hash, file_name, stored_name, size):
+	"""Register a stored file; a concurrent upload of the same content may win the insert"""
+	now, user = now_datetime(), frappe.session.user
+	file_url = f"/private/files/{stored_name}"
+
+	blob = frappe.new_doc(BLOB_DOCTYPE)
+	blob.update(
+		{
+			"name": content_hash,
+			"file_name": file_name,
+			"file_url": file_url,
+			"file_size": size,
+			"ref_count": 0,
+		}
+	)
+	file_doc = make_private_file(stored_name, BLOB_DOCTYPE, content_hash, size)
+
+	frappe.db.savepoint("design_version_blob")
+	try:
+		for doc in (blob, file_doc):
+			doc.creation = doc.modified = now
+			doc.owner = doc.modified_by = user
+			# File's own hooks would read the content back and may write a second copy
+			doc.db_insert()
+	except frappe.DuplicateEntryError:
+		frappe.db.rollback(save_point="design_version_blob")
+		# a locking read sees the row the other transaction committed
+		return get_blob(content_hash, for_update=True)
+
+	return get_blob(content_hash)
+
+
+def get_blob(content_hash, for_update=False):
+	return frappe.db.get_value(
+		BLOB_DOCTYPE,
+		content_hash,
+		["name", "file_name", "file_url", "file_size", "ref_count"],
+		as_dict=True,
+		for_update=for_update,
+	)
+
+
+def get_blob_name(file_url):
+	return frappe.db.get_value(BLOB_DOCTYPE, {"file_url": file_url}) if file_url else None
+
+
+def get_blob_path(file_name_or_url):
+	return frappe.get_site_path("private", "files", os.path.basename(file_name_or_url))
+
+
+def update_blob_references(old_blob=None, new_blob=None):
+	"""Move one reference from ``old_blob`` to ``new_blob``"""
+	if old_blob == new_blob:
+		return
+	if new_blob:
+		frappe.db.sql(
+			"UPDATE `tabDesign Version Blob` SET ref_count = ref_count + 1, modified = %s WHERE name = %s",
+			(now_datetime(), new_blob),
+		)
+	if old_blob:
+		frappe.db.sql(
+			"""UPDATE `tabDesign Version Blob`
+			SET ref_count = GREATEST(ref_count - 1, 0), modified = %s WHERE name = %s""",
+			(now_datetime(), old_blob),
+		)
+
+
+def purge_unreferenced_blobs():
+	"""Daily: delete blobs (and their file and preview) left without references"""
+	from design_integration.design_integration.previews import delete_preview
+
+	cutoff = add_to_date(now_datetime(), hours=-PURGE_AFTER_HOURS)
+	for blob in frappe.db.sql(
+		"""SELECT name, file_url FROM `tabDesign Version Blob` b
+		WHERE ref_count <= 0 AND modified < %s
+			AND NOT EXISTS (SELECT 1 FROM `tabDesign Version` v WHERE v.version_blob = b.name)
+		FOR UPDATE SKIP LOCKED""",
+		cutoff,
+		as_dict=True,
+	):
+		frappe.db.delete("File", {"attached_to_doctype": BLOB_DOCTYPE, "attached_to_name": blob.name})
+		frappe.db.delete(BLOB_DOCTYPE, blob.name)
+		delete_preview(blob.name)
+		# another File may have been pointed at the same URL by hand
+		if not frappe.db.exists("File", {"file_url": blob.file_url}) and os.path.exists(
+			get_blob_path(blob.file_url)
+		):
+			os.remove(get_blob_path(blob.file_url))
+
+	frappe.db.commit()
+
+
+def import_version_file(version):
+	"""Move a Design Version's plain attachment into the store; returns the blob name or None"""
+	old_url = version.new_version_file
+	if not old_url or version.version_blob or not old_url.startswith(("/private/files/", "/files/")):
+		return None
+
+	is_private = old_url.startswith("/private/")
+	old_path = frappe.get_site_path(
+		"private" if is_private else "public", "files", old_url.split("/files/", 1)[1]
+	)
+	if not os.path.exists(old_path):
+		return None
+
+	with open(old_path, "rb") as f:
+		blob = store_stream(f, os.path.basename(old_path))
+
+	frappe.db.set_value(
+		"Design Version",
+		version.name,
+		{"new_version_file": blob.file_url, "version_blob": blob.name},
+		update_modified=False,
+	)
+	update_blob_references(None, blob.name)
+
+	# drop the old copy once nothing else points at it
+	if not frappe.db.exists("Design Version", {"new_version_file": old_url}):
+		frappe.db.sql(
+			"""DELETE FROM `tabFile`
+			WHERE file_url = %s AND IFNULL(attached_to_doctype, '') IN ('', 'Design Version')""",
+			old_url,
+		)
+		if not frappe.db.exists("File", {"file_url": old_url}):
+			os.remove(old_path)
+
+	return blob.name
@@ -0,0 +1,209 @@
+# Copyright (c) 2026, Axelgear and contributors
+# For license information, please see license.txt
+
+"""Chunked, resumable uploads of large Design Version files.
+
+``start_version_upload`` opens a session; the client then posts the file in
+UPLOAD_CHUNK_SIZE pieces to ``upload_version_chunk`` (multipart field
+``chunk``, which werkzeug spools to a temporary file) and each piece is
+appended to a part file under ``private/design_version_uploads``. A worker
+only ever holds one chunk, whatever the size of the file.
+
+The part file is the source of truth for progress: ``get_version_upload``
+returns how many bytes arrived, and a chunk may be resent from any offset up
+to that. Chunks can carry a SHA-256 that is checked before they are kept.
+``complete_version_upload`` hashes the whole file and checks it against the
+checksum given at the start or at completion (the browser hashes the file as
+it sends it, so it only knows it at the end). It then stores the file in the
+version store and inserts the Design Version in the same transaction; if the
+insert fails nothing is kept and the upload can be completed again. Sessions
+expire after UPLOAD_TTL.
+"""
+
+import fcntl
+import hashlib
+import os
+import time
+
+import frappe
+from frappe import _
+
+from design_integration.design_integration.profiling import profile
+from design_integration.design_integration.version_store import CHUNK_SIZE, hash_file, store_file
+
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_TTL = 24 * 60 * 60
+UPLOAD_DIR = "design_version_uploads"
+
+
+@frappe.whitelist(methods=["POST"])
+@profile
+def start_version_upload(design_request_item, file_name, file_size, checksum=None):
+	"""Open an upload session; returns ``{upload_id, chunk_size, received}``"""
+	if not frappe.has_permission("Design Version", "create"):
+		frappe.throw(_("Not permitted to upload design versions"), frappe.PermissionError)
+	frappe.has_permission("Design Request Item", "read", design_request_item, throw=True)
+
+	file_size = int(file_size)
+	if file_size <= 0:
+		frappe.throw(_("Cannot upload an empty file"))
+
+	upload_id = frappe.generate_hash(length=20)
+	session = frappe._dict(
+		upload_id=upload_id,
+		user=frappe.session.user,
+		design_request_item=design_request_item,
+		file_name=os.path.basename(file_name),
+		file_size=file_size,
+		checksum=checksum.lower() if checksum else None,
+	)
+	os.makedirs(frappe.get_site_path("private", UPLOAD_DIR), exist_ok=True)
+	open(get_part_path(upload_id), "wb").close()
+	_save_session(session)
+
+	return {"upload_id": upload_id, "chunk_size": UPLOAD_CHUNK_SIZE, "received": 0}
+
+
+@frappe.whitelist()
+@profile
+def get_version_upload(upload_id):
+	"""Progress of an upload, to resume it; returns None once it has expired"""
+	session = get_upload_session(upload_id, throw=False)
+	if not session:
+		return None
+	return {
+		"upload_id": upload_id,
+		"chunk_size": UPLOAD_CHUNK_SIZE,
+		"file_size": session.file_size,
+		"received": os.path.getsize(get_part_path(upload_id)),
+	}
+
+
+@frappe.whitelist(methods=["POST"])
+@profile
+def upload_version_chunk(upload_id, offset, chunk_checksum=None):
+	"""Write the posted ``chunk`` at ``offset``; returns ``{received}``"""
+	session = get_upload_session(upload_id)
+	chunk = frappe.request.files.get("chunk") if frappe.request else None
+	if not chunk:
+		frappe.throw(_("No chunk was uploaded"))
+
+	offset = int(offset)
+	with open(get_part_path(upload_id), "r+b") as f:
+		try:
+			fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except BlockingIOError:
+			frappe.throw(_("Another chunk of this upload is being written"))
+
+		received = os.fstat(f.fileno()).st_size
+		if offset > received:
+			frappe.throw(_("Chunk starts at {0} but only {1} bytes were received").format(offset, received))
+
+		# anything past the offset is a partial chunk being resent
+		f.seek(offset)
+		f.truncate()
+		digest = hashlib.sha256()
+		while data := chunk.stream.read(CHUNK_SIZE):
+			digest.update(data)
+			f.write(data)
+
+		if f.tell() > session.file_size:
+			f.truncate(offset)
+			frappe.throw(_("Upload is larger than the {0} bytes announced").format(session.file_size))
+		if chunk_checksum and digest.hexdigest() != chunk_checksum.lower():
+			f.truncate(offset)
+			frappe.throw(_("Chunk at {0} does not match its checksum, please resend it").format(offset))
+
+		received = f.tell()
+
+	_save_session(session)
+	return {"received": received}
+
+
+@frappe.whitelist(methods=["POST"])
+@profile
+def complete_version_upload(upload_id, version=None, checksum=None):
+	"""Store the finished file and insert the Design Version described by ``version``"""
+	session = get_upload_session(upload_id)
+	path = get_part_path(upload_id)
+
+	with open(path, "rb") as f:
+		try:
+			fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except BlockingIOError:
+			frappe.throw(_("This upload is already being completed"))
+
+		size = os.fstat(f.fileno()).st_size
+		if size != session.file_size:
+			frappe.throw(_("Upload is incomplete: {0} of {1} bytes received").format(size, session.file_size))
+
+		content_hash = hash_file(path)
+		if {value.lower() for value in (session.checksum, checksum) if value} - {content_hash}:
+			discard_version_upload(upload_id)
+			frappe.throw(_("Uploaded file does not match its checksum, please upload it again"))
+
+		blob = store_file(path, session.file_name, content_hash, size)
+		version_doc = frappe.get_doc(
+			{
+				**(frappe.parse_json(version) if version else {}),
+				"doctype": "Design Version",
+				"design_request_item": session.design_request_item,
+				"new_version_file": blob.file_url,
+			}
+		).insert()
+
+	# keep the part until the version is committed, so a failed insert can be retried
+	frappe.db.after_commit.add(lambda: discard_version_upload(upload_id))
+	return version_doc.as_dict()
+
+
+@frappe.whitelist(methods=["POST"])
+def cancel_version_upload(upload_id):
+	get_upload_session(upload_id)
+	discard_version_upload(upload_id)
+
+
+def get_upload_session(upload_id, throw=True):
+	session = frappe.cache().get_value(_get_session_key(upload_id))
+	if (
+		not session
+		or session.get("user") != frappe.session.user
+		or not os.path.exists(get_part_path(upload_id))
+	):
+		if throw:
+			frappe.throw(
+				_("Upload {0} has expired, please start again").format(upload_id), frappe.DoesNotExistError
+			)
+		return None
+	return frappe._dict(session)
+
+
+def get_part_path(upload_id):
+	return frappe.get_site_path("private", UPLOAD_DIR, f"{os.path.basename(upload_id)}.part")
+
+
+def discard_version_upload(upload_id):
+	frappe.cache().delete_value(_get_session_key(upload_id))
+	if os.path.exists(get_part_path(upload_id)):
+		os.remove(get_part_path(upload_id))
+
+
+def purge_stale_uploads():
+	"""Daily: remove part files of sessions that expired"""
+	upload_dir = frappe.get_site_path("private", UPLOAD_DIR)
+	if not os.path.isdir(upload_dir):
+		return
+
+	cutoff = time.time() - UPLOAD_TTL
+	for entry in os.scandir(upload_dir):
+		if entry.name.endswith(".part") and entry.stat().st_mtime < cutoff:
+			os.remove(entry.path)
+
+
+def _save_session(session):
+	# written on every chunk so an active upload never expires
+	frappe.cache().set_value(_get_session_key(session.upload_id), session, expires_in_sec=UPLOAD_TTL)
+
+
+def _get_session_key(upload_id):
+	return f"design_version_upload::{upload_id}"
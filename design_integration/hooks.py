@@ -16,6 +16,9 @@ app_license = "mit"
 # Include JS files
 app_include_js = [
 	"/assets/design_integration/js/design_integration.js",
+	"/assets/design_integration/js/design_columnar.js",
+	"/assets/design_integration/js/design_board_store.js",
+	"/assets/design_integration/js/design_version_upload.js",
 	"/assets/design_integration/js/design_tasks_page.js",
 	"/assets/design_integration/js/design_request_item_form.js"
 ]
@@ -37,15 +40,61 @@ doc_events = {
 	# "Sales Order": {
 	# 	"on_submit": "design_integration.design_integration.doctype.design_request.design_request.on_sales_order_submit"
 	# }
+	"Item": {
+		"on_update": "design_integration.design_integration.item_cache.clear_item_cache",
+		"on_trash": "design_integration.design_integration.item_cache.clear_item_cache",
+		"after_rename": "design_integration.design_integration.item_cache.clear_item_cache"
+	},
+	"Design Request": {
+		"before_save": "design_integration.design_integration.status_counts.track_status_change",
+		"on_update": [
+			"design_integration.design_integration.dashboard.clear_design_stats_cache",
+			"design_integration.design_integration.board_events.publish_request_change"
+		],
+		"on_trash": [
+			"design_integration.design_integration.dashboard.clear_design_stats_cache",
+			"design_integration.design_integration.status_counts.track_status_delete"
+		]
+	},
+	"Design Request Item": {
+		"before_save": [
+			"design_integration.design_integration.status_counts.track_status_change",
+			"design_integration.design_integration.completion.track_open_items"
+		],
+		"on_update": [
+			"design_integration.design_integration.dashboard.clear_design_stats_cache",
+			"design_integration.design_integration.board_events.publish_item_change"
+		],
+		"on_trash": [
+			"design_integration.design_integration.dashboard.clear_design_stats_cache",
+			"design_integration.design_integration.status_counts.track_status_delete",
+			"design_integration.design_integration.completion.track_open_item_delete",
+			"design_integration.design_integration.stage_log.delete_item_stage_log",
+			"design_integration.design_integration.board_events.publish_item_delete"
+		]
+	}
 }
 
 # Scheduler Events
 scheduler_events = {
+	"all": [
+		"design_integration.design_integration.outbox.deliver_notifications"
+	],
+	"hourly": [
+		"design_integration.design_integration.status_counts.reconcile_status_counts",
+		"design_integration.design_integration.completion.reconcile_open_items",
+		"design_integration.design_integration.previews.requeue_stale_previews"
+	],
 	"daily": [
-		"design_integration.design_integration.doctype.design_request.design_request.check_overdue_items"
+		"design_integration.design_integration.doctype.design_request.design_request.check_overdue_items",
+		"design_integration.design_integration.version_store.purge_unreferenced_blobs",
+		"design_integration.design_integration.version_upload.purge_stale_uploads"
 	]
 }
 
+# Request Events
+after_request = ["design_integration.design_integration.profiling.add_timing_header"]
+
 # Fixtures
 fixtures = [
 	{
@@ -0,0 +1,5 @@
+from design_integration.design_integration.indexes import add_design_indexes
+
+
+def execute():
+	add_design_indexes()
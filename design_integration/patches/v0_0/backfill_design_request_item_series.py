@@ -0,0 +1,22 @@
+import frappe
+
+from design_integration.design_integration.naming import (
+	DESIGN_REQUEST_ITEM_SERIES,
+	ensure_sequence_at_least,
+)
+
+
+def execute():
+	"""Seed the Design Request Item counter from the highest existing DES-IT number"""
+	highest = 0
+
+	for name in frappe.get_all(
+		"Design Request Item", filters={"name": ["like", f"{DESIGN_REQUEST_ITEM_SERIES}%"]}, pluck="name"
+	):
+		suffix = name[len(DESIGN_REQUEST_ITEM_SERIES) :]
+		# names that were not generated by the series are left alone
+		if suffix.isdigit():
+			highest = max(highest, int(suffix))
+
+	if highest:
+		ensure_sequence_at_least(DESIGN_REQUEST_ITEM_SERIES, highest)
@@ -0,0 +1,5 @@
+from design_integration.design_integration.completion import reconcile_open_items
+
+
+def execute():
+	reconcile_open_items()
@@ -0,0 +1,23 @@
+import frappe
+
+from design_integration.design_integration.naming import (
+	ensure_sequence_at_least,
+	get_design_request_series_key,
+)
+
+
+def execute():
+	"""Seed the per sales order Design Request counters from existing names"""
+	max_suffix = {}
+
+	for row in frappe.get_all("Design Request", filters={"sales_order": ["is", "set"]}, fields=["name", "sales_order"]):
+		if not row.name.startswith(f"{row.sales_order}-"):
+			continue
+		try:
+			suffix = int(row.name.rsplit("-", 1)[-1])
+		except ValueError:
+			continue
+		max_suffix[row.sales_order] = max(max_suffix.get(row.sales_order, 0), suffix)
+
+	for sales_order, suffix in max_suffix.items():
+		ensure_sequence_at_least(get_design_request_series_key(sales_order), suffix)
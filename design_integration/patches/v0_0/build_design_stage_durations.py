@@ -0,0 +1,5 @@
+from design_integration.design_integration.stage_durations import rebuild_stage_durations
+
+
+def execute():
+	rebuild_stage_durations()
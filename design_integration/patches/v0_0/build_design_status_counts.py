@@ -0,0 +1,5 @@
+from design_integration.design_integration.status_counts import reconcile_status_counts
+
+
+def execute():
+	reconcile_status_counts()
@@ -0,0 +1,33 @@
+import frappe
+
+from design_integration.design_integration.version_store import import_version_file
+
+VERSION_BATCH = 500
+
+
+def execute():
+	"""Move existing Design Version attachments into the deduplicating version store.
+
+	Versions whose file is missing or lives outside the site's files folder are
+	left as they are.
+	"""
+	last_name = ""
+	while True:
+		versions = frappe.get_all(
+			"Design Version",
+			filters={
+				"name": (">", last_name),
+				"new_version_file": ("is", "set"),
+				"version_blob": ("is", "not set"),
+			},
+			fields=["name", "new_version_file", "version_blob"],
+			order_by="name",
+			limit=VERSION_BATCH,
+		)
+		if not versions:
+			break
+
+		for version in versions:
+			import_version_file(version)
+		last_name = versions[-1].name
+		frappe.db.commit()
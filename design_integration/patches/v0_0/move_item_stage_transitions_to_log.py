@@ -0,0 +1,47 @@
+import frappe
+
+ITEM_BATCH = 5000
+
+
+def execute():
+	"""Copy the Design Request Item stage transition child rows into Design Stage Log, then drop them.
+
+	Rows are moved in batches of items so no single transaction grows with the
+	size of the history.
+	"""
+	while True:
+		parents = frappe.db.sql_list(
+			"""
+			SELECT DISTINCT parent FROM `tabDesign Item Stage Transition`
+			WHERE parenttype = 'Design Request Item'
+			LIMIT %s
+			""",
+			ITEM_BATCH,
+		)
+		if not parents:
+			break
+
+		frappe.db.sql(
+			"""
+			INSERT INTO `tabDesign Stage Log`
+				(name, creation, modified, modified_by, owner, docstatus, idx,
+				design_request_item, design_request, stage, from_status, to_status,
+				transition_date, transitioned_by, remarks)
+			SELECT
+				t.name, t.creation, t.modified, t.modified_by, t.owner, 0, 0,
+				t.parent, di.design_request, t.stage, t.from_status, t.to_status,
+				IFNULL(t.transition_date, t.creation), t.transitioned_by, t.remarks
+			FROM `tabDesign Item Stage Transition` t
+			LEFT JOIN `tabDesign Request Item` di ON di.name = t.parent
+			WHERE t.parenttype = 'Design Request Item' AND t.parent IN %(parents)s
+			""",
+			{"parents": parents},
+		)
+		frappe.db.sql(
+			"""
+			DELETE FROM `tabDesign Item Stage Transition`
+			WHERE parenttype = 'Design Request Item' AND parent IN %(parents)s
+			""",
+			{"parents": parents},
+		)
+		frappe.db.commit()
@@ -0,0 +1,6 @@
+from design_integration.design_integration.previews import queue_missing_previews
+
+
+def execute():
+	"""Render previews of the files uploaded before the preview pipeline existed"""
+	queue_missing_previews()
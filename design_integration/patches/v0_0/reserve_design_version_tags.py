@@ -0,0 +1,72 @@
+import frappe
+
+from design_integration.design_integration.naming import (
+	ensure_sequence_at_least,
+	get_version_tag_key,
+	make_version_tag,
+	parse_version_tag,
+)
+
+
+def execute():
+	"""Seed the version tag counters and re-tag clashing versions.
+
+	The oldest version keeps a tag that was handed out twice; the others (and
+	versions without a tag) get the next free tag of their item. Runs before
+	the model sync, where Design Version's on_doctype_update adds the unique
+	(design_request_item, version_tag) index that needs the tags to be unique.
+	"""
+	highest = {}
+	for row in frappe.get_all(
+		"Design Version",
+		filters={"design_request_item": ["is", "set"], "version_tag": ["is", "set"]},
+		fields=["design_request_item", "version_tag"],
+	):
+		# tags were free text; "v2 " counts as V2, as the index sees it
+		parsed = parse_version_tag(row.version_tag.strip().upper())
+		if parsed:
+			counter = (row.design_request_item, parsed[0])
+			highest[counter] = max(highest.get(counter, 0), parsed[1])
+
+	for (design_request_item, revision_count), sequence in highest.items():
+		ensure_sequence_at_least(get_version_tag_key(design_request_item, revision_count), sequence)
+
+	for row in get_versions_to_retag():
+		frappe.db.set_value(
+			"Design Version",
+			row.name,
+			"version_tag",
+			make_version_tag(row.design_request_item),
+			update_modified=False,
+		)
+
+	frappe.db.commit()
+
+
+def get_versions_to_retag():
+	"""Versions without a tag, and all but the oldest version of every clashing tag.
+
+	Clashes are found in SQL so they are the ones the unique index will see:
+	MariaDB compares tags with the column collation, which ignores case and
+	trailing spaces ("V1" and "v1 " clash).
+	"""
+	retag = frappe.get_all(
+		"Design Version",
+		filters={"design_request_item": ["is", "set"], "version_tag": ["is", "not set"]},
+		fields=["name", "design_request_item"],
+		order_by="creation asc",
+	)
+	for design_request_item, version_tag in frappe.db.sql(
+		"""SELECT design_request_item, version_tag FROM `tabDesign Version`
+		WHERE IFNULL(design_request_item, '') != '' AND IFNULL(version_tag, '') != ''
+		GROUP BY design_request_item, version_tag
+		HAVING COUNT(*) > 1"""
+	):
+		retag += frappe.db.sql(
+			"""SELECT name, design_request_item FROM `tabDesign Version`
+			WHERE design_request_item = %s AND version_tag = %s
+			ORDER BY creation ASC, name ASC""",
+			(design_request_item, version_tag),
+			as_dict=True,
+		)[1:]
+	return retag
@@ -7,6 +7,15 @@ class FrappeDashboardIntegration {
         this.csrfToken = this.getCSRFToken();
         this.currentUser = frappe.session.user;
         this.dashboardData = null;
+        this.pageLength = 100;
+        this.nextCursor = null;
+        this.itemsFilters = {};
+        this.totalItems = 0;
+        // Applies design_board_patch events to dashboardData.items in place
+        this.boardStore = new design_integration.DesignBoardStore({
+            on_change: () => this.updateItemsList()
+        });
+        this.boardStore.subscribe();
     }
 
     getCSRFToken() {
@@ -37,6 +46,7 @@ class FrappeDashboardIntegration {
                 activities,
                 chartData
             };
+            this.boardStore.set_rows(items);
             
             this.updateDashboard();
             
@@ -70,21 +80,42 @@ class FrappeDashboardIntegration {
         }
     }
 
-    async loadDesignItems(filters = {}) {
+    async loadDesignItems(filters = {}, cursor = null) {
         try {
             const response = await frappe.call({
-                method: 'design_integration.design_integration.doctype.design_request.design_request.get_all_design_items',
-                args: { filters },
-                callback: (r) => r.message
+                method: 'design_integration.design_integration.doctype.design_request.design_request.get_design_items_page',
+                args: {
+                    filters,
+                    cursor,
+                    page_length: this.pageLength,
+                    format: 'columnar'
+                }
             });
-            
-            return response || [];
+            const page = response && response.message;
+            if (!page) return [];
+
+            // Remember where the next page starts so loadMoreItems can continue from it
+            this.itemsFilters = filters;
+            this.nextCursor = page.next_cursor;
+            if (page.total_count !== null && page.total_count !== undefined) {
+                this.totalItems = page.total_count;
+            }
+
+            return design_integration.decode_columnar(page.items) || [];
         } catch (error) {
             console.error('Failed to load design items:', error);
             return [];
         }
     }
 
+    async loadMoreItems() {
+        if (!this.nextCursor || !this.dashboardData) return;
+
+        const items = await this.loadDesignItems(this.itemsFilters, this.nextCursor);
+        this.boardStore.add_rows(items);
+        this.updateItemsList();
+    }
+
     async loadRecentActivities(limit = 10) {
         try {
             // Get recent comments and status changes
@@ -165,10 +196,19 @@ class FrappeDashboardIntegration {
                 callback: (r) => r.message
             });
             
+            // Stage lead times, read from the pre-aggregated histograms
+            const leadTimes = await frappe.call({
+                method: 'design_integration.design_integration.stage_durations.get_stage_lead_times',
+                args: {
+                    from_date: frappe.datetime.add_months(frappe.datetime.get_today(), -11)
+                }
+            });
+            
             return {
                 status: statusData || [],
                 priority: priorityData || [],
-                weeklyProgress: weeklyProgress || []
+                weeklyProgress: weeklyProgress || [],
+                leadTimes: (leadTimes && leadTimes.message) || []
             };
         } catch (error) {
             console.error('Failed to load chart data:', error);
@@ -228,6 +268,15 @@ class FrappeDashboardIntegration {
             priorityChart.update();
         }
         
+        // Update stage lead time chart
+        if (window.charts && window.charts.leadTimeChart) {
+            const leadTimeChart = window.charts.leadTimeChart;
+            leadTimeChart.data.labels = chartData.leadTimes.map(row => row.stage);
+            leadTimeChart.data.datasets[0].data = chartData.leadTimes.map(row => row.p50_hours);
+            leadTimeChart.data.datasets[1].data = chartData.leadTimes.map(row => row.p90_hours);
+            leadTimeChart.update();
+        }
+        
         // Update progress chart
         if (window.charts && window.charts.progressChart) {
             const progressChart = window.charts.progressChart;
@@ -291,6 +340,16 @@ class FrappeDashboardIntegration {
                 </div>
             `;
         });
+
+        if (this.nextCursor) {
+            html += `
+                <div class="text-center mt-2">
+                    <button class="btn btn-outline-secondary btn-sm" onclick="frappeIntegration.loadMoreItems()">
+                        Load more (${items.length} of ${this.totalItems})
+                    </button>
+                </div>
+            `;
+        }
         
         container.innerHTML = html;
     }
@@ -418,20 +477,20 @@ class FrappeDashboardIntegration {
             const response = await frappe.call({
                 method: 'design_integration.design_integration.doctype.design_request_item.design_request_item.update_design_status',
                 args: {
-                    item_id: itemId,
+                    docname: itemId,
                     new_status: newStatus
-                },
-                callback: (r) => r.message
+                }
             });
             
-            if (response && response.success) {
+            if (response && response.message && response.message.success) {
                 frappe.show_alert({
                     message: 'Item status updated successfully',
                     indicator: 'green'
                 });
                 
-                // Refresh dashboard data
-                this.loadDashboardData();
+                // The item row is patched by the design_board_patch event; only the counters are re-read
+                this.dashboardData.stats = await this.loadStatistics();
+                this.updateStatistics();
             } else {
                 frappe.show_alert({
                     message: 'Failed to update item status',
@@ -521,7 +580,8 @@ class FrappeDashboardIntegration {
         return {
             status: [],
             priority: [],
-            weeklyProgress: []
+            weeklyProgress: [],
+            leadTimes: []
         };
     }
 
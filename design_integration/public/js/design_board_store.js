@@ -0,0 +1,114 @@
+// Copyright (c) 2026, Axelgear and contributors
+// For license information, please see license.txt
+
+// Keeps the rows of a design board in step with the design_board_patch
+// realtime events published by board_events.py, so a change made anywhere is
+// applied in place instead of re-fetching the whole list. Patches only name
+// the changed columns; the rows are re-read through get_design_item_rows,
+// which leaves out items the user is not permitted to see.
+//
+//     let store = new design_integration.DesignBoardStore({
+//         on_change: (rows, removed) => redraw(rows, removed),
+//     });
+//     store.set_rows(page.items);
+//     store.subscribe();
+frappe.provide("design_integration");
+
+design_integration.DesignBoardStore = class DesignBoardStore {
+    constructor({ on_change, on_insert } = {}) {
+        this.rows = [];
+        this.by_item = new Map();
+        this.on_change = on_change || (() => {});
+        this.on_insert = on_insert || (() => {});
+        this.handler = (data) => this.apply(data.patches || []);
+    }
+
+    set_rows(rows) {
+        this.rows = rows;
+        this.by_item = new Map(rows.map((row) => [row.item_id, row]));
+    }
+
+    add_rows(rows) {
+        rows.forEach((row) => {
+            if (!this.by_item.has(row.item_id)) {
+                this.rows.push(row);
+                this.by_item.set(row.item_id, row);
+            }
+        });
+    }
+
+    subscribe() {
+        if (!frappe.realtime || this.subscribed) return;
+        frappe.realtime.doctype_subscribe("Design Request Item");
+        frappe.realtime.on("design_board_patch", this.handler);
+        this.subscribed = true;
+    }
+
+    unsubscribe() {
+        if (!this.subscribed) return;
+        frappe.realtime.off("design_board_patch", this.handler);
+        frappe.realtime.doctype_unsubscribe("Design Request Item");
+        this.subscribed = false;
+    }
+
+    apply(patches) {
+        let stale = new Set();
+        let fields = new Set();
+        let removed = [];
+
+        patches.forEach((patch) => {
+            if (patch.op === "insert") {
+                // new items lack the request columns; let the board decide whether to fetch them
+                this.on_insert(patch.name);
+            } else if (patch.op === "delete") {
+                let row = this.remove(patch.name);
+                if (row) {
+                    stale.delete(row);
+                    removed.push(row);
+                }
+            } else {
+                this.rows.forEach((row) => {
+                    if (row[patch.key] === patch.name) stale.add(row);
+                });
+                (patch.fields || []).forEach((field) => fields.add(field));
+            }
+        });
+
+        if (!stale.size) {
+            if (removed.length) this.on_change([], removed);
+            return;
+        }
+
+        let names = [...stale].map((row) => row.item_id);
+        frappe.xcall(
+            "design_integration.design_integration.doctype.design_request.design_request.get_design_item_rows",
+            { names, fields: [...fields] }
+        ).then((fresh) => {
+            let changed = [];
+            let by_name = new Map((fresh || []).map((values) => [values.item_id, values]));
+            names.forEach((name) => {
+                let row = this.by_item.get(name);
+                if (!row) return;
+                if (by_name.has(name)) {
+                    Object.assign(row, by_name.get(name));
+                    changed.push(row);
+                } else {
+                    // no longer readable by this user
+                    removed.push(this.remove(name));
+                }
+            });
+            if (changed.length || removed.length) {
+                this.on_change(changed, removed);
+            }
+        });
+    }
+
+    remove(name) {
+        let row = this.by_item.get(name);
+        if (row) {
+            this.by_item.delete(name);
+            this.rows.splice(this.rows.indexOf(row), 1);
+        }
+        return row;
+    }
+};
@@ -0,0 +1,31 @@
+// Copyright (c) 2026, Axelgear and contributors
+// For license information, please see license.txt
+
+// Decodes the compact item lists sent by endpoints called with
+// format="columnar" (see columnar.py). Anything else is returned as is, so
+// callers can pass every response through it.
+//
+//     let items = design_integration.decode_columnar(r.message.items);
+frappe.provide("design_integration");
+
+design_integration.decode_columnar = function(payload) {
+    if (!payload || payload.format !== "columnar") {
+        return payload;
+    }
+
+    const columns = payload.columns.map((column, i) => {
+        const dictionary = payload.dictionaries[column];
+        const values = payload.values[i];
+        return dictionary ? values.map((code) => dictionary[code]) : values;
+    });
+
+    const rows = new Array(payload.length);
+    for (let r = 0; r < payload.length; r++) {
+        const row = {};
+        for (let c = 0; c < payload.columns.length; c++) {
+            row[payload.columns[c]] = columns[c][r];
+        }
+        rows[r] = row;
+    }
+    return rows;
+};
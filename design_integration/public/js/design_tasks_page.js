@@ -11,6 +11,41 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
         load_tasks_data();
     });
     
+    // Move every ticked task in one server call
+    page.add_inner_button(__('Update Selected'), function() {
+        let item_ids = $('.task-select:checked').map(function() {
+            return $(this).data('item');
+        }).get();
+        if (!item_ids.length) {
+            frappe.msgprint(__('Select one or more tasks first'));
+            return;
+        }
+        frappe.prompt({
+            fieldname: 'new_status',
+            label: __('New Status'),
+            fieldtype: 'Select',
+            options: ['Approval Drawing', 'Send for Approval', 'Design', 'Modelling', 'Production Drawing',
+                'SKU Generation', 'BOM', 'Nesting', 'Completed'],
+            reqd: 1
+        }, function(values) {
+            update_task_statuses(item_ids, values.new_status);
+        }, __('Update {0} Tasks', [item_ids.length]));
+    });
+    
+    // Export the filtered register in a background job; the file link arrives over realtime
+    page.add_inner_button(__('Export'), function() {
+        frappe.prompt({
+            fieldname: 'file_format',
+            label: __('Format'),
+            fieldtype: 'Select',
+            options: ['csv', 'xlsx'],
+            default: 'xlsx',
+            reqd: 1
+        }, function(values) {
+            export_tasks(values.file_format);
+        }, __('Export Design Tasks'));
+    });
+    
     // Create filter section
     let filter_section = $(`
         <div class="filter-section" style="background: #f8f9fa; padding: 15px; margin-bottom: 20px; border-radius: 5px;">
@@ -116,6 +151,7 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
                 <table class="table table-bordered table-hover" id="design-tasks-table">
                     <thead class="thead-light">
                         <tr>
+                            <th><input type="checkbox" id="select-all-tasks"></th>
                             <th>Task</th>
                             <th>Project</th>
                             <th>Sales Order</th>
@@ -132,14 +168,28 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
                     </tbody>
                 </table>
             </div>
+            <div class="text-center" style="margin-bottom: 20px;">
+                <button class="btn btn-default btn-sm" id="load-more-tasks" style="display: none;">
+                    ${__('Load More')}
+                </button>
+            </div>
         </div>
     `);
     
     page.main.append(tasks_table);
     
-    // Load initial data
-    load_tasks_data();
-    
+    // Cursor of the next page; null once everything matching the filters is shown
+    let next_cursor = null;
+    const page_length = 50;
+
+    $('#load-more-tasks').on('click', function() {
+        load_tasks_page(true);
+    });
+
+    $('#select-all-tasks').on('change', function() {
+        $('.task-select').prop('checked', $(this).prop('checked'));
+    });
+
     // Global function to apply filters
     window.apply_task_filters = function() {
         load_tasks_data();
@@ -147,39 +197,78 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
     
     // Global function to load tasks data
     window.load_tasks_data = function() {
-        let filters = {
+        next_cursor = null;
+        load_tasks_page(false);
+    };
+
+    function get_task_filters() {
+        return {
             status: $('#task-status-filter').val(),
             project_status: $('#project-status-filter').val(),
             customer: $('#customer-filter').val(),
             sales_order: $('#so-filter').val(),
             assigned_to: $('#assigned-filter').val()
         };
-        
+    }
+
+    function load_tasks_page(append) {
         frappe.call({
-            method: 'design_integration.design_integration.doctype.design_request.design_request.get_all_design_items',
+            method: 'design_integration.design_integration.doctype.design_request.design_request.get_design_items_page',
             args: {
-                filters: filters,
+                filters: get_task_filters(),
                 sort_by: 'creation',
-                sort_order: 'desc'
+                sort_order: 'desc',
+                cursor: append ? next_cursor : null,
+                page_length: page_length,
+                format: 'columnar'
             },
             callback: function(r) {
                 if (r.message) {
-                    display_tasks(r.message);
-                    update_task_stats(r.message);
+                    display_tasks(design_integration.decode_columnar(r.message.items), append);
+                    if (r.message.summary) {
+                        update_task_stats(r.message.summary);
+                    }
+                    next_cursor = r.message.next_cursor;
+                    $('#load-more-tasks').toggle(!!r.message.has_more);
                 }
             }
         });
-    };
+    }
+
+    // Apply other users' changes to the rows in place
+    let board_store = new design_integration.DesignBoardStore({
+        on_change: function(rows, removed) {
+            rows.forEach(function(task) {
+                let current = $(`#tasks-tbody tr[data-item="${task.item_id}"]`);
+                let row = render_task_row(task);
+                row.find('.task-select').prop('checked', current.find('.task-select').prop('checked'));
+                current.replaceWith(row);
+            });
+            removed.forEach(function(task) {
+                $(`#tasks-tbody tr[data-item="${task.item_id}"]`).remove();
+            });
+        }
+    });
+    board_store.subscribe();
+
+    // Load initial data
+    load_tasks_data();
     
     // Function to display tasks
-    function display_tasks(tasks) {
+    function display_tasks(tasks, append) {
         let tbody = $('#tasks-tbody');
-        tbody.empty();
+        if (!append) {
+            tbody.empty();
+            $('#select-all-tasks').prop('checked', false);
+            board_store.set_rows(tasks);
+        } else {
+            board_store.add_rows(tasks);
+        }
         
-        if (tasks.length === 0) {
+        if (tasks.length === 0 && !append) {
             tbody.append(`
                 <tr>
-                    <td colspan="10" class="text-center text-muted">
+                    <td colspan="11" class="text-center text-muted">
                         <i class="fa fa-inbox fa-2x"></i><br>
                         No tasks found. Create a design request from a Sales Order to get started.
                     </td>
@@ -189,58 +278,61 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
         }
         
         tasks.forEach(function(task) {
-            let status_color = get_task_status_color(task.design_status);
-            let project_status_color = get_project_status_color(task.request_status);
-            let overdue_class = task.is_overdue ? 'table-warning' : '';
-            let overdue_text = task.is_overdue ? ' (Overdue)' : '';
-            
-            let row = $(`
-                <tr class="${overdue_class}">
-                    <td>
-                        <strong>${task.item_code}</strong><br>
-                        <small>${task.item_name}</small><br>
-                        <small class="text-muted">Qty: ${task.qty} ${task.uom}</small>
-                    </td>
-                    <td>
-                        <a href="/app/design-request/${task.request_id}" target="_blank">
-                            ${task.request_id}
-                        </a>
-                    </td>
-                    <td>
-                        <a href="/app/sales-order/${task.sales_order}" target="_blank">
-                            ${task.sales_order}
-                        </a>
-                    </td>
-                    <td>${task.customer_name}</td>
-                    <td>${task.assigned_to || '-'}</td>
-                    <td>
-                        <span class="badge badge-${status_color}">
-                            ${task.design_status}${overdue_text}
-                        </span>
-                    </td>
-                    <td>
-                        <span class="badge badge-${project_status_color}">
-                            ${task.request_status}
-                        </span>
-                    </td>
-                    <td>
-                        <span class="badge badge-${get_priority_color(task.priority)}">
-                            ${task.priority || 'Medium'}
-                        </span>
-                    </td>
-                    <td>${task.days_since_request}</td>
-                    <td>
-                        <div class="btn-group btn-group-sm">
-                            ${get_task_action_buttons(task)}
-                        </div>
-                    </td>
-                </tr>
-            `);
-            
-            tbody.append(row);
+            tbody.append(render_task_row(task));
         });
     }
     
+    function render_task_row(task) {
+        let status_color = get_task_status_color(task.design_status);
+        let project_status_color = get_project_status_color(task.request_status);
+        let overdue_class = task.is_overdue ? 'table-warning' : '';
+        let overdue_text = task.is_overdue ? ' (Overdue)' : '';
+        
+        return $(`
+            <tr class="${overdue_class}" data-item="${task.item_id}">
+                <td><input type="checkbox" class="task-select" data-item="${task.item_id}"></td>
+                <td>
+                    <strong>${task.item_code}</strong><br>
+                    <small>${task.item_name}</small><br>
+                    <small class="text-muted">Qty: ${task.qty} ${task.uom}</small>
+                </td>
+                <td>
+                    <a href="/app/design-request/${task.request_id}" target="_blank">
+                        ${task.request_id}
+                    </a>
+                </td>
+                <td>
+                    <a href="/app/sales-order/${task.sales_order}" target="_blank">
+                        ${task.sales_order}
+                    </a>
+                </td>
+                <td>${task.customer_name}</td>
+                <td>${task.assigned_to || '-'}</td>
+                <td>
+                    <span class="badge badge-${status_color}">
+                        ${task.design_status}${overdue_text}
+                    </span>
+                </td>
+                <td>
+                    <span class="badge badge-${project_status_color}">
+                        ${task.request_status}
+                    </span>
+                </td>
+                <td>
+                    <span class="badge badge-${get_priority_color(task.priority)}">
+                        ${task.priority || 'Medium'}
+                    </span>
+                </td>
+                <td>${task.days_since_request}</td>
+                <td>
+                    <div class="btn-group btn-group-sm">
+                        ${get_task_action_buttons(task)}
+                    </div>
+                </td>
+            </tr>
+        `);
+    }
+    
     // Function to get action buttons for tasks
     function get_task_action_buttons(task) {
         let user_roles = frappe.user_roles;
@@ -301,17 +393,12 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
         return buttons.join('');
     }
     
-    // Function to update task statistics
-    function update_task_stats(tasks) {
-        let total = tasks.length;
-        let pending = tasks.filter(task => task.design_status !== 'Completed').length;
-        let completed = tasks.filter(task => task.design_status === 'Completed').length;
-        let overdue = tasks.filter(task => task.is_overdue).length;
-        
-        $('#total-tasks').text(total);
-        $('#pending-tasks').text(pending);
-        $('#completed-tasks').text(completed);
-        $('#overdue-tasks').text(overdue);
+    // Function to update task statistics from the server-side summary
+    function update_task_stats(summary) {
+        $('#total-tasks').text(summary.total);
+        $('#pending-tasks').text(summary.pending);
+        $('#completed-tasks').text(summary.completed);
+        $('#overdue-tasks').text(summary.overdue);
     }
     
     // Function to get task status color
@@ -362,13 +449,97 @@ frappe.pages['design-tasks'].on_page_load = function(wrapper) {
             },
             callback: function(r) {
                 if (r.message) {
+                    // the row itself is updated by the design_board_patch event
                     frappe.msgprint({
                         message: __('Task status updated successfully'),
                         indicator: 'green'
                     });
-                    load_tasks_data(); // Refresh the data
                 }
             }
         });
     };
-}; 
\ No newline at end of file
+    
+    // Global function to update many tasks at once; large batches run as a background job
+    window.update_task_statuses = function(item_ids, new_status) {
+        frappe.call({
+            method: 'design_integration.design_integration.doctype.design_request.design_request.bulk_update_item_status',
+            args: {
+                items: item_ids,
+                new_status: new_status
+            },
+            freeze: true,
+            callback: function(r) {
+                if (!r.message) {
+                    return;
+                }
+                if (r.message.job_id) {
+                    track_bulk_status_job(r.message.job_id);
+                } else {
+                    show_bulk_status_results(r.message.results);
+                }
+            }
+        });
+    };
+    
+    function track_bulk_status_job(job_id) {
+        let handler = function(data) {
+            if (data.job_id !== job_id) {
+                return;
+            }
+            frappe.show_progress(__('Updating Tasks'), data.done, data.total);
+            if (data.results) {
+                frappe.realtime.off('design_bulk_status_progress', handler);
+                frappe.hide_progress();
+                show_bulk_status_results(data.results);
+            }
+        };
+        frappe.realtime.on('design_bulk_status_progress', handler);
+    }
+    
+    function export_tasks(file_format) {
+        frappe.call({
+            method: 'design_integration.design_integration.export.export_design_items',
+            args: {
+                filters: get_task_filters(),
+                file_format: file_format
+            },
+            callback: function(r) {
+                if (!r.message) {
+                    return;
+                }
+                let export_id = r.message.job_id;
+                frappe.show_alert(__('Export started, you will be notified when the file is ready'));
+                let handler = function(data) {
+                    if (data.export_id !== export_id) {
+                        return;
+                    }
+                    if (data.error) {
+                        frappe.realtime.off('design_items_export', handler);
+                        frappe.msgprint({ message: __('Export failed: {0}', [data.error]), indicator: 'red' });
+                    } else if (data.file_url) {
+                        frappe.realtime.off('design_items_export', handler);
+                        frappe.msgprint({
+                            message: __('{0} tasks exported. <a href="{1}" target="_blank">Download</a>',
+                                [data.written, data.file_url]),
+                            indicator: 'green'
+                        });
+                    } else {
+                        frappe.show_alert(__('Exported {0} tasks...', [data.written]));
+                    }
+                };
+                frappe.realtime.on('design_items_export', handler);
+            }
+        });
+    }
+    
+    function show_bulk_status_results(results) {
+        let failed = results.filter(result => result.status === 'failed' || result.status === 'not_found');
+        let updated = results.filter(result => result.status === 'updated').length;
+        frappe.msgprint({
+            message: __('{0} tasks updated', [updated]) + (failed.length
+                ? '<br>' + failed.map(result => `${result.item}: ${result.error || __('not found')}`).join('<br>')
+                : ''),
+            indicator: failed.length ? 'orange' : 'green'
+        });
+    }
+};
@@ -0,0 +1,215 @@
+// Copyright (c) 2026, Axelgear and contributors
+// For license information, please see license.txt
+
+// Uploads a design file in chunks and creates its Design Version (see
+// version_upload.py). The upload id is kept in localStorage, so choosing the
+// same file again after a dropped connection or a reload resumes where the
+// server stopped receiving it. Every chunk carries its SHA-256, and the file's
+// own SHA-256 is built up as chunks are acknowledged and checked on completion.
+//
+//     design_integration.upload_design_version(file, {
+//         design_request_item: frm.doc.name,
+//         version: {version_tag: "V2", description: "..."},
+//         on_progress: (sent, total) => ...,
+//     }).then((version) => ...);
+frappe.provide("design_integration");
+
+(function() {
+    const METHOD = "design_integration.design_integration.version_upload.";
+    const CHUNK_RETRIES = 3;
+
+    function call(method, args) {
+        return frappe.xcall(METHOD + method, args);
+    }
+
+    function resume_key(file, design_request_item) {
+        return ["design_version_upload", design_request_item, file.name, file.size, file.lastModified].join(":");
+    }
+
+    const K = new Uint32Array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+    ]);
+
+    function rotr(x, n) {
+        return (x >>> n) | (x << (32 - n));
+    }
+
+    // SHA-256 fed piece by piece: crypto.subtle only digests a whole buffer
+    // (the file would have to be read into memory) and is missing on plain http
+    class Sha256 {
+        constructor() {
+            this.state = new Uint32Array([
+                0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+            ]);
+            this.pending = new Uint8Array(64);
+            this.pending_length = 0;
+            this.length = 0;
+            this.words = new Uint32Array(64);
+        }
+
+        update(bytes) {
+            this.length += bytes.length;
+            let i = 0;
+            if (this.pending_length) {
+                i = Math.min(64 - this.pending_length, bytes.length);
+                this.pending.set(bytes.subarray(0, i), this.pending_length);
+                this.pending_length += i;
+                if (this.pending_length < 64) return this;
+                this.block(this.pending, 0);
+                this.pending_length = 0;
+            }
+            for (; i + 64 <= bytes.length; i += 64) this.block(bytes, i);
+            this.pending.set(bytes.subarray(i));
+            this.pending_length = bytes.length - i;
+            return this;
+        }
+
+        // finishes the hash; the object can't be updated afterwards
+        hex() {
+            const tail = new Uint8Array(this.pending_length < 56 ? 64 : 128);
+            tail.set(this.pending.subarray(0, this.pending_length));
+            tail[this.pending_length] = 0x80;
+            const view = new DataView(tail.buffer);
+            view.setUint32(tail.length - 8, Math.floor(this.length / 0x20000000));
+            view.setUint32(tail.length - 4, (this.length * 8) >>> 0);
+            for (let i = 0; i < tail.length; i += 64) this.block(tail, i);
+            return Array.from(this.state, (word) => word.toString(16).padStart(8, "0")).join("");
+        }
+
+        block(bytes, offset) {
+            const w = this.words;
+            for (let t = 0; t < 16; t++) {
+                const j = offset + t * 4;
+                w[t] = (bytes[j] << 24) | (bytes[j + 1] << 16) | (bytes[j + 2] << 8) | bytes[j + 3];
+            }
+            for (let t = 16; t < 64; t++) {
+                const s0 = rotr(w[t - 15], 7) ^ rotr(w[t - 15], 18) ^ (w[t - 15] >>> 3);
+                const s1 = rotr(w[t - 2], 17) ^ rotr(w[t - 2], 19) ^ (w[t - 2] >>> 10);
+                w[t] = w[t - 16] + s0 + w[t - 7] + s1;
+            }
+
+            let [a, b, c, d, e, f, g, h] = this.state;
+            for (let t = 0; t < 64; t++) {
+                const t1 = (h + (rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25)) + ((e & f) ^ (~e & g)) + K[t] + w[t]) | 0;
+                const t2 = ((rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c))) | 0;
+                h = g;
+                g = f;
+                f = e;
+                e = (d + t1) | 0;
+                d = c;
+                c = b;
+                b = a;
+                a = (t1 + t2) | 0;
+            }
+
+            const s = this.state;
+            s[0] += a; s[1] += b; s[2] += c; s[3] += d;
+            s[4] += e; s[5] += f; s[6] += g; s[7] += h;
+        }
+    }
+
+    async function read(file, start, end) {
+        return new Uint8Array(await file.slice(start, end).arrayBuffer());
+    }
+
+    async function send_chunk(upload_id, offset, bytes) {
+        const form = new FormData();
+        form.append("upload_id", upload_id);
+        form.append("offset", offset);
+        form.append("chunk_checksum", new Sha256().update(bytes).hex());
+        form.append("chunk", new Blob([bytes]), "chunk");
+
+        const response = await fetch("/api/method/" + METHOD + "upload_version_chunk", {
+            method: "POST",
+            headers: {"X-Frappe-CSRF-Token": frappe.csrf_token, "Accept": "application/json"},
+            body: form,
+        });
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            const messages = data._server_messages ? JSON.parse(data._server_messages) : [];
+            const error = new Error(messages.length ? JSON.parse(messages[0]).message : response.statusText);
+            // 4xx (other than a lock or timeout) will not get better by retrying
+            error.fatal = response.status < 500 && ![408, 409, 429].includes(response.status);
+            throw error;
+        }
+        return data.message.received;
+    }
+
+    async function open_session(file, design_request_item, key) {
+        const upload_id = localStorage.getItem(key);
+        if (upload_id) {
+            const session = await call("get_version_upload", {upload_id}).catch(() => null);
+            if (session && session.file_size === file.size) return session;
+            localStorage.removeItem(key);
+        }
+
+        const session = await call("start_version_upload", {
+            design_request_item,
+            file_name: file.name,
+            file_size: file.size,
+        });
+        localStorage.setItem(key, session.upload_id);
+        return session;
+    }
+
+    design_integration.upload_design_version = async function(file, opts) {
+        const key = resume_key(file, opts.design_request_item);
+        const session = await open_session(file, opts.design_request_item, key);
+        const on_progress = opts.on_progress || (() => {});
+
+        let received = session.received;
+        let failures = 0;
+        on_progress(received, file.size);
+
+        // the file hash only takes in bytes the server acknowledged
+        const file_hash = new Sha256();
+        let hashed = 0;
+        async function hash_up_to(offset) {
+            while (hashed < offset) {
+                const end = Math.min(hashed + session.chunk_size, offset);
+                file_hash.update(await read(file, hashed, end));
+                hashed = end;
+            }
+        }
+
+        while (received < file.size) {
+            const offset = received;
+            const bytes = await read(file, offset, Math.min(offset + session.chunk_size, file.size));
+            try {
+                received = await send_chunk(session.upload_id, offset, bytes);
+                if (hashed === offset && received === offset + bytes.length) {
+                    file_hash.update(bytes);
+                    hashed = received;
+                }
+                failures = 0;
+            } catch (error) {
+                if (error.fatal || ++failures > CHUNK_RETRIES) throw error;
+                // find out what actually arrived before resending
+                const progress = await call("get_version_upload", {upload_id: session.upload_id});
+                if (!progress) {
+                    localStorage.removeItem(key);
+                    throw error;
+                }
+                received = progress.received;
+            }
+            on_progress(received, file.size);
+        }
+
+        // a resumed upload still has to hash what was sent before
+        await hash_up_to(file.size);
+        const version = await call("complete_version_upload", {
+            upload_id: session.upload_id,
+            version: opts.version || {},
+            checksum: file_hash.hex(),
+        });
+        localStorage.removeItem(key);
+        return version;
+    };
+})();